@@ -4,6 +4,7 @@ Contains all analytics components for tracking, detection, and visualization
 """
 
 from .jersey_tracker import JerseyTracker
+from .ball_redetector import BallRedetector
 from .heatmap_generator import HeatmapGenerator
 from .pass_detector import PassDetector
 from .commentary_generator import CommentaryGenerator
@@ -14,6 +15,7 @@ from .statistics_engine import StatisticsEngine
 
 __all__ = [
     'JerseyTracker',
+    'BallRedetector',
     'HeatmapGenerator',
     'PassDetector',
     'CommentaryGenerator',
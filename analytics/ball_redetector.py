@@ -0,0 +1,274 @@
+"""
+Ball Re-detector Module
+High-resolution re-detection of the ball in small windows around its
+predicted position
+
+The ball is a few pixels wide and often missed at the default input size.
+For frames where it is missing or detected with low confidence, a window
+around the position predicted from the ball's trajectory is cut into tiles
+and each tile is inferred at the full input size (i.e. magnified), looking
+for the ball class only.
+"""
+
+import numpy as np
+import supervision as sv
+
+
+class BallRedetector:
+    """
+    Recovers missed ball detections with tiled inference around the
+    trajectory-predicted ball position
+    """
+
+    def __init__(self, model, ball_class_ids, window_size=384, tile_size=384, tile_overlap=32,
+                 imgsz=640, min_confidence=0.3, redetect_confidence=0.15, max_gap=15, batch_size=16):
+        """
+        Initialize ball re-detector
+
+        Args:
+            model: YOLO model (shared with the main detector)
+            ball_class_ids: Class IDs of the ball
+            window_size: Side of the search window around the prediction (pixels)
+            tile_size: Side of each tile the window is cut into (pixels)
+            tile_overlap: Overlap of neighbouring tiles (pixels), so a ball
+                          on a tile seam is whole in one of them
+            imgsz: Inference size of a tile (tile_size / imgsz is the magnification)
+            min_confidence: Ball detections below this are re-checked
+            redetect_confidence: Detection threshold inside the window
+            max_gap: Frames a prediction may reach from the nearest
+                     confident ball detection
+            batch_size: Tiles per inference call
+        """
+        self.model = model
+        self.ball_class_ids = list(ball_class_ids)
+        self.window_size = window_size
+        self.tile_size = tile_size
+        self.tile_overlap = tile_overlap
+        self.imgsz = imgsz
+        self.min_confidence = min_confidence
+        self.redetect_confidence = redetect_confidence
+        self.max_gap = max_gap
+        self.batch_size = batch_size
+
+        # Confident ball centres seen so far: [(frame_idx, x, y)]
+        self.history = []
+        self.frame_count = 0
+
+        # Counters
+        self.stats = {'frames_checked': 0, 'windows': 0, 'tiles': 0, 'recovered': 0}
+
+    def refine(self, frames, detections):
+        """
+        Re-detect the ball in the frames of a chunk where it is missing or
+        uncertain (chunks must be passed in video order)
+
+        Args:
+            frames: List of video frames
+            detections: List of sv.Detections, one per frame (replaced in
+                        place where a better ball is found)
+        """
+        frame_indices = np.arange(self.frame_count, self.frame_count + len(frames))
+        self.frame_count += len(frames)
+
+        best = [self._best_ball(detection) for detection in detections]
+        confident = [
+            (frame_idx, *self._center(detection.xyxy[row]))
+            for frame_idx, detection, (row, confidence) in zip(frame_indices, detections, best)
+            if row is not None and confidence >= self.min_confidence
+        ]
+        observations = self.history + confident
+
+        # Windows of the frames that need a second look
+        windows = []
+        for idx, (frame_idx, (row, confidence)) in enumerate(zip(frame_indices, best)):
+            if row is not None and confidence >= self.min_confidence:
+                continue
+            self.stats['frames_checked'] += 1
+
+            predicted = self.predict_position(observations, frame_idx)
+            if predicted is not None:
+                windows.append((idx, self.search_window(predicted, frames[idx].shape)))
+
+        recovered = self._detect_in_windows(frames, windows)
+
+        for idx, ball in recovered.items():
+            row, confidence = best[idx]
+            if row is not None and confidence >= ball.confidence[0]:
+                continue
+
+            detection = detections[idx]
+            is_ball = np.isin(detection.class_id, self.ball_class_ids)
+            detections[idx] = sv.Detections.merge([detection[~is_ball], ball])
+            confident.append((frame_indices[idx], *self._center(ball.xyxy[0])))
+            self.stats['recovered'] += 1
+
+        # Keep the recent trajectory for the next chunk
+        self.history = sorted(self.history + confident)
+        self.history = [obs for obs in self.history if obs[0] >= self.frame_count - 2 * self.max_gap]
+
+    def predict_position(self, observations, frame_idx):
+        """
+        Predict the ball centre in a frame from confident observations
+
+        Interpolates linearly between the nearest observations before and
+        after the frame, or extrapolates with the velocity of the last two
+        observations when nothing follows.
+
+        Args:
+            observations: List of (frame_idx, x, y), sorted by frame
+            frame_idx: Frame to predict
+
+        Returns:
+            (x, y) or None when no observation is within max_gap frames
+        """
+        before = [obs for obs in observations if obs[0] < frame_idx]
+        after = [obs for obs in observations if obs[0] > frame_idx]
+
+        if before and after:
+            (f0, x0, y0), (f1, x1, y1) = before[-1], after[0]
+            if min(frame_idx - f0, f1 - frame_idx) <= self.max_gap:
+                t = (frame_idx - f0) / (f1 - f0)
+                return x0 + t * (x1 - x0), y0 + t * (y1 - y0)
+
+        if before and frame_idx - before[-1][0] <= self.max_gap:
+            f1, x1, y1 = before[-1]
+            if len(before) > 1 and f1 - before[-2][0] <= self.max_gap:
+                f0, x0, y0 = before[-2]
+                steps = (frame_idx - f1) / (f1 - f0)
+                return x1 + steps * (x1 - x0), y1 + steps * (y1 - y0)
+            return x1, y1
+
+        if after and after[0][0] - frame_idx <= self.max_gap:
+            return after[0][1], after[0][2]
+
+        return None
+
+    def search_window(self, center, frame_shape):
+        """
+        Search window around a predicted ball centre, shifted inside the frame
+
+        Args:
+            center: (x, y) predicted centre
+            frame_shape: Frame shape (height, width, ...)
+
+        Returns:
+            (x0, y0, x1, y1) integer window
+        """
+        height, width = frame_shape[:2]
+        window_w = min(self.window_size, width)
+        window_h = min(self.window_size, height)
+
+        x0 = int(np.clip(round(center[0] - window_w / 2), 0, width - window_w))
+        y0 = int(np.clip(round(center[1] - window_h / 2), 0, height - window_h))
+
+        return x0, y0, x0 + window_w, y0 + window_h
+
+    def _tiles(self, window):
+        """Split a window into overlapping tiles of at most tile_size pixels per side"""
+        x0, y0, x1, y1 = window
+        xs = self._tile_starts(x0, x1)
+        ys = self._tile_starts(y0, y1)
+        return [(x, y, min(x + self.tile_size, x1), min(y + self.tile_size, y1)) for y in ys for x in xs]
+
+    def _tile_starts(self, start, end):
+        """Tile start offsets covering [start, end), the last tile ending at end"""
+        if end - start <= self.tile_size:
+            return [start]
+
+        step = max(1, self.tile_size - self.tile_overlap)
+        starts = list(range(start, end - self.tile_size, step))
+        return starts + [end - self.tile_size]
+
+    def _detect_in_windows(self, frames, windows):
+        """
+        Run tiled ball-only inference on the search windows
+
+        Args:
+            frames: List of video frames
+            windows: List of (frame index in chunk, window)
+
+        Returns:
+            Dictionary {frame index in chunk: sv.Detections with the best ball}
+        """
+        tiles = [(idx, tile) for idx, window in windows for tile in self._tiles(window)]
+        self.stats['windows'] += len(windows)
+        self.stats['tiles'] += len(tiles)
+
+        recovered = {}
+        for start in range(0, len(tiles), self.batch_size):
+            batch = tiles[start:start + self.batch_size]
+            crops = [frames[idx][y0:y1, x0:x1] for idx, (x0, y0, x1, y1) in batch]
+
+            results = self.model.predict(
+                crops, imgsz=self.imgsz, conf=self.redetect_confidence,
+                classes=self.ball_class_ids, verbose=False
+            )
+
+            for (idx, (x0, y0, _, _)), result in zip(batch, results):
+                detection = sv.Detections.from_ultralytics(result)
+                detection = detection[np.isin(detection.class_id, self.ball_class_ids)]
+                if len(detection) == 0:
+                    continue
+
+                ball = detection[[int(np.argmax(detection.confidence))]]
+                ball.xyxy = ball.xyxy + np.array([x0, y0, x0, y0], dtype=ball.xyxy.dtype)
+
+                if idx not in recovered or ball.confidence[0] > recovered[idx].confidence[0]:
+                    recovered[idx] = ball
+
+        return recovered
+
+    def _best_ball(self, detection):
+        """
+        Most confident ball of a frame
+
+        Returns:
+            (row, confidence) or (None, 0.0) without a ball
+        """
+        rows = np.flatnonzero(np.isin(detection.class_id, self.ball_class_ids))
+        if len(rows) == 0:
+            return None, 0.0
+
+        confidence = detection.confidence[rows] if detection.confidence is not None else np.ones(len(rows))
+        best = int(np.argmax(confidence))
+        return int(rows[best]), float(confidence[best])
+
+    @staticmethod
+    def _center(bbox):
+        """Centre (x, y) of a bounding box"""
+        return (float(bbox[0] + bbox[2]) / 2, float(bbox[1] + bbox[3]) / 2)
+
+    def get_state(self):
+        """
+        Get the trajectory state carried from one chunk to the next
+
+        Returns:
+            Picklable dictionary with the recent confident ball centres,
+            the frame count and the counters
+        """
+        return {
+            'history': list(self.history),
+            'frame_count': self.frame_count,
+            'stats': dict(self.stats)
+        }
+
+    def load_state(self, state):
+        """
+        Restore state saved with get_state
+
+        Args:
+            state: Dictionary from get_state
+        """
+        self.history = list(state['history'])
+        self.frame_count = state['frame_count']
+        self.stats = dict(state['stats'])
+
+    def get_stats(self):
+        """
+        Get re-detection counters
+
+        Returns:
+            Dictionary with frames checked, windows and tiles inferred and
+            balls recovered
+        """
+        return dict(self.stats)
@@ -0,0 +1,282 @@
+"""
+Ball Tracker Module
+Constant-acceleration Kalman filter for the ball with streaming gap filling
+
+Ball detections are fed chunk by chunk in video order. Each frame the filter
+predicts the ball and accepts the candidate detection closest to the
+prediction within a Mahalanobis gate, so isolated false balls (heads,
+shoes, penalty spots) are ignored. A detection that keeps appearing outside
+the gate for several frames restarts the track (a kick or a camera cut).
+
+Frames without an accepted detection are filled with the prediction, but
+only when the ball is found again within max_gap frames; longer gaps (ball
+out of play, camera on the crowd) stay empty. With smoothing enabled a
+Rauch-Tung-Striebel pass runs over the buffered frames before they are
+emitted, so filled gaps join both ends of the gap. Only the last few
+frames of a track are buffered, memory does not grow with the match length.
+"""
+
+import numpy as np
+
+
+# State: [x, y, vx, vy, ax, ay] in pixels and frames
+_STATE_SIZE = 6
+
+
+def _transition():
+    """State transition over one frame"""
+    F = np.eye(_STATE_SIZE)
+    F[0, 2] = F[1, 3] = F[2, 4] = F[3, 5] = 1.0
+    F[0, 4] = F[1, 5] = 0.5
+    return F
+
+
+def _process_noise(jerk_std):
+    """Process noise of a piecewise constant jerk over one frame"""
+    G = np.array([1 / 6, 1 / 2, 1.0])
+    block = np.outer(G, G) * jerk_std ** 2
+
+    Q = np.zeros((_STATE_SIZE, _STATE_SIZE))
+    for axis in range(2):
+        idx = [axis, axis + 2, axis + 4]
+        Q[np.ix_(idx, idx)] = block
+    return Q
+
+
+class BallTracker:
+    """
+    Kalman tracking of the ball centre with gating, bounded gap filling
+    and optional RTS smoothing
+    """
+
+    def __init__(self, max_gap=15, gate=13.8, process_noise=1.0, measurement_noise=3.0,
+                 max_rejections=3, smooth=True, smoothing_lag=15,
+                 initial_velocity_std=20.0, initial_acceleration_std=5.0):
+        """
+        Initialize ball tracker
+
+        Args:
+            max_gap: Longest run of frames without the ball that is filled
+                     with predictions (longer gaps end the track)
+            gate: Mahalanobis gate (squared, chi-square with 2 degrees of
+                  freedom) a detection must pass to update the track
+            process_noise: Jerk standard deviation (pixels / frame^3)
+            measurement_noise: Detection centre standard deviation (pixels)
+            max_rejections: Consecutive frames with only gated-out
+                            detections that restart the track on them
+            smooth: Run an RTS smoother before emitting positions
+            smoothing_lag: Frames held back so the smoother sees the
+                           frames after them
+            initial_velocity_std: Velocity uncertainty of a new track (pixels / frame)
+            initial_acceleration_std: Acceleration uncertainty of a new track
+        """
+        self.max_gap = max_gap
+        self.gate = gate
+        self.max_rejections = max_rejections
+        self.smooth = smooth
+        self.smoothing_lag = smoothing_lag if smooth else 0
+
+        self.F = _transition()
+        self.Q = _process_noise(process_noise)
+        self.H = np.eye(2, _STATE_SIZE)
+        self.R = np.eye(2) * measurement_noise ** 2
+        self.P0 = np.diag([
+            measurement_noise ** 2, measurement_noise ** 2,
+            initial_velocity_std ** 2, initial_velocity_std ** 2,
+            initial_acceleration_std ** 2, initial_acceleration_std ** 2
+        ])
+
+        self.state = None
+        self.covariance = None
+        self.size = None
+        self.misses = 0
+        self.rejections = 0
+        self.frame_count = 0
+
+        # Frames of the current track not emitted yet:
+        # (frame, predicted x, predicted P, filtered x, filtered P, size, observed)
+        self._buffer = []
+
+        # Counters
+        self.stats = {'observed': 0, 'filled': 0, 'rejected': 0, 'tracks': 0}
+
+    def update(self, frame_indices, bboxes, num_frames):
+        """
+        Track the ball through one chunk (chunks must be passed in video
+        order and cover every frame)
+
+        Args:
+            frame_indices: Frame index of every candidate ball detection
+                           (sorted, frames may repeat)
+            bboxes: Array (N, 4) of candidate ball bboxes
+            num_frames: Global index of the frame after the chunk
+
+        Returns:
+            Tuple (frames, bboxes, observed) of the positions that are final,
+            possibly including frames of earlier chunks
+        """
+        frame_indices = np.asarray(frame_indices, dtype=np.int64)
+        bboxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+
+        start = self.frame_count
+        self.frame_count = max(num_frames, start)
+        bounds = np.searchsorted(frame_indices, np.arange(start, self.frame_count + 1))
+
+        emitted = []
+        for offset, frame in enumerate(range(start, self.frame_count)):
+            candidates = bboxes[bounds[offset]:bounds[offset + 1]]
+            emitted.extend(self._step(frame, candidates))
+
+        emitted.extend(self._emit(final=False))
+        return self._pack(emitted)
+
+    def flush(self):
+        """
+        Emit the frames still buffered at the end of the video
+
+        Returns:
+            Tuple (frames, bboxes, observed)
+        """
+        return self._pack(self._end_track())
+
+    def get_stats(self):
+        """Counters of observed, filled and rejected frames and tracks started"""
+        return dict(self.stats)
+
+    def _step(self, frame, candidates):
+        """Advance the filter by one frame; returns positions emitted early"""
+        emitted = []
+
+        if self.state is None:
+            if len(candidates):
+                self._start_track(frame, candidates[0])
+            return emitted
+
+        x_pred = self.F @ self.state
+        P_pred = self.F @ self.covariance @ self.F.T + self.Q
+
+        best = None
+        if len(candidates):
+            centers = np.column_stack([
+                (candidates[:, 0] + candidates[:, 2]) / 2, (candidates[:, 1] + candidates[:, 3]) / 2
+            ])
+            residuals = centers - x_pred[:2]
+            S_inv = np.linalg.inv(self.H @ P_pred @ self.H.T + self.R)
+            distances = np.einsum('ni,ij,nj->n', residuals, S_inv, residuals)
+            best = int(np.argmin(distances))
+
+            if distances[best] > self.gate:
+                self.stats['rejected'] += 1
+                self.rejections += 1
+                best = None
+
+                if self.rejections >= self.max_rejections:
+                    # The ball really is elsewhere: restart on the detection
+                    emitted.extend(self._end_track())
+                    self._start_track(frame, candidates[np.argmin(np.abs(residuals).sum(axis=1))])
+                    return emitted
+
+        if best is None:
+            self.misses += 1
+            if self.misses > self.max_gap:
+                emitted.extend(self._end_track())
+                if len(candidates):
+                    self._start_track(frame, candidates[0])
+                return emitted
+
+            self.state, self.covariance = x_pred, P_pred
+            self._buffer.append((frame, x_pred, P_pred, x_pred, P_pred, self.size, False))
+            return emitted
+
+        K = P_pred @ self.H.T @ S_inv
+        self.state = x_pred + K @ residuals[best]
+        self.covariance = (np.eye(_STATE_SIZE) - K @ self.H) @ P_pred
+        self.size = self._box_size(candidates[best])
+        self.misses = 0
+        self.rejections = 0
+
+        self._buffer.append((frame, x_pred, P_pred, self.state, self.covariance, self.size, True))
+        return emitted
+
+    def _start_track(self, frame, bbox):
+        """Start a new track at a detection"""
+        self.state = np.zeros(_STATE_SIZE)
+        self.state[:2] = [(bbox[0] + bbox[2]) / 2, (bbox[1] + bbox[3]) / 2]
+        self.covariance = self.P0.copy()
+        self.size = self._box_size(bbox)
+        self.misses = 0
+        self.rejections = 0
+        self.stats['tracks'] += 1
+
+        self._buffer.append((frame, self.state, self.covariance, self.state, self.covariance, self.size, True))
+
+    def _end_track(self):
+        """Emit the buffered track and drop its unconfirmed predictions"""
+        emitted = self._emit(final=True)
+        self.state = None
+        self.covariance = None
+        self._buffer = []
+        return emitted
+
+    def _emit(self, final):
+        """
+        Emit buffered frames that can no longer change
+
+        Frames after the last observation wait for the ball to be found
+        again; the last smoothing_lag observed frames wait for the frames
+        after them (unless the track ends).
+        """
+        observed = [idx for idx, record in enumerate(self._buffer) if record[6]]
+        if not observed:
+            return []
+
+        last_observed = observed[-1] + 1
+        count = last_observed if final else max(0, last_observed - self.smoothing_lag)
+        if count == 0:
+            return []
+
+        states = self._smoothed_states(last_observed) if self.smooth else \
+            np.array([record[3] for record in self._buffer[:last_observed]])
+
+        emitted = [
+            (record[0], states[idx, :2], record[5], record[6])
+            for idx, record in enumerate(self._buffer[:count])
+        ]
+        self.stats['observed'] += sum(1 for record in self._buffer[:count] if record[6])
+        self.stats['filled'] += sum(1 for record in self._buffer[:count] if not record[6])
+
+        self._buffer = self._buffer[count:]
+        return emitted
+
+    def _smoothed_states(self, count):
+        """RTS smoothed states of the first count buffered frames"""
+        x_pred = np.array([record[1] for record in self._buffer[:count]])
+        P_pred = np.array([record[2] for record in self._buffer[:count]])
+        x_filt = np.array([record[3] for record in self._buffer[:count]])
+        P_filt = np.array([record[4] for record in self._buffer[:count]])
+
+        # Smoother gains of all frames at once, then the backward recursion
+        gains = P_filt[:-1] @ self.F.T @ np.linalg.inv(P_pred[1:])
+
+        smoothed = x_filt.copy()
+        for idx in range(count - 2, -1, -1):
+            smoothed[idx] = x_filt[idx] + gains[idx] @ (smoothed[idx + 1] - x_pred[idx + 1])
+        return smoothed
+
+    @staticmethod
+    def _box_size(bbox):
+        """Width and height of a bbox"""
+        return np.array([bbox[2] - bbox[0], bbox[3] - bbox[1]])
+
+    @staticmethod
+    def _pack(emitted):
+        """Convert emitted (frame, centre, size, observed) records to arrays"""
+        if not emitted:
+            return np.zeros(0, dtype=np.int64), np.zeros((0, 4)), np.zeros(0, dtype=bool)
+
+        frames = np.array([record[0] for record in emitted], dtype=np.int64)
+        centers = np.array([record[1] for record in emitted])
+        half = np.array([record[2] for record in emitted]) / 2
+        observed = np.array([record[3] for record in emitted], dtype=bool)
+
+        return frames, np.hstack([centers - half, centers + half]), observed
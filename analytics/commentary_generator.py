@@ -74,11 +74,13 @@ class CommentaryGenerator:
             
             elif event['event_type'] == 'trajectory_change':
                 angle = event.get('angle_change', 0)
+                ball_speed = event.get('ball_speed')
+                speed_text = f" at {ball_speed:.1f} m/s" if ball_speed is not None else ""
                 self.add_event_commentary(
                     event['frame'],
                     'trajectory_change',
                     None,
-                    f"⚽ Ball trajectory change: {angle:.0f}° (potential shot or clearance)"
+                    f"⚽ Ball trajectory change: {angle:.0f}°{speed_text} (potential shot or clearance)"
                 )
         
         # Add pass summary commentary
@@ -8,6 +8,7 @@ Modular design for easy maintenance and extensibility
 import csv
 import os
 from collections import defaultdict
+import numpy as np
 import pandas as pd
 
 
@@ -124,6 +125,44 @@ class CSVExporter:
 
         print(f"  ✓ Chunk {chunk_idx} exported to CSV")
 
+    @staticmethod
+    def export_table(table, output_path):
+        """
+        Export a TrackTable to CSV (same columns as export_tracking_data)
+        
+        Args:
+            table: TrackTable with all tracking data
+            output_path: CSV output file path
+        """
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        
+        is_player = table.object_mask('players')
+        transformed = np.nan_to_num(table['position_transformed'], nan=0.0)
+        jerseys = table['jersey_number'].astype(object)
+        jerseys[jerseys < 0] = ''
+        
+        df = pd.DataFrame({
+            'frame': table['frame'],
+            'object_type': np.array(['player', 'ball', 'referee'])[table['object_type']],
+            'track_id': table['track_id'],
+            'team': np.where(is_player, table['team'], 0),
+            'jersey_number': np.where(is_player, jerseys, ''),
+            'x': table['position'][:, 0],
+            'y': table['position'][:, 1],
+            'x_transformed': transformed[:, 0],
+            'y_transformed': transformed[:, 1],
+            'speed': np.where(is_player, table['speed'], 0),
+            'speed_kmh': np.where(is_player, table['speed'] * 3.6, 0),
+            'distance_covered': np.where(is_player, table['distance'], 0),
+            'has_ball': table['has_ball'] & is_player
+        })
+        
+        # Players first, then ball, then referees (frame order within each)
+        df = df.iloc[np.lexsort((table['frame'], table['object_type']))]
+        df.to_csv(output_path, index=False)
+        
+        print(f"✓ Tracking data exported: {output_path}")
+    
     @staticmethod
     def export_tracking_data(tracks, output_path):
         """
@@ -3,6 +3,17 @@ Event Detector Module
 Location: /analytics/event_detector.py
 Purpose: Detects significant match events (sprints, clusters, ball trajectory changes)
 Modular design for football-specific event detection
+
+Player clusters of a whole match are found in bulk: the neighbour pairs of
+every frame come from one KD-tree query over all player positions (frames
+kept apart along a third axis), players with enough neighbours form
+density-based clusters, and the cooldown is applied to the resulting
+per-frame series.
+
+Ball direction changes are found on the whole ball trajectory at once:
+step vectors are summed over sliding windows (cumulative sums), so the
+heading of a window is the direction of its net movement and heading
+differences are wrapped to [0, pi] instead of averaging raw angles.
 """
 
 import numpy as np
@@ -10,6 +21,65 @@ import csv
 import os
 from collections import deque
 
+try:
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+
+# Order of event types reported for the same frame
+EVENT_ORDER = {'sprint': 0, 'cluster': 1, 'trajectory_change': 2}
+
+
+def neighbour_pairs(frames, positions, radius):
+    """
+    Find all pairs of points of the same frame closer than radius
+
+    Args:
+        frames: Frame index of every point (sorted)
+        positions: Array (N, 2) of positions
+        radius: Distance threshold
+
+    Returns:
+        Array (P, 2) of point index pairs (i < j)
+    """
+    frames = np.asarray(frames, dtype=np.int64)
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+    if len(frames) < 2:
+        return np.zeros((0, 2), dtype=np.int64)
+
+    if SCIPY_AVAILABLE:
+        # Frames are stacked along a third axis, further apart than radius
+        span = np.ptp(positions, axis=0).max() + radius
+        points = np.column_stack([positions, (frames - frames[0]) * 4.0 * span])
+        pairs = cKDTree(points).query_pairs(radius, output_type='ndarray')
+        # query_pairs is inclusive; the threshold is strict
+        distances = np.hypot(*(positions[pairs[:, 0]] - positions[pairs[:, 1]]).T)
+        return pairs[distances < radius]
+
+    # Batched pairwise distances over blocks of frames padded to equal size
+    starts = np.flatnonzero(np.r_[True, frames[1:] != frames[:-1]])
+    sizes = np.diff(np.r_[starts, len(frames)])
+    width = sizes.max()
+    block = max(1, 2_000_000 // (width * width))
+
+    pairs = []
+    for first in range(0, len(starts), block):
+        block_starts, block_sizes = starts[first:first + block], sizes[first:first + block]
+        index = block_starts[:, None] + np.arange(width)
+        valid = np.arange(width) < block_sizes[:, None]
+        index = np.where(valid, index, 0)
+
+        points = positions[index]
+        distances = np.linalg.norm(points[:, :, None] - points[:, None, :], axis=-1)
+        close = (distances < radius) & valid[:, :, None] & valid[:, None, :] & np.triu(np.ones((width, width), bool), 1)
+
+        frame_idx, i, j = np.nonzero(close)
+        pairs.append(np.column_stack([index[frame_idx, i], index[frame_idx, j]]))
+
+    return np.concatenate(pairs)
+
 
 class EventDetector:
     """
@@ -17,22 +87,50 @@ class EventDetector:
     Football-focused: sprints, player clusters (set pieces), trajectory changes (shots, clearances)
     """
 
-    def __init__(self, sprint_threshold=7.0, cluster_threshold=5.0):
+    def __init__(self, sprint_threshold=7.0, cluster_threshold=5.0, cluster_min_players=5, cluster_cooldown=60,
+                 trajectory_window=5, trajectory_angle=60.0, trajectory_cooldown=30, trajectory_max_gap=5,
+                 trajectory_min_movement=2.0, shot_speed=15.0, shot_speed_ratio=2.0):
         """
         Initialize event detector
 
         Args:
             sprint_threshold: Speed threshold for sprint detection (m/s) - 7.0 m/s = ~25 km/h
             cluster_threshold: Distance threshold for player clustering (m) - 5.0m for corners/set pieces
+            cluster_min_players: Players within cluster_threshold of one
+                                 player (that player included) that make a cluster
+            cluster_cooldown: Frames between two cluster events
+            trajectory_window: Ball steps per heading window; the window
+                               before a frame is compared with the window
+                               ending trajectory_window steps before it
+            trajectory_angle: Heading change (degrees) reported as a
+                              direction change
+            trajectory_cooldown: Frames between two trajectory events
+            trajectory_max_gap: Frames the ball may be missing inside the
+                                compared windows
+            trajectory_min_movement: Net movement (pixels) a window needs
+                                     for its heading to count
+            shot_speed: Ball speed (m/s) a speed spike must reach
+            shot_speed_ratio: Speed increase factor over the earlier window
+                              that makes a speed spike
         """
         self.sprint_threshold = sprint_threshold
         self.cluster_threshold = cluster_threshold
+        self.cluster_min_players = cluster_min_players
+        self.cluster_cooldown = cluster_cooldown
+        self.trajectory_window = trajectory_window
+        self.trajectory_angle = trajectory_angle
+        self.trajectory_cooldown = trajectory_cooldown
+        self.trajectory_max_gap = trajectory_max_gap
+        self.trajectory_min_movement = trajectory_min_movement
+        self.shot_speed = shot_speed
+        self.shot_speed_ratio = shot_speed_ratio
 
         # Event log
         self.events = []
 
-        # Tracking for event detection
-        self.ball_trajectory = deque(maxlen=30)  # Last 30 frames (~1 second at 30fps)
+        # Tracking for event detection: (frame, position, field position)
+        # of the last ball observations
+        self.ball_trajectory = deque(maxlen=4 * trajectory_window + 1)
         self.player_speeds = {}
 
         # Cooldown to avoid duplicate events (frames)
@@ -50,18 +148,116 @@ class EventDetector:
             List of detected events
         """
         self.events = []  # Reset
+        self.ball_trajectory.clear()
+        self.last_event_frame = {'sprint': {}, 'cluster': -100, 'trajectory_change': -100}
+        
+        # Clusters and ball trajectory of the whole match in bulk
+        bulk_events = self.detect_clusters(*self._player_columns(tracks))
+        bulk_events += self.detect_trajectory_changes(*self._ball_columns(tracks), fps=fps)
         
         for frame_idx in range(len(tracks.get('players', []))):
             # Create frame-specific tracks dict
             frame_tracks = {
-                'players': [tracks['players'][frame_idx]] if frame_idx < len(tracks['players']) else [{}],
-                'ball': [tracks['ball'][frame_idx]] if frame_idx < len(tracks['ball']) else [{}],
-                'referees': [tracks['referees'][frame_idx]] if frame_idx < len(tracks['referees']) else [{}]
+                'players': [tracks['players'][frame_idx]] if frame_idx < len(tracks['players']) else [{}]
             }
             
-            self.process_frame(frame_idx, frame_tracks, current_team=1)
+            self._detect_sprints(frame_idx, frame_tracks)
+        
+        self.events.extend(bulk_events)
+        self.events.sort(key=lambda event: (event['frame'], EVENT_ORDER[event['event_type']]))
         
         return self.events
+    
+    @staticmethod
+    def _player_columns(tracks):
+        """
+        Frame, position and track ID of every player detection
+        
+        Field positions are used where known, pixel positions otherwise.
+        
+        Args:
+            tracks: Tracking dictionary or the legacy view of a TrackTable
+            
+        Returns:
+            Tuple (frames, positions, player_ids) in frame order
+        """
+        table = getattr(tracks, 'table', None)
+        if table is not None:
+            rows = np.flatnonzero(table.object_mask('players'))
+            positions = table['position_transformed'][rows]
+            missing = np.isnan(positions[:, 0])
+            positions = np.where(missing[:, None], table['position'][rows], positions)
+            return table['frame'][rows], positions, table['track_id'][rows]
+        
+        frames, positions, player_ids = [], [], []
+        for frame_num, frame_players in enumerate(tracks.get('players', [])):
+            for player_id, player_data in frame_players.items():
+                pos = player_data.get('position_transformed', player_data.get('position', None))
+                if pos:
+                    frames.append(frame_num)
+                    positions.append(pos[:2])
+                    player_ids.append(player_id)
+        
+        return np.array(frames, dtype=np.int64), np.array(positions, dtype=np.float64).reshape(-1, 2), np.array(player_ids)
+    
+    @staticmethod
+    def _ball_columns(tracks):
+        """
+        Frame, image position and field position of every ball observation
+        
+        Image positions are camera-compensated where known; field
+        positions are NaN where unknown.
+        
+        Args:
+            tracks: Tracking dictionary or the legacy view of a TrackTable
+            
+        Returns:
+            Tuple (frames, positions, field_positions) in frame order
+        """
+        table = getattr(tracks, 'table', None)
+        if table is not None:
+            rows = np.flatnonzero(table.object_mask('ball'))
+            _, first = np.unique(table['frame'][rows], return_index=True)
+            rows = rows[first]
+            positions = table['position_adjusted'][rows]
+            missing = np.isnan(positions[:, 0])
+            positions = np.where(missing[:, None], table['position'][rows], positions)
+            return table['frame'][rows], positions, table['position_transformed'][rows]
+        
+        frames, positions, field_positions = [], [], []
+        for frame_num, frame_ball in enumerate(tracks.get('ball', [])):
+            ball_data = frame_ball.get(1, {})
+            pos = ball_data.get('position_adjusted', ball_data.get('position', None))
+            if pos:
+                frames.append(frame_num)
+                positions.append(pos[:2])
+                field_positions.append((ball_data.get('position_transformed') or [np.nan, np.nan])[:2])
+        
+        return (
+            np.array(frames, dtype=np.int64),
+            np.array(positions, dtype=np.float64).reshape(-1, 2),
+            np.array(field_positions, dtype=np.float64).reshape(-1, 2)
+        )
+    
+    @staticmethod
+    def _cooldown_frames(candidate_frames, last_event_frame, cooldown):
+        """
+        Apply a cooldown to sorted candidate frames
+        
+        Args:
+            candidate_frames: Sorted frames where an event condition holds
+            last_event_frame: Frame of the previous event
+            cooldown: Minimum frames between two events
+            
+        Returns:
+            List of event frames
+        """
+        event_frames = []
+        idx = np.searchsorted(candidate_frames, last_event_frame + cooldown)
+        while idx < len(candidate_frames):
+            event_frames.append(int(candidate_frames[idx]))
+            idx = np.searchsorted(candidate_frames, candidate_frames[idx] + cooldown)
+        return event_frames
 
     def process_frame(self, frame_num, tracks, current_team):
         """
@@ -118,90 +314,235 @@ class EventDetector:
             return
 
         # Check cooldown
-        if frame_num - self.last_event_frame['cluster'] < 60:
+        if frame_num - self.last_event_frame['cluster'] < self.cluster_cooldown:
             return
 
-        players = tracks['players'][0]
-        positions = []
+        frames, positions, player_ids = self._player_columns({'players': tracks['players'][:1]})
+        self.events.extend(self.detect_clusters(frames + frame_num, positions, player_ids))
 
-        for player_id, player_data in players.items():
-            pos = player_data.get('position_transformed', player_data.get('position', None))
-            if pos:
-                positions.append(pos)
+    def detect_clusters(self, frames, positions, player_ids):
+        """
+        Detect player clusters (e.g., for corners, set pieces) over many frames
 
-        if len(positions) < 5:
-            return
+        A player with at least cluster_min_players - 1 others closer than
+        cluster_threshold is a cluster core; a cluster is a connected group
+        of cores plus the players next to them. One event is reported per
+        frame (the largest cluster), at most one per cluster_cooldown frames.
+
+        Args:
+            frames: Frame index of every player detection (sorted)
+            positions: Array (N, 2) of positions
+            player_ids: Track ID of every detection
+
+        Returns:
+            List of cluster events
+        """
+        frames = np.asarray(frames, dtype=np.int64)
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        player_ids = np.asarray(player_ids)
+
+        valid = np.flatnonzero(np.isfinite(positions).all(axis=1))
+        frames, positions, player_ids = frames[valid], positions[valid], player_ids[valid]
+
+        pairs = neighbour_pairs(frames, positions, self.cluster_threshold)
+        neighbours = np.bincount(pairs.ravel(), minlength=len(frames))
+        is_core = neighbours >= self.cluster_min_players - 1
+
+        # Cooldown over the frames that contain a cluster core
+        event_frames = self._cooldown_frames(
+            np.unique(frames[is_core]), self.last_event_frame['cluster'], self.cluster_cooldown
+        )
+
+        if not event_frames:
+            return []
+
+        # Pairs grouped by frame for the per-event cluster extraction
+        pairs = pairs[np.argsort(frames[pairs[:, 0]], kind='stable')]
+        pair_frames = frames[pairs[:, 0]]
+
+        events = []
+        for frame_num in event_frames:
+            rows = np.arange(*np.searchsorted(frames, [frame_num, frame_num + 1]))
+            frame_pairs = pairs[slice(*np.searchsorted(pair_frames, [frame_num, frame_num + 1]))]
+            members = self._largest_cluster(rows, frame_pairs, is_core)
+
+            centroid = positions[members].mean(axis=0)
+            events.append({
+                'frame': frame_num,
+                'event_type': 'cluster',
+                'team': None,
+                'player_count': len(members),
+                'player_ids': [int(player_id) for player_id in player_ids[members]],
+                'centroid': centroid.tolist(),
+                'description': f"Player cluster detected ({len(members)} players within "
+                               f"{self.cluster_threshold}m of ({centroid[0]:.1f}, {centroid[1]:.1f}))"
+            })
+
+        self.last_event_frame['cluster'] = event_frames[-1]
+        return events
+
+    @staticmethod
+    def _largest_cluster(rows, pairs, is_core):
+        """
+        Members of the largest density-based cluster of one frame
+
+        Args:
+            rows: Point indices of the frame
+            pairs: Neighbour pairs of the frame
+            is_core: Core flag of every point
+
+        Returns:
+            Array of member point indices
+        """
+        # Connect cores (union-find over core-core pairs)
+        parent = {int(row): int(row) for row in rows[is_core[rows]]}
+
+        def find(row):
+            while parent[row] != row:
+                parent[row] = parent[parent[row]]
+                row = parent[row]
+            return row
+
+        core_pairs = pairs[is_core[pairs[:, 0]] & is_core[pairs[:, 1]]]
+        for i, j in core_pairs.tolist():
+            parent[find(i)] = find(j)
+
+        clusters = {}
+        for row in parent:
+            clusters.setdefault(find(row), set()).add(row)
 
-        positions = np.array(positions)
-
-        # Find clusters using simple distance metric
-        for i in range(len(positions)):
-            nearby = 0
-            for j in range(len(positions)):
-                if i != j:
-                    dist = np.linalg.norm(positions[i] - positions[j])
-                    if dist < self.cluster_threshold:
-                        nearby += 1
-
-            # If 4+ players within cluster threshold
-            if nearby >= 4:
-                event = {
-                    'frame': frame_num,
-                    'event_type': 'cluster',
-                    'team': None,
-                    'player_count': nearby + 1,
-                    'description': f"Player cluster detected ({nearby + 1} players within {self.cluster_threshold}m)"
-                }
-
-                self.events.append(event)
-                self.last_event_frame['cluster'] = frame_num
-                break
+        # Border players join the cluster of a neighbouring core
+        border_pairs = pairs[is_core[pairs[:, 0]] != is_core[pairs[:, 1]]]
+        for i, j in border_pairs.tolist():
+            core, border = (i, j) if is_core[i] else (j, i)
+            clusters[find(core)].add(border)
+
+        return np.array(sorted(max(clusters.values(), key=len)))
 
     def _detect_trajectory_changes(self, frame_num, tracks):
         """Detect significant ball trajectory changes (potential shots, clearances)"""
         if not tracks.get('ball') or len(tracks['ball']) == 0:
             return
 
-        ball_data = tracks['ball'][0].get(1, {})
-        ball_pos = ball_data.get('position', None)
-
-        if ball_pos:
-            self.ball_trajectory.append(ball_pos)
-
-        # Need enough history
-        if len(self.ball_trajectory) < 10:
+        frames, positions, field_positions = self._ball_columns({'ball': tracks['ball'][:1]})
+        if len(frames) == 0:
             return
+        self.ball_trajectory.append((frame_num, positions[0], field_positions[0]))
 
         # Check cooldown
-        if frame_num - self.last_event_frame['trajectory_change'] < 30:
+        if frame_num - self.last_event_frame['trajectory_change'] < self.trajectory_cooldown:
             return
 
-        # Calculate trajectory vectors
-        positions = np.array(list(self.ball_trajectory))
-
-        # Recent trajectory (last 5 frames)
-        recent_trajectory = positions[-5:] - positions[-6:-1]
-        recent_angle = np.mean(np.arctan2(recent_trajectory[:, 1], recent_trajectory[:, 0]))
-
-        # Previous trajectory (frames 5-10)
-        if len(positions) >= 15:
-            prev_trajectory = positions[-15:-10] - positions[-16:-11]
-            prev_angle = np.mean(np.arctan2(prev_trajectory[:, 1], prev_trajectory[:, 0]))
+        # Earlier frames of the window were checked when they arrived
+        last_event = self.last_event_frame['trajectory_change']
+        frames, positions, field_positions = (np.array(column) for column in zip(*self.ball_trajectory))
+        events = [
+            event for event in self.detect_trajectory_changes(frames, positions, field_positions)
+            if event['frame'] == frame_num
+        ]
+        self.last_event_frame['trajectory_change'] = frame_num if events else last_event
+        self.events.extend(events)
+
+    def detect_trajectory_changes(self, frames, positions, field_positions=None, fps=30):
+        """
+        Detect ball direction changes and speed spikes over a trajectory
 
-            # Check for significant angle change
-            angle_change = abs(recent_angle - prev_angle)
+        At every ball observation the net movement of the last
+        trajectory_window steps is compared with the net movement of an
+        equally long window ending trajectory_window steps before it. A heading change of
+        more than trajectory_angle, or a jump of the ball speed to
+        shot_speed and shot_speed_ratio times the earlier speed, makes a
+        shot / clearance candidate.
 
-            if angle_change > np.pi / 3:  # > 60 degrees
-                event = {
-                    'frame': frame_num,
-                    'event_type': 'trajectory_change',
-                    'team': None,
-                    'angle_change': np.degrees(angle_change),
-                    'description': f"Ball trajectory change detected ({np.degrees(angle_change):.0f}°)"
-                }
+        Args:
+            frames: Frame index of every ball observation (sorted)
+            positions: Array (N, 2) of image positions (camera-compensated)
+            field_positions: Optional array (N, 2) of field positions in
+                             meters (NaN where unknown) for speeds and
+                             pitch locations
+            fps: Video frames per second
 
-                self.events.append(event)
-                self.last_event_frame['trajectory_change'] = frame_num
+        Returns:
+            List of trajectory change events
+        """
+        frames = np.asarray(frames, dtype=np.int64)
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        if field_positions is None:
+            field_positions = np.full(positions.shape, np.nan)
+        field_positions = np.asarray(field_positions, dtype=np.float64).reshape(-1, 2)
+
+        window = self.trajectory_window
+        if len(frames) < 3 * window + 1:
+            return []
+
+        # Step vectors, ball speed per step and steps across long gaps
+        gaps = np.diff(frames)
+        steps = np.diff(positions, axis=0)
+        step_speed = np.hypot(*np.diff(field_positions, axis=0).T) * fps / gaps
+        broken = gaps > self.trajectory_max_gap
+
+        # Windowed sums with cumulative sums: window k covers steps k-window+1..k
+        def window_sum(values):
+            cumulative = np.concatenate([np.zeros((1,) + values.shape[1:]), np.cumsum(values, axis=0)])
+            return cumulative[window:] - cumulative[:-window]
+
+        movement = window_sum(steps)
+        speed = window_sum(step_speed) / window
+        gap_count = window_sum(broken.astype(np.int64))
+
+        # Compare each window with the one ending `window` steps earlier
+        recent, previous = slice(2 * window, None), slice(None, -2 * window)
+        recent_move, previous_move = movement[recent], movement[previous]
+        recent_speed, previous_speed = speed[recent], speed[previous]
+        intact = (gap_count[recent] == 0) & (gap_count[previous] == 0) & (gap_count[window:-window] == 0)
+
+        headings = np.arctan2(recent_move[:, 1], recent_move[:, 0]), np.arctan2(previous_move[:, 1], previous_move[:, 0])
+        angle_change = np.abs(np.angle(np.exp(1j * (headings[0] - headings[1]))))
+        moving = (np.hypot(*recent_move.T) >= self.trajectory_min_movement) & \
+            (np.hypot(*previous_move.T) >= self.trajectory_min_movement)
+
+        direction_change = intact & moving & (angle_change > np.radians(self.trajectory_angle))
+        with np.errstate(invalid='ignore'):
+            speed_spike = intact & (recent_speed >= self.shot_speed) & \
+                (recent_speed >= self.shot_speed_ratio * previous_speed)
+
+        # Observation index (end of the recent window) of every comparison
+        observation = np.arange(len(angle_change)) + 3 * window
+        candidates = np.flatnonzero(direction_change | speed_spike)
+
+        event_frames = self._cooldown_frames(
+            frames[observation[candidates]], self.last_event_frame['trajectory_change'], self.trajectory_cooldown
+        )
+        if not event_frames:
+            return []
+
+        events = []
+        for idx in candidates[np.isin(frames[observation[candidates]], event_frames)]:
+            obs = observation[idx]
+            angle = float(np.degrees(angle_change[idx]))
+            ball_speed = float(recent_speed[idx]) if np.isfinite(recent_speed[idx]) else None
+            location = field_positions[obs].tolist() if np.isfinite(field_positions[obs]).all() else None
+
+            details = f"{angle:.0f}°"
+            if ball_speed is not None:
+                details += f", {ball_speed:.1f} m/s"
+            if location is not None:
+                details += f" at ({location[0]:.1f}, {location[1]:.1f})"
+
+            events.append({
+                'frame': int(frames[obs]),
+                'event_type': 'trajectory_change',
+                'team': None,
+                'trigger': 'direction' if not speed_spike[idx] else ('speed' if not direction_change[idx] else 'both'),
+                'angle_change': angle,
+                'ball_speed': ball_speed,
+                'speed_change': float(recent_speed[idx] - previous_speed[idx]) if ball_speed is not None else None,
+                'location': location,
+                'description': f"Ball trajectory change detected ({details})"
+            })
+
+        self.last_event_frame['trajectory_change'] = event_frames[-1]
+        return events
 
     @staticmethod
     def export_events_csv(events, output_path):
@@ -73,6 +73,43 @@ class HeatmapGenerator:
                     jersey_num = player_data.get('jersey_number', f'ID_{track_id}')
                     self.player_heatmaps[f"team{team}_player{jersey_num}"][y, x] += 1
 
+    def accumulate_table(self, table):
+        """
+        Accumulate player positions of a TrackTable for heatmap generation
+
+        Args:
+            table: TrackTable with player positions
+        """
+        rows = np.flatnonzero(table.object_mask('players'))
+
+        # Transformed position (field coordinates) with pixel fallback
+        positions = table['position_transformed'][rows]
+        missing = np.isnan(positions[:, 0])
+        positions = np.where(missing[:, None], table['position'][rows], positions)
+
+        x = (positions[:, 0] / self.field_length * self.resolution[0]).astype(np.int64)
+        y = (positions[:, 1] / self.field_width * self.resolution[1]).astype(np.int64)
+
+        inside = (x >= 0) & (x < self.resolution[0]) & (y >= 0) & (y < self.resolution[1])
+        rows, x, y = rows[inside], x[inside], y[inside]
+        teams = table['team'][rows]
+
+        np.add.at(self.team1_heatmap, (y[teams == 1], x[teams == 1]), 1)
+        np.add.at(self.team2_heatmap, (y[teams == 2], x[teams == 2]), 1)
+        np.add.at(self.all_players_heatmap, (y, x), 1)
+
+        # Player-specific heatmaps, keyed by jersey number (or track ID)
+        jerseys = table['jersey_number'][rows]
+        track_ids = table['track_id'][rows]
+        player_keys = np.where(jerseys >= 0, jerseys, -1 - track_ids.astype(np.int64))
+
+        keys, inverse = np.unique(np.stack([teams, player_keys], axis=1), axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        for key_idx, (team, player_key) in enumerate(keys):
+            label = player_key if player_key >= 0 else f'ID_{-1 - player_key}'
+            members = inverse == key_idx
+            np.add.at(self.player_heatmaps[f"team{team}_player{label}"], (y[members], x[members]), 1)
+
     def _position_to_heatmap_coords(self, position):
         """
         Convert field position to heatmap pixel coordinates
@@ -7,8 +7,8 @@ Uses modular components for field masking, jersey detection, and annotations
 import cv2
 import numpy as np
 import os
+import time
 from collections import defaultdict
-from ultralytics import YOLO
 import supervision as sv
 
 import sys
@@ -20,6 +20,11 @@ try:
     from ..utils.jersey_detector import JerseyNumberDetector
     from ..utils.position_utils import PositionCalculator, BallInterpolator
     from ..utils.annotation_drawer import AnnotationDrawer
+    from ..utils.track_table import TrackTable, OBJECT_TYPES
+    from ..utils.box_propagation import BoxPropagator, frame_difference
+    from ..utils.model_registry import get_registry
+    from .ball_redetector import BallRedetector
+    from .ball_tracker import BallTracker
 except ImportError:
     # Fallback to absolute imports if relative fails
     parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -29,6 +34,11 @@ except ImportError:
     from utils.jersey_detector import JerseyNumberDetector
     from utils.position_utils import PositionCalculator, BallInterpolator
     from utils.annotation_drawer import AnnotationDrawer
+    from utils.track_table import TrackTable, OBJECT_TYPES
+    from utils.box_propagation import BoxPropagator, frame_difference
+    from utils.model_registry import get_registry
+    from analytics.ball_redetector import BallRedetector
+    from analytics.ball_tracker import BallTracker
 
 
 class JerseyTracker:
@@ -38,7 +48,12 @@ class JerseyTracker:
     """
 
     def __init__(self, model_path, field_config_path=None, video_name=None,
-                 confidence_threshold=0.5, enable_ocr=True):
+                 confidence_threshold=0.5, enable_ocr=True, ocr_batch_size=64,
+                 ocr_scheduler=None, team_assigner=None, detection_stride=1,
+                 keyframe_motion_threshold=25.0, roi_inference=False, roi_margin=80,
+                 ball_redetection=None, backend='torch', int8=False,
+                 calibration_videos=None, calibration_frames=64, batch_size=20,
+                 batch_tuner=None, ball_tracking=None):
         """
         Initialize the Jersey Tracker
 
@@ -48,13 +63,61 @@ class JerseyTracker:
             video_name: Name of the video for field config lookup
             confidence_threshold: Detection confidence threshold
             enable_ocr: Whether to enable jersey number OCR
+            ocr_batch_size: Jersey ROIs per batched OCR call
+            ocr_scheduler: Optional OCRScheduler limiting which ROIs are OCR'd
+                           (default: OCR every player detection)
+            team_assigner: Optional TeamAssigner; when given, players are
+                           assigned teams inline while their frame is decoded
+            detection_stride: Run the detector on every Nth frame only and
+                              propagate boxes with optical flow in between
+                              (1 = detect every frame)
+            keyframe_motion_threshold: Accumulated frame difference (mean
+                                       grey levels) since the last keyframe
+                                       that forces an early keyframe
+            roi_inference: Run the detector on a crop of the field bounds
+                           (plus roi_margin pixels) at a proportionally
+                           smaller input size
+            roi_margin: Pixels added around the field bounds (covers the
+                        upper body of players standing on the far line)
+            ball_redetection: Optional dictionary of BallRedetector options;
+                              when given, frames with a missing or uncertain
+                              ball are re-checked around its predicted position
+            backend: Detector runtime ('torch', 'onnx' or 'openvino'); the
+                     weights are exported on first use of onnx/openvino
+            int8: Use an INT8 quantized export (onnx/openvino)
+            calibration_videos: Directory with videos whose frames calibrate
+                                the INT8 export
+            calibration_frames: Number of INT8 calibration frames
+            batch_size: Frames per YOLO inference call
+            batch_tuner: Optional BatchSizeTuner choosing the batch size at
+                         run time instead (overrides batch_size)
+            ball_tracking: Optional dictionary of BallTracker options; when
+                           given, the ball is Kalman-tracked instead of
+                           linearly interpolated over every gap
         """
-        # Initialize YOLO model
-        self.model = YOLO(model_path)
+        # Get the YOLO model through the selected backend (loaded once per
+        # process, or served by the inference server when one is set)
+        self.backend = backend
+        self.model = get_registry().get_detector(
+            model_path, backend=backend, int8=int8,
+            calibration_videos=calibration_videos, calibration_frames=calibration_frames
+        )
         self.confidence_threshold = confidence_threshold
+        self.batch_size = batch_size
+        self.batch_tuner = batch_tuner
 
         # Initialize tracker
         self.tracker = sv.ByteTrack()
+        
+        # Keyframe-stride detection
+        self.detection_stride = max(1, int(detection_stride))
+        self.keyframe_motion_threshold = keyframe_motion_threshold
+        self.box_propagator = BoxPropagator()
+        self.detection_stats = {'frames': 0, 'keyframes': 0}
+        
+        # Field-ROI cropped inference
+        self.roi_inference = roi_inference
+        self.roi_margin = roi_margin
 
         # Initialize modular components
         self.field_mask = FieldMask(field_config_path, video_name)
@@ -63,21 +126,33 @@ class JerseyTracker:
             self.jersey_detector = JerseyNumberDetector(
                 languages=['en'],
                 gpu=True,
-                confidence_threshold=0.5
+                confidence_threshold=0.5,
+                batch_size=ocr_batch_size
             )
         else:
             self.jersey_detector = None
+        self.ocr_scheduler = ocr_scheduler
+        self.team_assigner = team_assigner
         
         self.position_calculator = PositionCalculator()
         self.ball_interpolator = BallInterpolator()
+        self.ball_tracking = ball_tracking
+        self.ball_tracker_stats = None
         self.annotation_drawer = AnnotationDrawer()
         
         # Track ID mappings
         self.global_track_mapping = {}
         self.next_temp_id = 1001
 
-        # Class mappings
-        self.class_names = {0: 'goalkeeper', 1: 'player', 2: 'referee', 3: 'ball'}
+        # Class mappings (from the model, default for the football model)
+        self.class_names = dict(getattr(self.model, 'names', None) or
+                                {0: 'goalkeeper', 1: 'player', 2: 'referee', 3: 'ball'})
+        
+        # Ball re-detection around the predicted ball position
+        self.ball_redetector = None
+        if ball_redetection is not None:
+            ball_class_ids = [class_id for class_id, name in self.class_names.items() if name == 'ball']
+            self.ball_redetector = BallRedetector(self.model, ball_class_ids, **ball_redetection)
 
     def process_chunk(self, frames, chunk_idx=0):
         """
@@ -90,23 +165,213 @@ class JerseyTracker:
         Returns:
             Dictionary with tracks for players, ball, and referees
         """
-        # Detect objects in frames
-        detections = self._detect_frames(frames)
+        detections = self.detect_chunk(frames)
+        return self.track_chunk(frames, detections, chunk_idx=chunk_idx)
+
+    def detect_chunk(self, frames, field_transforms=None):
+        """
+        Run object detection on a chunk of frames (inference stage)
+
+        Only touches the detection model, so it can run in a different
+        thread from track_chunk of the previous chunk.
+
+        With a detection stride the detector only runs on keyframes: the
+        first frame of the chunk, every detection_stride-th frame after a
+        keyframe, and earlier when the accumulated frame difference shows
+        fast motion or a scene change. Boxes of the other frames are
+        propagated from the previous frame with optical flow.
+
+        With ROI inference the detector only sees the chunk's field region.
+
+        Args:
+            frames: List of video frames
+            field_transforms: Optional array (len(frames), 3, 3) mapping the
+                              calibrated frame into each frame, so the ROI
+                              follows the camera
+
+        Returns:
+            List of sv.Detections, one per frame
+        """
+        self.detection_stats['frames'] += len(frames)
+        roi = self._inference_roi(frames, field_transforms)
+        
+        if self.detection_stride <= 1 or not frames:
+            self.detection_stats['keyframes'] += len(frames)
+            detections = self._detect_in_roi(frames, roi)
+        else:
+            detections = self._detect_with_stride(frames, roi)
+        
+        if self.ball_redetector is not None:
+            self.ball_redetector.refine(frames, detections)
         
+        return detections
+
+    def _detect_with_stride(self, frames, roi=None):
+        """
+        Detect on keyframes and propagate boxes to the frames in between
+
+        Args:
+            frames: List of video frames
+            roi: Optional inference crop
+
+        Returns:
+            List of sv.Detections, one per frame
+        """
+        grays = [cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) for frame in frames]
+        keyframes = self._select_keyframes(grays)
+        self.detection_stats['keyframes'] += len(keyframes)
+        
+        detections = [None] * len(frames)
+        key_detections = self._detect_in_roi([frames[idx] for idx in keyframes], roi)
+        for idx, detection in zip(keyframes, key_detections):
+            detections[idx] = detection
+        
+        for idx in range(1, len(frames)):
+            if detections[idx] is None:
+                detections[idx] = self._propagate_detections(grays[idx - 1], grays[idx], detections[idx - 1])
+        
+        return detections
+
+    def _inference_roi(self, frames, field_transforms=None):
+        """
+        Pixel region of a chunk the detector runs on
+
+        Args:
+            frames: List of video frames
+            field_transforms: Optional per-frame calibrated -> frame homographies
+
+        Returns:
+            (x0, y0, x1, y1) integer crop, or None to use whole frames
+        """
+        if not self.roi_inference or not frames:
+            return None
+        
+        return self.field_mask.get_inference_roi(
+            frames[0].shape, margin=self.roi_margin, transforms=field_transforms
+        )
+
+    def _detect_in_roi(self, frames, roi=None):
+        """
+        Detect objects in frames, optionally on a crop only
+
+        The crop is inferred at an input size scaled down with it, so
+        objects keep the pixel scale of full-frame inference, and boxes
+        are mapped back to full-frame coordinates.
+
+        Args:
+            frames: List of video frames
+            roi: (x0, y0, x1, y1) crop or None
+
+        Returns:
+            List of sv.Detections in full-frame coordinates
+        """
+        if roi is None:
+            return [sv.Detections.from_ultralytics(result) for result in self._detect_frames(frames)]
+        
+        x0, y0, x1, y1 = roi
+        height, width = frames[0].shape[:2]
+        base_imgsz = self.model.overrides.get('imgsz', 640)
+        if not isinstance(base_imgsz, int):
+            base_imgsz = max(base_imgsz)
+        scale = max(x1 - x0, y1 - y0) / max(width, height)
+        imgsz = max(32, int(np.ceil(base_imgsz * scale / 32)) * 32)
+        
+        crops = [frame[y0:y1, x0:x1] for frame in frames]
+        detections = []
+        for result in self._detect_frames(crops, imgsz=imgsz):
+            detection = sv.Detections.from_ultralytics(result)
+            detection.xyxy = detection.xyxy + np.array([x0, y0, x0, y0], dtype=detection.xyxy.dtype)
+            detections.append(detection)
+        return detections
+
+    def _select_keyframes(self, grays):
+        """
+        Choose the frames of a chunk the detector runs on
+
+        Args:
+            grays: List of grey frames of the chunk
+
+        Returns:
+            List of keyframe indices (always starting with 0)
+        """
+        keyframes = [0]
+        motion = 0.0
+        
+        for idx in range(1, len(grays)):
+            motion += frame_difference(grays[idx - 1], grays[idx])
+            
+            if idx - keyframes[-1] >= self.detection_stride or motion >= self.keyframe_motion_threshold:
+                keyframes.append(idx)
+                motion = 0.0
+        
+        return keyframes
+
+    def _propagate_detections(self, prev_gray, gray, detections):
+        """
+        Move the detections of the previous frame into the next frame
+
+        Args:
+            prev_gray: Grey frame the detections belong to
+            gray: Next grey frame
+            detections: sv.Detections of the previous frame
+
+        Returns:
+            sv.Detections for the next frame. People the flow cannot follow
+            move with the frame; a ball it cannot follow is dropped and left
+            to ball interpolation.
+        """
+        if len(detections) == 0:
+            return detections
+        
+        moved, followed = self.box_propagator.propagate(prev_gray, gray, detections.xyxy)
+        
+        ball_ids = [class_id for class_id, name in self.class_names.items() if name == 'ball']
+        keep = followed | ~np.isin(detections.class_id, ball_ids)
+        
+        propagated = detections[keep]
+        propagated.xyxy = moved[keep].astype(detections.xyxy.dtype)
+        return propagated
+
+    def track_chunk(self, frames, detections, chunk_idx=0, field_transforms=None):
+        """
+        Track detections of a chunk and recognise jersey numbers
+        (post-processing stage)
+
+        Chunks must be passed in video order since tracker state carries
+        over from one chunk to the next. Players standing outside the
+        field are dropped before tracking.
+
+        Args:
+            frames: List of video frames
+            detections: Detection results from detect_chunk
+            chunk_idx: Chunk index for tracking continuity
+            field_transforms: Optional array (len(frames), 3, 3) mapping the
+                              calibrated frame into each frame, so the field
+                              test follows the camera
+
+        Returns:
+            Dictionary with tracks for players, ball, and referees
+        """
         # Initialize tracks structure
         tracks = {"players": [], "referees": [], "ball": []}
+        
+        # Player detections of the whole chunk: (frame_num, bbox, bytetrack_id)
+        chunk_players = []
+
+        cls_names = self.class_names
+        cls_names_inv = {v: k for k, v in cls_names.items()}
+
+        # Convert goalkeepers to players for tracking
+        goalkeeper_ids = [class_id for class_id, name in cls_names.items() if name == "goalkeeper"]
+        for detection_sv in detections:
+            is_goalkeeper = np.isin(detection_sv.class_id, goalkeeper_ids)
+            detection_sv.class_id[is_goalkeeper] = cls_names_inv.get("player", detection_sv.class_id[is_goalkeeper])
+
+        # Drop off-field players (coaches, ball boys, fans) before tracking
+        detections = self._filter_off_field(detections, field_transforms)
 
         # Process each frame
-        for frame_num, detection in enumerate(detections):
-            # Prepare detections for tracking
-            cls_names = detection.names
-            cls_names_inv = {v: k for k, v in cls_names.items()}
-            detection_sv = sv.Detections.from_ultralytics(detection)
-            
-            # Convert goalkeepers to players for tracking
-            for obj_idx, class_id in enumerate(detection_sv.class_id):
-                if cls_names.get(class_id) == "goalkeeper":
-                    detection_sv.class_id[obj_idx] = cls_names_inv.get("player", class_id)
+        for frame_num, detection_sv in enumerate(detections):
 
             # Update tracker
             detection_with_tracks = self.tracker.update_with_detections(detection_sv)
@@ -124,12 +389,7 @@ class JerseyTracker:
                 class_name = cls_names.get(class_id, "unknown")
                 
                 if class_name == "player":
-                    self._process_player(
-                        frames[frame_num],
-                        bbox,
-                        bytetrack_id,
-                        tracks["players"][frame_num]
-                    )
+                    chunk_players.append((frame_num, bbox, bytetrack_id))
                 elif class_name == "referee":
                     tracks["referees"][frame_num][bytetrack_id] = {"bbox": bbox}
             
@@ -140,32 +400,149 @@ class JerseyTracker:
                 if cls_names.get(class_id) == "ball":
                     tracks["ball"][frame_num][1] = {"bbox": bbox}
 
+        # Batched OCR over every player of the chunk
+        ocr_numbers = self._read_jersey_numbers(frames, chunk_players, chunk_idx=chunk_idx)
+
+        # Scatter readings back in video order so jersey history and
+        # track ID resolution see them exactly as frame-by-frame OCR would
+        for (frame_num, bbox, bytetrack_id), number in zip(chunk_players, ocr_numbers):
+            jersey_number = None
+            if self.jersey_detector:
+                jersey_number = self.jersey_detector.update_history(bytetrack_id, number)
+            
+            self._add_player(bbox, bytetrack_id, jersey_number, tracks["players"][frame_num])
+
+        # Team assignment while the chunk's frames are still decoded
+        self._assign_teams(frames, tracks["players"])
+
         return tracks
 
-    def _process_player(self, frame, bbox, bytetrack_id, frame_players):
+    def _filter_off_field(self, detections, field_transforms=None):
         """
-        Process a single player detection
+        Remove player detections whose foot point is outside the field
+
+        The foot points of every frame of the chunk are tested in one
+        lookup against the rasterized field mask.
 
         Args:
-            frame: Video frame
-            bbox: Bounding box
-            bytetrack_id: ByteTrack ID
-            frame_players: Dictionary to add player to
+            detections: List of sv.Detections, one per frame
+            field_transforms: Optional per-frame calibrated -> frame homographies
+
+        Returns:
+            List of filtered sv.Detections
         """
-        # Check if player is inside field
-        foot_x = (bbox[0] + bbox[2]) / 2
-        foot_y = bbox[3]
+        if not self.field_mask.enabled or not detections:
+            return detections
+        
+        player_ids = [class_id for class_id, name in self.class_names.items() if name == "player"]
+        
+        counts = [len(detection) for detection in detections]
+        if sum(counts) == 0:
+            return detections
+        
+        xyxy = np.concatenate([detection.xyxy for detection in detections])
+        class_id = np.concatenate([detection.class_id for detection in detections])
+        frame_indices = np.repeat(np.arange(len(detections)), counts)
+        
+        feet = np.column_stack([(xyxy[:, 0] + xyxy[:, 2]) / 2, xyxy[:, 3]])
+        keep = self.field_mask.contains_points(feet, field_transforms, frame_indices)
+        keep |= ~np.isin(class_id, player_ids)
         
-        if not self.field_mask.is_inside_field((foot_x, foot_y)):
+        splits = np.cumsum(counts)[:-1]
+        return [
+            detection if frame_keep.all() else detection[frame_keep]
+            for detection, frame_keep in zip(detections, np.split(keep, splits))
+        ]
+
+    def _assign_teams(self, frames, player_tracks):
+        """
+        Assign teams to the players of a chunk from their jersey colours
+
+        Colours are extracted once per player detection (skipping tracks
+        whose team vote is frozen). If team colours are not fitted yet they
+        are fitted on the frame of the chunk with the most usable colours,
+        then every colour is classified and added to the track votes.
+
+        Args:
+            frames: List of video frames
+            player_tracks: Per-frame player dictionaries of the chunk
+        """
+        if self.team_assigner is None:
             return
         
-        # Detect jersey number
-        jersey_number = None
-        if self.jersey_detector:
-            jersey_number = self.jersey_detector.detect_number(
-                frame, bbox, bytetrack_id
+        frame_colors = []
+        for frame_num, frame_players in enumerate(player_tracks):
+            player_ids = list(frame_players.keys())
+            bboxes = [frame_players[player_id]["bbox"] for player_id in player_ids]
+            colors = self.team_assigner.extract_player_colors(frames[frame_num], bboxes, player_ids)
+            frame_colors.append((player_ids, colors))
+        
+        if not self.team_assigner.is_fitted and frame_colors:
+            _, best_colors = max(
+                frame_colors, key=lambda entry: np.count_nonzero(~np.isnan(entry[1][:, 0]))
             )
+            self.team_assigner.fit_team_colors(best_colors)
+        
+        for frame_players, (player_ids, colors) in zip(player_tracks, frame_colors):
+            teams = self.team_assigner.update_votes(player_ids, colors)
+            for player_id, team in zip(player_ids, teams):
+                frame_players[player_id]["team"] = team
+
+    def _read_jersey_numbers(self, frames, chunk_players, chunk_idx=0):
+        """
+        Run batched jersey number OCR for the player detections of a chunk
+
+        Args:
+            frames: List of video frames
+            chunk_players: List of (frame_num, bbox, bytetrack_id)
+            chunk_idx: Global index of the chunk's first frame
+
+        Returns:
+            List with the raw OCR reading (or None) for each detection
+        """
+        numbers = [None] * len(chunk_players)
+        
+        if not self.jersey_detector or not self.jersey_detector.enabled:
+            return numbers
         
+        jersey_rois = [
+            self.jersey_detector.extract_jersey_region(frames[frame_num], bbox)
+            for frame_num, bbox, _ in chunk_players
+        ]
+        
+        if self.ocr_scheduler is None:
+            return self.jersey_detector.read_numbers_batch(jersey_rois)
+        
+        # Only OCR the ROIs the scheduler picks (unconfirmed tracks first,
+        # locked tracks at a growing re-check interval, within the budget)
+        locked_numbers = self.jersey_detector.original_to_jersey
+        candidates = [
+            (chunk_idx + frame_num, bytetrack_id, roi)
+            for (frame_num, _, bytetrack_id), roi in zip(chunk_players, jersey_rois)
+        ]
+        selected = self.ocr_scheduler.select(candidates, locked_numbers)
+        
+        readings = self.jersey_detector.read_numbers_batch([jersey_rois[idx] for idx in selected])
+        
+        for idx, number in zip(selected, readings):
+            numbers[idx] = number
+            frame_idx, bytetrack_id, _ = candidates[idx]
+            self.ocr_scheduler.record_result(
+                bytetrack_id, frame_idx, number, locked_numbers.get(bytetrack_id)
+            )
+        
+        return numbers
+
+    def _add_player(self, bbox, bytetrack_id, jersey_number, frame_players):
+        """
+        Add a player detection under its resolved track ID
+
+        Args:
+            bbox: Bounding box
+            bytetrack_id: ByteTrack ID
+            jersey_number: Validated jersey number or None
+            frame_players: Dictionary to add player to
+        """
         # Determine track ID (use jersey number if available)
         if jersey_number:
             track_id = jersey_number
@@ -182,26 +559,136 @@ class JerseyTracker:
             "jersey_number": jersey_number if jersey_number else None
         }
     
-    def _detect_frames(self, frames, batch_size=20):
+    def get_state(self):
+        """
+        Get the tracking state carried from one chunk to the next
+
+        Covers ByteTrack, the track ID mapping, the jersey number history,
+        OCR re-check schedule, team colour votes and the ball re-detection
+        trajectory, so tracking can resume at a chunk boundary exactly as
+        if it had never stopped.
+
+        Returns:
+            Picklable dictionary
+        """
+        return {
+            # ByteTrack's class is wrapped by a deprecation decorator and
+            # cannot be pickled itself; its attributes can
+            'bytetrack': dict(vars(self.tracker)),
+            'global_track_mapping': dict(self.global_track_mapping),
+            'next_temp_id': self.next_temp_id,
+            'jersey_state': self.jersey_detector.get_state() if self.jersey_detector else None,
+            'ocr_scheduler': dict(vars(self.ocr_scheduler)) if self.ocr_scheduler else None,
+            'team_assigner': dict(vars(self.team_assigner)) if self.team_assigner else None,
+            'ball_redetector': self.ball_redetector.get_state() if self.ball_redetector else None
+        }
+
+    def load_state(self, state):
+        """
+        Restore tracking state saved with get_state
+
+        Args:
+            state: Dictionary from get_state
+        """
+        vars(self.tracker).update(state['bytetrack'])
+        self.global_track_mapping = dict(state['global_track_mapping'])
+        self.next_temp_id = state['next_temp_id']
+
+        if self.jersey_detector and state.get('jersey_state'):
+            self.jersey_detector.load_state(state['jersey_state'])
+        if self.ocr_scheduler and state.get('ocr_scheduler'):
+            vars(self.ocr_scheduler).update(state['ocr_scheduler'])
+        if self.team_assigner and state.get('team_assigner'):
+            vars(self.team_assigner).update(state['team_assigner'])
+        if self.ball_redetector and state.get('ball_redetector'):
+            self.ball_redetector.load_state(state['ball_redetector'])
+
+    def _detect_frames(self, frames, batch_size=None, imgsz=None):
         """
         Detect objects in frames using YOLO
         
         Args:
             frames: List of frames
-            batch_size: Batch size for detection
+            batch_size: Batch size for detection (default: the batch
+                        tuner's current size, else self.batch_size)
+            imgsz: Optional inference size (default: the model's)
             
         Returns:
             List of detection results
         """
+        predict_args = {'conf': self.confidence_threshold, 'verbose': False}
+        if imgsz is not None:
+            predict_args['imgsz'] = imgsz
+        
+        tuner = self.batch_tuner if batch_size is None else None
+        
         detections = []
-        for i in range(0, len(frames), batch_size):
-            batch = frames[i:i+batch_size]
-            batch_detections = self.model.predict(
-                batch, conf=self.confidence_threshold, verbose=False
-            )
+        i = 0
+        while i < len(frames):
+            size = tuner.batch_size if tuner else (batch_size or self.batch_size)
+            batch = frames[i:i+size]
+            
+            start = time.perf_counter()
+            batch_detections = self.model.predict(batch, **predict_args)
+            if tuner:
+                tuner.record(size, len(batch), time.perf_counter() - start)
+            
             detections.extend(batch_detections)
+            i += len(batch)
         return detections
 
+    @staticmethod
+    def pack_detections(detections, frame_offset=0):
+        """
+        Pack per-frame detections into flat arrays (for caching)
+
+        Args:
+            detections: List of sv.Detections, one per frame
+            frame_offset: Global index of the first frame
+
+        Returns:
+            Dictionary with frame, xyxy, confidence and class_id arrays
+        """
+        counts = [len(detection) for detection in detections]
+        frames = np.repeat(np.arange(frame_offset, frame_offset + len(detections)), counts)
+
+        def stack(name, shape, dtype):
+            parts = [getattr(detection, name) for detection in detections if len(detection)]
+            if not parts:
+                return np.zeros(shape, dtype=dtype)
+            return np.concatenate(parts).astype(dtype)
+
+        return {
+            'frame': frames.astype(np.int32),
+            'xyxy': stack('xyxy', (0, 4), np.float32),
+            'confidence': stack('confidence', (0,), np.float32),
+            'class_id': stack('class_id', (0,), np.int16)
+        }
+
+    @staticmethod
+    def unpack_detections(packed, start, count):
+        """
+        Rebuild per-frame detections of a frame range from packed arrays
+
+        Args:
+            packed: Dictionary from pack_detections (rows sorted by frame)
+            start: Global index of the first frame
+            count: Number of frames
+
+        Returns:
+            List of sv.Detections, one per frame
+        """
+        bounds = np.searchsorted(packed['frame'], np.arange(start, start + count + 1))
+
+        return [
+            sv.Detections(
+                xyxy=packed['xyxy'][lo:hi].astype(np.float32),
+                confidence=packed['confidence'][lo:hi].astype(np.float32),
+                class_id=packed['class_id'][lo:hi].astype(int)
+            )
+            for lo, hi in zip(bounds[:-1], bounds[1:])
+        ]
+
     def add_position_to_tracks(self, tracks):
         """
         Add position information to tracks
@@ -233,7 +720,86 @@ class JerseyTracker:
         """
         return self.ball_interpolator.interpolate_ball_positions(ball_positions)
 
-    def draw_annotations(self, video_frames, tracks, team_ball_control):
+    def interpolate_ball_table(self, table):
+        """
+        Interpolate missing ball positions of a TrackTable
+
+        Args:
+            table: TrackTable
+
+        Returns:
+            TrackTable with one ball row per frame (interpolated rows flagged)
+        """
+        is_ball = table.object_mask('ball')
+        ball_rows = np.flatnonzero(is_ball)
+        
+        # Keep a single detection per frame
+        ball_frames, first = np.unique(table['frame'][ball_rows], return_index=True)
+        ball_rows = ball_rows[first]
+        
+        bboxes = self.ball_interpolator.interpolate_bboxes(
+            ball_frames, table['bbox'][ball_rows], table.num_frames
+        )
+        if bboxes is None:
+            return table
+        
+        interpolated = np.ones(table.num_frames, dtype=bool)
+        interpolated[ball_frames] = False
+        
+        ball_table = TrackTable({
+            'frame': np.arange(table.num_frames),
+            'track_id': np.ones(table.num_frames),
+            'object_type': np.full(table.num_frames, OBJECT_TYPES.index('ball')),
+            'bbox': bboxes,
+            'interpolated': interpolated
+        }, num_frames=table.num_frames)
+        
+        return TrackTable.concat([table.select(~is_ball), ball_table])
+
+    def track_ball_table(self, table, chunk_size=300):
+        """
+        Kalman-track the ball of a TrackTable
+
+        The ball detections are streamed through a BallTracker chunk by
+        chunk; false detections are dropped and only short gaps are filled.
+
+        Args:
+            table: TrackTable
+            chunk_size: Frames fed to the tracker at a time
+
+        Returns:
+            TrackTable with the tracked ball rows (filled rows flagged
+            as interpolated)
+        """
+        is_ball = table.object_mask('ball')
+        ball_rows = np.flatnonzero(is_ball)
+        ball_frames = table['frame'][ball_rows]
+        bboxes = table['bbox'][ball_rows]
+        
+        ball_tracker = BallTracker(**(self.ball_tracking or {}))
+        bounds = np.searchsorted(ball_frames, np.arange(0, table.num_frames + chunk_size, chunk_size))
+        
+        results = []
+        for chunk_idx, chunk_start in enumerate(range(0, table.num_frames, chunk_size)):
+            rows = slice(bounds[chunk_idx], bounds[chunk_idx + 1])
+            results.append(ball_tracker.update(
+                ball_frames[rows], bboxes[rows], min(chunk_start + chunk_size, table.num_frames)
+            ))
+        results.append(ball_tracker.flush())
+        self.ball_tracker_stats = ball_tracker.get_stats()
+        
+        frames = np.concatenate([result[0] for result in results])
+        ball_table = TrackTable({
+            'frame': frames,
+            'track_id': np.ones(len(frames)),
+            'object_type': np.full(len(frames), OBJECT_TYPES.index('ball')),
+            'bbox': np.concatenate([result[1] for result in results]),
+            'interpolated': ~np.concatenate([result[2] for result in results])
+        }, num_frames=table.num_frames)
+        
+        return TrackTable.concat([table.select(~is_ball), ball_table])
+
+    def draw_annotations(self, video_frames, tracks, team_ball_control, frame_offset=0):
         """
         Draw tracking annotations on frames
 
@@ -241,12 +807,13 @@ class JerseyTracker:
             video_frames: List of video frames
             tracks: Dictionary of tracks
             team_ball_control: Array of team possession per frame
+            frame_offset: Index of the first frame in video_frames within tracks
 
         Returns:
             Annotated frames
         """
         return self.annotation_drawer.draw_annotations(
-            video_frames, tracks, team_ball_control
+            video_frames, tracks, team_ball_control, frame_offset=frame_offset
         )
 
     def export_jersey_mapping(self, output_path):
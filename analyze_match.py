@@ -17,7 +17,7 @@ import argparse
 import sys
 import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 import cv2
 import numpy as np
 
@@ -27,8 +27,18 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 # Core imports
 from config.settings import Settings
+from config.sports_config import get_sport_config
 from utils.logger import get_logger, SportsAnalyticsLogger
-from utils.video_utils import read_video, save_video, get_video_properties
+from utils.video_utils import iter_video_chunks, VideoChunkWriter, get_video_properties
+from utils.optical_flow import OpticalFlowTracker, estimate_camera_movement_parallel
+from utils.pipeline import StagedPipeline, PipelineStage
+from utils.ocr_scheduler import OCRScheduler
+from utils.batch_tuner import BatchSizeTuner
+from utils.track_table import TrackTable, LegacyTracksView
+from utils.artifact_cache import ArtifactCache
+from utils.checkpoint import ChunkCheckpoint
+from utils.model_registry import get_registry
+from utils.inference_server import parse_address, load_authkey, AUTHKEY_ENV
 
 # Analytics modules
 from analytics import (
@@ -65,7 +75,19 @@ class MatchAnalyzer:
         field_config_path: Optional[str] = None,
         confidence_threshold: float = 0.5,
         enable_ocr: bool = True,
-        chunk_size: int = 300
+        chunk_size: int = 300,
+        pipeline: bool = False,
+        queue_size: int = 2,
+        parallel_camera: bool = False,
+        use_cache: bool = True,
+        resume: bool = False,
+        detection_stride: Optional[int] = None,
+        roi_inference: bool = False,
+        ball_redetection: bool = False,
+        backend: Optional[str] = None,
+        int8: Optional[bool] = None,
+        batch_size: Optional[Union[int, str]] = None,
+        inference_server: Optional[str] = None
     ):
         """
         Initialize match analyzer
@@ -77,14 +99,85 @@ class MatchAnalyzer:
             confidence_threshold: YOLO detection confidence (0.0-1.0)
             enable_ocr: Enable jersey number recognition
             chunk_size: Frames per processing chunk (memory management)
+            pipeline: Run decode, inference, post-processing and encoding
+                      as concurrent stages joined by bounded queues
+            queue_size: Chunks buffered between pipeline stages (backpressure)
+            parallel_camera: Estimate camera movement up front in parallel
+                             video segments instead of inline per chunk
+            use_cache: Reuse cached stage artifacts (detections, tracks,
+                       camera movement, positions and speeds)
+            resume: Continue an interrupted tracking pass from its last
+                    complete chunk checkpoint
+            detection_stride: Run YOLO every Nth frame and propagate boxes
+                              in between (default: the sport's setting,
+                              1 = every frame)
+            roi_inference: Run YOLO on a crop of the calibrated field
+                           bounds (moved with the camera when its movement
+                           is known before detection)
+            ball_redetection: Re-detect a missing or uncertain ball with
+                              tiled high-resolution inference around its
+                              predicted position
+            backend: Detector runtime: torch, onnx or openvino
+                     (default: Settings.DETECTOR_BACKEND)
+            int8: Use an INT8 quantized onnx/openvino export
+                  (default: Settings.DETECTOR_INT8)
+            batch_size: Frames per YOLO call, or "auto" to probe throughput
+                        on the first batches and keep adjusting under a
+                        memory ceiling (default: Settings.BATCH_SIZE)
+            inference_server: "host:port" of a shared inference server to
+                              use instead of loading YOLO and EasyOCR in
+                              this process (default: Settings.INFERENCE_SERVER)
         """
         self.sport = sport
         self.chunk_size = chunk_size
+        self.use_pipeline = pipeline
+        self.queue_size = queue_size
+        self.parallel_camera = parallel_camera
+        self.model_path = model_path
+        self.confidence_threshold = confidence_threshold
+        self.enable_ocr = enable_ocr
+        self.cache = ArtifactCache(Settings.CACHE_DIR, enabled=use_cache)
+        self.resume = resume
+        
+        if detection_stride is None:
+            try:
+                detection_stride = get_sport_config(sport).detection_stride
+            except ValueError:
+                detection_stride = 1
+        self.detection_stride = detection_stride
+        self.roi_inference = roi_inference
+        self.ball_redetection = ball_redetection
+        self.backend = backend or Settings.DETECTOR_BACKEND
+        self.int8 = Settings.DETECTOR_INT8 if int8 is None else int8
+        self.batch_size = Settings.BATCH_SIZE if batch_size is None else batch_size
+        self.inference_server = inference_server or Settings.INFERENCE_SERVER
+        
+        if self.inference_server:
+            authkey = load_authkey(Settings.INFERENCE_SERVER_KEY_FILE)
+            if authkey is None:
+                raise ValueError(
+                    f"No inference server key: set {AUTHKEY_ENV} or start the server on this host "
+                    f"(it writes {Settings.INFERENCE_SERVER_KEY_FILE})"
+                )
+            get_registry().use_server(
+                parse_address(self.inference_server, Settings.INFERENCE_SERVER_PORT),
+                authkey
+            )
         
         logger.info(f"🚀 Initializing Match Analyzer for {sport}")
         logger.info(f"   Model: {model_path}")
+        if self.inference_server:
+            logger.info(f"   Inference server: {self.inference_server}")
+        else:
+            logger.info(f"   Backend: {self.backend}{' (INT8)' if self.int8 else ''}")
         logger.info(f"   OCR: {'Enabled' if enable_ocr else 'Disabled'}")
         logger.info(f"   Chunk size: {chunk_size} frames")
+        logger.info(f"   YOLO batch size: {self.batch_size}")
+        logger.info(f"   Pipeline: {'Enabled' if pipeline else 'Disabled'}")
+        logger.info(f"   Detection stride: {detection_stride}")
+        logger.info(f"   Field-ROI inference: {'Enabled' if roi_inference else 'Disabled'}")
+        logger.info(f"   Ball re-detection: {'Enabled' if ball_redetection else 'Disabled'}")
+        logger.info(f"   Cache: {Settings.CACHE_DIR if use_cache else 'Disabled'}")
         
         # Initialize all components
         self._initialize_components(
@@ -105,22 +198,42 @@ class MatchAnalyzer:
         
         logger.info("📦 Loading components...")
         
+        # Team assignment (runs inside the tracker, per chunk)
+        self.team_assigner = TeamAssigner(use_lab=True)
+        
         # Core tracker
         self.tracker = JerseyTracker(
             model_path=model_path,
             field_config_path=field_config_path,
             confidence_threshold=confidence_threshold,
-            enable_ocr=enable_ocr
+            enable_ocr=enable_ocr,
+            ocr_batch_size=Settings.OCR_BATCH_SIZE,
+            ocr_scheduler=self._build_ocr_scheduler(),
+            team_assigner=self.team_assigner,
+            detection_stride=self.detection_stride,
+            keyframe_motion_threshold=Settings.KEYFRAME_MOTION_THRESHOLD,
+            roi_inference=self.roi_inference,
+            roi_margin=Settings.ROI_MARGIN,
+            ball_redetection=self._ball_redetection_params(),
+            backend=self.backend,
+            int8=self.int8,
+            calibration_videos=Settings.INPUT_VIDEOS_DIR,
+            calibration_frames=Settings.INT8_CALIBRATION_FRAMES,
+            batch_size=self.batch_size if self.batch_size != 'auto' else Settings.BATCH_SIZE_CANDIDATES[0],
+            batch_tuner=self._build_batch_tuner(),
+            ball_tracking=self._ball_tracking_params()
         )
         
-        # Team assignment
-        self.team_assigner = TeamAssigner(use_lab=True)
-        
         # Ball possession
-        self.ball_assigner = PlayerBallAssigner(max_distance=70)
+        self.ball_assigner = PlayerBallAssigner(
+            max_distance=Settings.MAX_BALL_PLAYER_DISTANCE,
+            min_hold_frames=Settings.POSSESSION_MIN_HOLD_FRAMES,
+            contest_margin=Settings.POSSESSION_CONTEST_MARGIN
+        )
         
         # Camera movement
-        self.camera_estimator = None  # Lazy init with first frame
+        self.camera_estimator = None  # Created per video from its first frame
+        self._camera_offset = np.zeros(2)  # Accumulated camera movement of the chunks so far
         
         # View transformation
         self.view_transformer = None  # Lazy init with field config
@@ -128,7 +241,9 @@ class MatchAnalyzer:
         # Speed & distance
         self.speed_estimator = SpeedAndDistanceEstimator(
             fps=Settings.DEFAULT_FPS,
-            window_size=Settings.SPEED_WINDOW_SIZE
+            window_size=Settings.SPEED_WINDOW_SIZE,
+            smoothing=Settings.SPEED_SMOOTHING,
+            max_gap=Settings.SPEED_MAX_GAP_FRAMES
         )
         
         # Analytics
@@ -157,6 +272,63 @@ class MatchAnalyzer:
         
         logger.info("✅ All components loaded")
     
+    def _build_ocr_scheduler(self) -> Optional[OCRScheduler]:
+        """Create the OCR scheduler from settings (None = OCR every detection)"""
+        params = self._ocr_scheduler_params()
+        return OCRScheduler(**params) if params else None
+    
+    def _build_batch_tuner(self) -> Optional[BatchSizeTuner]:
+        """Create the batch size tuner for batch_size="auto" (None = fixed size)"""
+        if self.batch_size != 'auto':
+            return None
+        return BatchSizeTuner(
+            candidates=Settings.BATCH_SIZE_CANDIDATES,
+            memory_limit_mb=Settings.BATCH_MEMORY_LIMIT_MB,
+            memory_fraction=Settings.BATCH_MEMORY_FRACTION,
+            throughput_drop=Settings.BATCH_THROUGHPUT_DROP
+        )
+    
+    def _ball_redetection_params(self) -> Optional[Dict]:
+        """Ball re-detector options from settings (None = re-detection disabled)"""
+        if not self.ball_redetection:
+            return None
+        
+        return {
+            'window_size': Settings.BALL_REDETECT_WINDOW,
+            'tile_size': Settings.BALL_REDETECT_TILE,
+            'tile_overlap': Settings.BALL_REDETECT_TILE_OVERLAP,
+            'imgsz': Settings.BALL_REDETECT_IMGSZ,
+            'min_confidence': Settings.BALL_REDETECT_MIN_CONFIDENCE,
+            'redetect_confidence': Settings.BALL_REDETECT_CONFIDENCE,
+            'max_gap': Settings.BALL_REDETECT_MAX_GAP
+        }
+    
+    def _ball_tracking_params(self) -> Optional[Dict]:
+        """Ball tracker options from settings (None = linear interpolation)"""
+        if not Settings.BALL_KALMAN:
+            return None
+        
+        return {
+            'max_gap': Settings.BALL_KALMAN_MAX_GAP,
+            'gate': Settings.BALL_KALMAN_GATE,
+            'process_noise': Settings.BALL_KALMAN_PROCESS_NOISE,
+            'measurement_noise': Settings.BALL_KALMAN_MEASUREMENT_NOISE,
+            'smooth': Settings.BALL_KALMAN_SMOOTH
+        }
+    
+    def _ocr_scheduler_params(self) -> Optional[Dict]:
+        """OCR scheduler parameters from settings (None = scheduling disabled)"""
+        if not Settings.OCR_SCHEDULING:
+            return None
+        
+        return {
+            'recheck_interval': Settings.OCR_RECHECK_INTERVAL,
+            'max_recheck_interval': Settings.OCR_MAX_RECHECK_INTERVAL,
+            'interval_growth': Settings.OCR_RECHECK_GROWTH,
+            'chunk_budget': Settings.OCR_CHUNK_BUDGET,
+            'min_roi_area': Settings.OCR_MIN_ROI_AREA
+        }
+    
     def analyze_video(
         self,
         video_path: str,
@@ -191,111 +363,104 @@ class MatchAnalyzer:
         logger.info(f"   Input: {video_path}")
         logger.info(f"   Output: {output_dir}")
         
-        # Read video
-        logger.info("📖 Reading video...")
-        frames = read_video(str(video_path))
         video_props = get_video_properties(str(video_path))
         fps = video_props['fps']
         
-        logger.info(f"   Frames: {len(frames)}, FPS: {fps}, Duration: {video_props['duration_sec']:.1f}s")
-        
-        # Initialize lazy components
-        if self.camera_estimator is None:
-            self.camera_estimator = CameraMovementEstimator(frames[0])
+        logger.info(f"   Frames: {video_props['total_frames']}, FPS: {fps}, Duration: {video_props['duration_sec']:.1f}s")
         
-        # Process video in chunks
-        logger.info(f"🔄 Processing {len(frames)} frames in chunks of {self.chunk_size}...")
+        # Stage artifacts are cached by content (video, weights, parameters)
+        cache_keys = self._cache_keys(str(video_path), fps)
+        track_table = self._load_tracks_artifact(cache_keys['tracks'])
+        camera_movement, frame_homographies = self._load_camera_artifact(cache_keys['camera'])
         
-        all_tracks = {"players": [], "ball": [], "referees": []}
+        # Camera movement up front when requested, when tracking is cached
+        # or when the inference ROI follows the camera
+        roi_follows_camera = self.roi_inference and Settings.ROI_FOLLOW_CAMERA
+        if camera_movement is None and (self.parallel_camera or track_table is not None or roi_follows_camera):
+            workers = Settings.CAMERA_WORKERS if self.parallel_camera else 1
+            logger.info(f"🎥 Estimating camera movement in segments ({workers or 'one per core'} workers)...")
+            camera_movement, frame_homographies = estimate_camera_movement_parallel(
+                str(video_path),
+                video_props['total_frames'],
+                workers=workers,
+                overlap=Settings.CAMERA_SEGMENT_OVERLAP,
+                min_segment_size=self.chunk_size,
+                min_distance=Settings.CAMERA_MIN_DISTANCE,
+                estimate_homography=Settings.CAMERA_HOMOGRAPHY_MODE,
+                pyramid_level=Settings.CAMERA_PYRAMID_LEVEL
+            )
+            self._save_camera_artifact(cache_keys['camera'], camera_movement, frame_homographies)
         
-        for chunk_idx in range(0, len(frames), self.chunk_size):
-            chunk_end = min(chunk_idx + self.chunk_size, len(frames))
-            chunk = frames[chunk_idx:chunk_end]
+        if track_table is None:
+            cached_detections = self._load_detections_artifact(cache_keys['detections'])
+            estimate_camera = camera_movement is None
+            if estimate_camera:
+                camera_movement = []
             
-            logger.info(f"   Chunk {chunk_idx // self.chunk_size + 1}: Frames {chunk_idx}-{chunk_end}")
+            # Stream video in chunks - only a few chunks of frames are held in memory
+            mode = "pipelined" if self.use_pipeline else "sequential"
+            logger.info(f"🔄 Streaming frames in chunks of {self.chunk_size} ({mode})...")
             
-            # Detect & track
-            tracks = self.tracker.process_chunk(chunk, chunk_idx=chunk_idx)
+            # Per-chunk checkpoints, keyed like the artifacts they produce
+            checkpoint = ChunkCheckpoint(Path(Settings.CHECKPOINT_DIR) / ArtifactCache.make_key(
+                'checkpoint', {'estimate_camera': estimate_camera},
+                upstream=[cache_keys['tracks'], cache_keys['camera']]
+            ))
             
-            # Append to all tracks
-            all_tracks['players'].extend(tracks['players'])
-            all_tracks['ball'].extend(tracks['ball'])
-            all_tracks['referees'].extend(tracks['referees'])
-        
-        logger.info(f"✅ Detection & tracking complete")
-        
-        # Assign teams (first frame with most players)
-        logger.info("🎽 Assigning teams...")
-        first_frame_with_players = self._find_frame_with_most_players(all_tracks, frames)
-        if first_frame_with_players >= 0:
-            player_detections = all_tracks['players'][first_frame_with_players]
-            self.team_assigner.assign_team_color(frames[first_frame_with_players], player_detections)
-        
-        # Assign teams to all players
-        for frame_idx, frame_tracks in enumerate(all_tracks['players']):
-            for player_id, player_info in frame_tracks.items():
-                bbox = player_info.get('bbox', [])
-                if bbox and len(bbox) == 4:
-                    team = self.team_assigner.get_player_team(frames[frame_idx], bbox, player_id)
-                    player_info['team'] = team
-        
-        logger.info("✅ Team assignment complete")
-        
-        # Camera movement compensation
-        logger.info("🎥 Estimating camera movement...")
-        camera_movement = self.camera_estimator.get_camera_movement(
-            frames,
-            read_from_stub=True,
-            stub_path=str(output_dir / "camera_movement.pkl")
-        )
-        self.camera_estimator.adjust_positions_to_tracks(all_tracks, camera_movement)
-        logger.info("✅ Camera compensation complete")
-        
-        # Perspective transformation
-        logger.info("🗺️  Transforming perspective...")
-        if self.tracker.field_mask.config:
-            # Use field config from tracker
-            config = self.tracker.field_mask.config
-            self.view_transformer = ViewTransformer(
-                pixel_vertices=config['pixel_vertices'],
-                court_length=config.get('court_length_m', Settings.FIELD_LENGTH_M),
-                court_width=config.get('court_width_m', Settings.FIELD_WIDTH_M)
+            # Camera known up front: the inference ROI and the field
+            # filter follow it
+            field_transforms = None
+            if not estimate_camera and (roi_follows_camera or Settings.FIELD_FILTER_FOLLOW_CAMERA):
+                field_transforms = self._field_transforms(camera_movement, frame_homographies)
+            
+            track_table, detections = self._run_tracking_pass(
+                str(video_path),
+                camera_movement if estimate_camera else None,
+                cached_detections,
+                checkpoint,
+                field_transforms
             )
-            self.view_transformer.add_transformed_position_to_tracks(all_tracks)
-            logger.info("✅ Perspective transformation complete")
+            
+            if track_table.num_frames == 0:
+                raise ValueError(f"No frames could be decoded from {video_path}")
+            
+            if cached_detections is None:
+                self.cache.save('detections', cache_keys['detections'], detections)
+            self._save_tracks_artifact(cache_keys['tracks'], track_table)
+            
+            if estimate_camera:
+                if Settings.CAMERA_HOMOGRAPHY_MODE:
+                    frame_homographies = self.camera_estimator.get_frame_homographies()
+                self._save_camera_artifact(cache_keys['camera'], camera_movement, frame_homographies)
+            
+            # Results are cached now, the checkpoint is no longer needed
+            checkpoint.clear()
+            
+            logger.info(f"✅ Detection, tracking & team assignment complete")
         else:
-            logger.warning("⚠️  No field config - skipping perspective transformation")
+            logger.info("♻️  Loaded cached tracks")
         
-        # Interpolate ball positions
-        logger.info("⚽ Interpolating ball positions...")
-        all_tracks['ball'] = self.tracker.interpolate_ball_positions(all_tracks['ball'])
+        frames_processed = track_table.num_frames
+        logger.info(f"   {len(track_table)} detections, {track_table.nbytes / 1e6:.1f} MB")
         
-        # Ball assignment
-        logger.info("🤾 Assigning ball possession...")
-        team_ball_control = []
-        for frame_idx, frame_tracks in enumerate(all_tracks['players']):
-            ball_data = all_tracks['ball'][frame_idx] if frame_idx < len(all_tracks['ball']) else {}
-            ball_bbox = ball_data.get(1, {}).get('bbox', []) if ball_data else []
-            
-            if ball_bbox and len(ball_bbox) == 4:
-                assigned_player = self.ball_assigner.assign_ball_to_player(frame_tracks, ball_bbox)
-                
-                if assigned_player != -1 and assigned_player in frame_tracks:
-                    frame_tracks[assigned_player]['has_ball'] = True
-                    team = frame_tracks[assigned_player].get('team', 1)
-                else:
-                    team = team_ball_control[-1] if team_ball_control else 1
-            else:
-                team = team_ball_control[-1] if team_ball_control else 1
-            
-            team_ball_control.append(team)
+        # Camera movement stubs next to the other outputs
+        OpticalFlowTracker.save_stub(str(output_dir / "camera_movement.pkl"), camera_movement)
+        if frame_homographies is not None:
+            OpticalFlowTracker.save_homographies(str(output_dir / "homographies.npy"), frame_homographies)
         
-        logger.info("✅ Ball assignment complete")
+        # Positions, possession & speeds
+        motion = self._load_motion_artifact(cache_keys['motion'])
+        if motion is not None:
+            logger.info("♻️  Loaded cached positions, possession & speeds")
+            track_table, team_ball_control = motion
+        else:
+            track_table, team_ball_control = self._compute_motion(
+                track_table, camera_movement, frame_homographies, fps
+            )
+            self._save_motion_artifact(cache_keys['motion'], track_table, team_ball_control)
         
-        # Speed & distance
-        logger.info("⚡ Calculating speed & distance...")
-        self.speed_estimator.add_speed_and_distance_to_tracks(all_tracks, fps=fps)
-        logger.info("✅ Speed & distance complete")
+        # Dictionary view for stages that still walk tracks[object_type][frame]
+        all_tracks = track_table.legacy_view()
         
         # Pass detection
         logger.info("🎯 Detecting passes...")
@@ -317,7 +482,7 @@ class MatchAnalyzer:
         
         # Heatmap generation
         logger.info("🗺️  Generating heatmaps...")
-        self.heatmap_gen.accumulate_positions(all_tracks)
+        self.heatmap_gen.accumulate_table(track_table)
         heatmap_dir = output_dir / "heatmaps"
         heatmap_dir.mkdir(exist_ok=True)
         self.heatmap_gen.generate_heatmap_images(str(heatmap_dir))
@@ -335,7 +500,7 @@ class MatchAnalyzer:
             logger.info("💾 Exporting data...")
             
             # CSV exports
-            self.csv_exporter.export_tracking_data(all_tracks, str(output_dir / "tracking_data.csv"))
+            self.csv_exporter.export_table(track_table, str(output_dir / "tracking_data.csv"))
             self.pass_detector.export_passes_csv(str(output_dir / "passes.csv"))
             self.event_detector.export_events_csv(events, str(output_dir / "events.csv"))
             self.tracker.export_jersey_mapping(str(output_dir / "jersey_mapping.csv"))
@@ -345,7 +510,7 @@ class MatchAnalyzer:
             import pandas as pd
             
             # Convert tracking to DataFrame
-            tracking_data = self._convert_tracks_to_dataframe(all_tracks, fps)
+            tracking_data = self._convert_tracks_to_dataframe(track_table, fps)
             passes_df = pd.DataFrame(self.pass_detector.passes) if self.pass_detector.passes else pd.DataFrame()
             events_df = pd.DataFrame(events) if events else pd.DataFrame()
             
@@ -390,10 +555,16 @@ class MatchAnalyzer:
         # Export annotated video
         if export_video:
             logger.info("🎬 Creating annotated video...")
-            annotated_frames = self.tracker.draw_annotations(frames, all_tracks, team_ball_control)
-            
             output_video_path = output_dir / f"{video_path.stem}_complete_analysis.mp4"
-            save_video(str(output_video_path), annotated_frames, fps=fps)
+            
+            self._render_video(
+                str(video_path),
+                str(output_video_path),
+                all_tracks,
+                team_ball_control,
+                fps
+            )
+            
             logger.info(f"✅ Annotated video saved: {output_video_path}")
         
         # Analysis complete
@@ -409,7 +580,7 @@ class MatchAnalyzer:
         # Return summary
         return {
             'video_name': video_path.stem,
-            'frames_processed': len(frames),
+            'frames_processed': frames_processed,
             'duration_seconds': elapsed_time,
             'passes': pass_stats,
             'events': len(events),
@@ -418,70 +589,617 @@ class MatchAnalyzer:
             'output_directory': str(output_dir)
         }
     
-    def _find_frame_with_most_players(self, tracks: Dict, frames: List[np.ndarray]) -> int:
+    def _compute_motion(
+        self,
+        track_table: TrackTable,
+        camera_movement: List,
+        frame_homographies: Optional[np.ndarray],
+        fps: float
+    ) -> Tuple[TrackTable, List[int]]:
         """
-        Find frame with most player detections (for team assignment)
+        Ball tracking, camera compensation, field positions,
+        possession and speeds
         
         Args:
-            tracks: Tracking data
-            frames: Video frames
+            track_table: TrackTable from the tracking pass
+            camera_movement: Camera movement per frame
+            frame_homographies: Optional per-frame homographies
+            fps: Video frames per second
             
         Returns:
-            Frame index with most players, or -1 if none
+            Tuple (updated TrackTable, team in possession per frame)
         """
-        max_players = 0
-        best_frame = -1
+        # Track / interpolate ball positions (before compensation so they are adjusted too)
+        if self.tracker.ball_tracking is not None:
+            logger.info("⚽ Tracking ball positions...")
+            track_table = self.tracker.track_ball_table(track_table, chunk_size=self.chunk_size)
+            ball_stats = self.tracker.ball_tracker_stats
+            logger.info(f"✅ Ball tracked: {ball_stats['observed']} observed, {ball_stats['filled']} filled, "
+                        f"{ball_stats['rejected']} detections gated out")
+        else:
+            logger.info("⚽ Interpolating ball positions...")
+            track_table = self.tracker.interpolate_ball_table(track_table)
+        
+        # Camera movement compensation
+        logger.info("🎥 Compensating camera movement...")
+        CameraMovementEstimator.adjust_positions_to_table(track_table, camera_movement)
+        logger.info("✅ Camera compensation complete")
+        
+        # Perspective transformation
+        logger.info("🗺️  Transforming perspective...")
+        if self.tracker.field_mask.config:
+            # Use field config from tracker
+            config = self.tracker.field_mask.config
+            self.view_transformer = ViewTransformer(
+                pixel_vertices=config['pixel_vertices'],
+                court_length=config.get('court_length_m', Settings.FIELD_LENGTH_M),
+                court_width=config.get('court_width_m', Settings.FIELD_WIDTH_M)
+            )
+            self.view_transformer.add_transformed_position_to_table(track_table, frame_homographies)
+            logger.info("✅ Perspective transformation complete")
+        else:
+            logger.warning("⚠️  No field config - skipping perspective transformation")
         
-        # Check first 30 seconds (900 frames at 30fps)
-        search_frames = min(900, len(tracks['players']))
+        # Ball assignment
+        logger.info("🤾 Assigning ball possession...")
+        team_ball_control = self._assign_ball_possession(track_table)
+        logger.info("✅ Ball assignment complete")
         
-        for frame_idx in range(0, search_frames, 30):  # Sample every 30 frames
-            if frame_idx < len(tracks['players']):
-                player_count = len(tracks['players'][frame_idx])
-                if player_count > max_players:
-                    max_players = player_count
-                    best_frame = frame_idx
+        # Speed & distance
+        logger.info("⚡ Calculating speed & distance...")
+        self.speed_estimator.add_speed_and_distance_to_table(track_table, fps=fps)
+        logger.info("✅ Speed & distance complete")
         
-        return best_frame
+        return track_table, team_ball_control
     
-    def _convert_tracks_to_dataframe(self, tracks: Dict, fps: float) -> 'pd.DataFrame':
+    def _cache_keys(self, video_path: str, fps: float) -> Dict[str, str]:
         """
-        Convert tracking data to pandas DataFrame for statistics
+        Keys of every cached stage artifact of a video
+        
+        Each key covers the inputs and parameters of its stage plus the
+        keys of the stages it consumes, so a parameter change invalidates
+        exactly the affected stage and everything downstream of it.
         
         Args:
-            tracks: Tracking dictionary
+            video_path: Path to input video
+            fps: Video frames per second
+            
+        Returns:
+            Dictionary {stage: key}
+        """
+        make_key = ArtifactCache.make_key
+        video = self.cache.fingerprint_file(video_path)
+        
+        backend, int8 = self.backend, self.int8 and self.backend != 'torch'
+        server_info = getattr(self.tracker.model, 'server_info', None)
+        if server_info is not None:
+            # The inference server decides the weights and runtime
+            weights, backend, int8 = server_info['weights'], server_info['backend'], server_info['int8']
+        elif Path(self.model_path).exists():
+            weights = self.cache.fingerprint_file(self.model_path, full=True)
+        else:
+            weights = str(self.model_path)
+        
+        field_config = self.tracker.field_mask.config
+        
+        camera = make_key('camera', {
+            'video': video,
+            'min_distance': Settings.CAMERA_MIN_DISTANCE,
+            'homography': Settings.CAMERA_HOMOGRAPHY_MODE,
+            'pyramid_level': Settings.CAMERA_PYRAMID_LEVEL
+        })
+        
+        roi = None
+        if self.roi_inference:
+            roi = {
+                'field_config': field_config,
+                'margin': Settings.ROI_MARGIN,
+                'follow_camera': camera if Settings.ROI_FOLLOW_CAMERA else None
+            }
+        
+        detections = make_key('detections', {
+            'video': video,
+            'weights': weights,
+            'confidence': self.confidence_threshold,
+            'backend': backend,
+            'int8': int8,
+            'detection_stride': self.detection_stride,
+            'keyframe_motion': Settings.KEYFRAME_MOTION_THRESHOLD if self.detection_stride > 1 else None,
+            'roi': roi,
+            'ball_redetection': self._ball_redetection_params()
+        })
+        tracks = make_key('tracks', {
+            'enable_ocr': self.enable_ocr,
+            'chunk_size': self.chunk_size,
+            'field_config': field_config,
+            'field_filter_camera': camera if Settings.FIELD_FILTER_FOLLOW_CAMERA else None,
+            'ocr_batch_size': Settings.OCR_BATCH_SIZE,
+            'ocr_scheduler': self._ocr_scheduler_params(),
+            'team_max_votes': self.team_assigner.max_votes
+        }, upstream=[detections])
+        motion = make_key('motion', {
+            'fps': fps,
+            'field_config': field_config,
+            'ball_tracking': self._ball_tracking_params(),
+            'chunk_size': self.chunk_size if Settings.BALL_KALMAN else None,
+            'ball_max_distance': self.ball_assigner.max_distance,
+            'possession_min_hold': self.ball_assigner.min_hold_frames,
+            'possession_contest_margin': self.ball_assigner.contest_margin,
+            'speed_window': self.speed_estimator.frame_window,
+            'speed_smoothing': self.speed_estimator.smoothing,
+            'speed_max_gap': self.speed_estimator.max_gap
+        }, upstream=[tracks, camera])
+        
+        return {'detections': detections, 'tracks': tracks, 'camera': camera, 'motion': motion}
+    
+    def _load_detections_artifact(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """Load cached packed detections (None on a miss)"""
+        artifact = self.cache.load('detections', key)
+        if artifact is None:
+            return None
+        
+        logger.info("♻️  Using cached detections (skipping inference)")
+        return artifact[0]
+    
+    def _load_tracks_artifact(self, key: str) -> Optional[TrackTable]:
+        """Load cached tracks and restore the jersey number history"""
+        artifact = self.cache.load('tracks', key)
+        if artifact is None:
+            return None
+        
+        arrays, meta = artifact
+        if self.tracker.jersey_detector and meta.get('jersey_state'):
+            self.tracker.jersey_detector.load_state(meta['jersey_state'])
+        
+        return TrackTable(arrays, num_frames=meta['num_frames'])
+    
+    def _save_tracks_artifact(self, key: str, track_table: TrackTable):
+        """Cache tracks together with the jersey number history"""
+        meta = {'num_frames': track_table.num_frames}
+        if self.tracker.jersey_detector:
+            meta['jersey_state'] = self.tracker.jersey_detector.get_state()
+        
+        self.cache.save('tracks', key, track_table.columns, meta)
+    
+    def _load_camera_artifact(self, key: str) -> Tuple[Optional[List], Optional[np.ndarray]]:
+        """Load cached camera movement and homographies (None, None on a miss)"""
+        artifact = self.cache.load('camera', key)
+        if artifact is None:
+            return None, None
+        
+        arrays, _ = artifact
+        return arrays['movement'].tolist(), arrays.get('homographies')
+    
+    def _save_camera_artifact(self, key: str, camera_movement: List, frame_homographies: Optional[np.ndarray]):
+        """Cache camera movement and homographies"""
+        arrays = {'movement': np.asarray(camera_movement, dtype=np.float32).reshape(-1, 2)}
+        if frame_homographies is not None:
+            arrays['homographies'] = np.asarray(frame_homographies, dtype=np.float32)
+        
+        self.cache.save('camera', key, arrays)
+    
+    def _load_motion_artifact(self, key: str) -> Optional[Tuple[TrackTable, List[int]]]:
+        """Load cached post-tracking table and possession per frame"""
+        artifact = self.cache.load('motion', key)
+        if artifact is None:
+            return None
+        
+        arrays, meta = artifact
+        team_ball_control = arrays.pop('team_ball_control').tolist()
+        return TrackTable(arrays, num_frames=meta['num_frames']), team_ball_control
+    
+    def _save_motion_artifact(self, key: str, track_table: TrackTable, team_ball_control: List[int]):
+        """Cache post-tracking table and possession per frame"""
+        arrays = dict(track_table.columns)
+        arrays['team_ball_control'] = np.asarray(team_ball_control, dtype=np.int8)
+        
+        self.cache.save('motion', key, arrays, {'num_frames': track_table.num_frames})
+    
+    def _run_tracking_pass(
+        self,
+        video_path: str,
+        camera_movement: Optional[List],
+        cached_detections: Optional[Dict[str, np.ndarray]] = None,
+        checkpoint: Optional[ChunkCheckpoint] = None,
+        field_transforms: Optional[np.ndarray] = None
+    ) -> Tuple[TrackTable, Dict[str, np.ndarray]]:
+        """
+        First streaming pass: decode, detect, track (including inline team
+        assignment) and estimate camera movement chunk by chunk
+        
+        Args:
+            video_path: Path to input video
+            camera_movement: List to extend with per-frame camera movement,
+                             or None to skip estimation (cached)
+            cached_detections: Packed detections of a previous run; when
+                               given, inference is skipped
+            checkpoint: Optional ChunkCheckpoint written after every chunk
+                        (and resumed from when resume is enabled)
+            field_transforms: Optional per-frame homographies moving the
+                              field-ROI with the camera
+            
+        Returns:
+            Tuple (TrackTable for the whole video, packed detections)
+        """
+        chunk_tables = []
+        chunk_detections = []
+        start_frame = 0
+        self._camera_offset = np.zeros(2)
+        
+        if checkpoint is not None:
+            resumed = checkpoint.load() if self.resume else None
+            if resumed is not None:
+                start_frame = self._restore_checkpoint(
+                    resumed, video_path, camera_movement, chunk_tables, chunk_detections
+                )
+                logger.info(f"⏯️  Resuming from frame {start_frame} ({len(chunk_tables)} chunks checkpointed)")
+            else:
+                checkpoint.clear()
+        
+        def detect(item):
+            chunk_idx, chunk = item
+            redetector_state = None
+            if cached_detections is not None:
+                detections = JerseyTracker.unpack_detections(cached_detections, chunk_idx, len(chunk))
+                packed = None
+            else:
+                chunk_transforms = None
+                if field_transforms is not None and self.roi_inference and Settings.ROI_FOLLOW_CAMERA:
+                    chunk_transforms = field_transforms[chunk_idx:chunk_idx + len(chunk)]
+                detections = self.tracker.detect_chunk(chunk, field_transforms=chunk_transforms)
+                packed = JerseyTracker.pack_detections(detections, frame_offset=chunk_idx)
+                
+                # Inference may run ahead of post-processing, so the ball
+                # re-detection state of this chunk is taken here
+                if self.tracker.ball_redetector is not None:
+                    redetector_state = self.tracker.ball_redetector.get_state()
+            return chunk_idx, chunk, detections, packed, redetector_state
+        
+        def postprocess(item):
+            chunk_idx, chunk, detections, packed, redetector_state = item
+            
+            logger.info(f"   Chunk {chunk_idx // self.chunk_size + 1}: Frames {chunk_idx}-{chunk_idx + len(chunk)}")
+            
+            # Camera movement (optical flow state carries across chunks)
+            if chunk_idx == 0:
+                self.camera_estimator = self._create_camera_estimator(chunk[0])
+            chunk_camera = None
+            chunk_offset = self._camera_offset
+            if camera_movement is not None:
+                chunk_movement = self.camera_estimator.update(chunk)
+                camera_movement.extend(chunk_movement)
+                chunk_camera = {'movement': np.asarray(chunk_movement, dtype=np.float32).reshape(-1, 2)}
+                if Settings.CAMERA_HOMOGRAPHY_MODE:
+                    chunk_camera['step_homographies'] = self.camera_estimator.get_step_homographies(chunk_idx)
+                    chunk_camera['frame_homographies'] = self.camera_estimator.get_frame_homographies(chunk_idx)
+                self._camera_offset = chunk_offset + chunk_camera['movement'].sum(axis=0, dtype=np.float64)
+            
+            # Track detections, recognise jersey numbers & assign teams
+            tracks = self.tracker.track_chunk(
+                chunk, detections, chunk_idx=chunk_idx,
+                field_transforms=self._chunk_field_transforms(
+                    chunk_idx, len(chunk), chunk_camera, chunk_offset, field_transforms
+                )
+            )
+            
+            # Keep the chunk in columnar form only
+            chunk_table = TrackTable.from_tracks(tracks, frame_offset=chunk_idx)
+            chunk_tables.append(chunk_table)
+            if packed is not None:
+                chunk_detections.append(packed)
+            
+            if checkpoint is not None:
+                tracker_state = self.tracker.get_state()
+                if redetector_state is not None:
+                    tracker_state['ball_redetector'] = redetector_state
+                # Per-frame camera results go to the chunk file, the state
+                # only keeps what the next chunk needs
+                checkpoint.save(
+                    chunk_idx + len(chunk),
+                    {
+                        'tracker': tracker_state,
+                        'camera_estimator': self.camera_estimator.get_state() if chunk_camera else None
+                    },
+                    chunk_table.columns,
+                    packed,
+                    chunk_camera
+                )
+        
+        pipeline = StagedPipeline(
+            source=iter_video_chunks(video_path, self.chunk_size, start_frame=start_frame),
+            stages=[
+                PipelineStage('inference', detect),
+                PipelineStage('post-processing', postprocess)
+            ],
+            source_name='decode',
+            queue_size=self.queue_size,
+            item_size=lambda item: len(item[1])
+        )
+        pipeline.run(threaded=self.use_pipeline)
+        
+        logger.info("⏱️  Tracking pass throughput:")
+        pipeline.log_stats(logger)
+        
+        detection_stats = self.tracker.detection_stats
+        if cached_detections is None and self.detection_stride > 1 and detection_stats['frames']:
+            logger.info(f"🎯 YOLO keyframes: {detection_stats['keyframes']}/{detection_stats['frames']} frames "
+                        f"(stride {self.detection_stride}, boxes propagated in between)")
+        
+        if cached_detections is None and self.tracker.batch_tuner is not None:
+            tuning = self.tracker.batch_tuner.get_stats()
+            if tuning['fps']:
+                logger.info(f"📦 YOLO batch size: {tuning['batch_size']} ({tuning['fps']:.1f} fps, "
+                            f"{len(tuning['adjustments'])} adjustments)")
+            for reason, old_size, new_size, fps in tuning['adjustments']:
+                logger.info(f"   {reason}: {old_size} -> {new_size}" + (f" ({fps:.1f} fps)" if fps else ""))
+        
+        if cached_detections is None and self.tracker.ball_redetector is not None:
+            ball_stats = self.tracker.ball_redetector.get_stats()
+            logger.info(f"⚽ Ball re-detection: recovered {ball_stats['recovered']} of "
+                        f"{ball_stats['frames_checked']} frames ({ball_stats['tiles']} tiles)")
+        
+        if self.tracker.ocr_scheduler is not None:
+            ocr_stats = self.tracker.ocr_scheduler.get_stats()
+            logger.info(f"🔢 OCR calls: {ocr_stats['ocr_calls']}, skipped: {ocr_stats['ocr_skipped']} "
+                        f"(locked {ocr_stats['skipped_locked']}, budget {ocr_stats['skipped_budget']}, "
+                        f"small ROI {ocr_stats['skipped_small_roi']})")
+        
+        if cached_detections is None:
+            cached_detections = {
+                name: np.concatenate([packed[name] for packed in chunk_detections])
+                for name in ('frame', 'xyxy', 'confidence', 'class_id')
+            } if chunk_detections else JerseyTracker.pack_detections([])
+        
+        return TrackTable.concat(chunk_tables), cached_detections
+    
+    def _create_camera_estimator(self, frame: np.ndarray) -> CameraMovementEstimator:
+        """Camera movement estimator for a video starting with this frame"""
+        return CameraMovementEstimator(
+            frame,
+            min_distance=Settings.CAMERA_MIN_DISTANCE,
+            estimate_homography=Settings.CAMERA_HOMOGRAPHY_MODE,
+            pyramid_level=Settings.CAMERA_PYRAMID_LEVEL
+        )
+    
+    def _restore_checkpoint(
+        self,
+        resumed: Tuple,
+        video_path: str,
+        camera_movement: Optional[List],
+        chunk_tables: List[TrackTable],
+        chunk_detections: List[Dict[str, np.ndarray]]
+    ) -> int:
+        """
+        Restore tracking state and completed chunks from a checkpoint
+        
+        The camera movement (and homography) history is rebuilt from the
+        chunk files; the estimator is recreated from the video's first
+        frame as in a fresh run and its carry-over state loaded.
+        
+        Args:
+            resumed: Tuple from ChunkCheckpoint.load
+            video_path: Path to input video
+            camera_movement: Camera movement list to extend (or None)
+            chunk_tables: List to fill with the completed chunk tables
+            chunk_detections: List to fill with their packed detections
+            
+        Returns:
+            Global index of the first frame still to process
+        """
+        next_frame, state, chunk_columns, packed_detections, chunk_camera = resumed
+        
+        self.tracker.load_state(state['tracker'])
+        
+        chunks = iter_video_chunks(video_path, chunk_size=1)
+        _, (first_frame,) = next(chunks)
+        chunks.close()
+        self.camera_estimator = self._create_camera_estimator(first_frame)
+        
+        if camera_movement is not None and state['camera_estimator'] is not None:
+            history = {
+                name: np.concatenate([camera[name] for camera in chunk_camera])
+                for name in chunk_camera[0]
+            }
+            camera_movement.extend(history['movement'].tolist())
+            for camera in chunk_camera:
+                self._camera_offset = self._camera_offset + camera['movement'].sum(axis=0, dtype=np.float64)
+            self.camera_estimator.load_state(
+                state['camera_estimator'],
+                history.get('step_homographies'),
+                history.get('frame_homographies')
+            )
+        
+        chunk_tables.extend(TrackTable(columns, num_frames=next_frame) for columns in chunk_columns)
+        chunk_detections.extend(packed for packed in packed_detections if packed)
+        
+        return next_frame
+    
+    def _chunk_field_transforms(
+        self,
+        chunk_idx: int,
+        chunk_len: int,
+        chunk_camera: Optional[Dict[str, np.ndarray]],
+        chunk_offset: np.ndarray,
+        field_transforms: Optional[np.ndarray]
+    ) -> Optional[np.ndarray]:
+        """
+        Calibrated -> frame homographies of a chunk for the field filter
+        
+        Only the chunk's own frames are transformed, so the cost per chunk
+        does not grow with the video.
+        
+        Args:
+            chunk_idx: Global index of the chunk's first frame
+            chunk_len: Frames in the chunk
+            chunk_camera: Camera arrays estimated inline for the chunk
+                          (movement, frame_homographies), or None
+            chunk_offset: Accumulated camera movement before the chunk
+            field_transforms: Per-frame homographies known up front, or None
+            
+        Returns:
+            Array of shape (chunk_len, 3, 3) or None (static field)
+        """
+        if not Settings.FIELD_FILTER_FOLLOW_CAMERA or not self.tracker.field_mask.enabled:
+            return None
+        if field_transforms is not None:
+            return field_transforms[chunk_idx:chunk_idx + chunk_len]
+        if chunk_camera is None:
+            return None
+        
+        return self._field_transforms(
+            chunk_camera['movement'], chunk_camera.get('frame_homographies'), origin=chunk_offset
+        )
+    
+    @staticmethod
+    def _field_transforms(
+        camera_movement: List,
+        frame_homographies: Optional[np.ndarray],
+        origin: Union[np.ndarray, Tuple[float, float]] = (0, 0)
+    ) -> np.ndarray:
+        """
+        Per-frame homographies from the calibrated (first) frame into each frame
+        
+        Args:
+            camera_movement: Camera movement per frame (content displacement)
+            frame_homographies: Optional frame -> first frame homographies
+            origin: Accumulated camera movement before the first given frame
+            
+        Returns:
+            Array of shape (num_frames, 3, 3)
+        """
+        if frame_homographies is not None:
+            return np.linalg.inv(np.asarray(frame_homographies, dtype=np.float64))
+        
+        # Translation only: the field moves with the accumulated movement
+        offsets = np.asarray(origin, dtype=np.float64) + np.cumsum(
+            np.asarray(camera_movement, dtype=np.float64).reshape(-1, 2), axis=0
+        )
+        transforms = np.tile(np.eye(3), (len(offsets), 1, 1))
+        transforms[:, :2, 2] = offsets
+        return transforms
+    
+    def _assign_ball_possession(self, track_table: TrackTable) -> List[int]:
+        """
+        Assign the ball to the closest player of every frame
+        
+        Sets has_ball on the possessing player's row; frames without an
+        assignment keep the previous team in possession.
+        
+        Args:
+            track_table: TrackTable with ball positions
+            
+        Returns:
+            Team in possession per frame
+        """
+        player_rows = np.flatnonzero(track_table.object_mask('players'))
+        ball_rows = np.flatnonzero(track_table.object_mask('ball'))
+        
+        has_ball, team_ball_control, _ = self.ball_assigner.assign_possession(
+            track_table['frame'][player_rows],
+            track_table['bbox'][player_rows],
+            track_table['team'][player_rows],
+            track_table['track_id'][player_rows],
+            track_table['frame'][ball_rows],
+            track_table['bbox'][ball_rows],
+            track_table.num_frames
+        )
+        track_table['has_ball'][player_rows[has_ball]] = True
+        
+        return team_ball_control.tolist()
+    
+    def _render_video(
+        self,
+        video_path: str,
+        output_video_path: str,
+        tracks: LegacyTracksView,
+        team_ball_control: List[int],
+        fps: float
+    ):
+        """
+        Second streaming pass: re-decode, annotate and encode chunk by chunk
+        
+        Args:
+            video_path: Path to input video
+            output_video_path: Path of annotated output video
+            tracks: Tracking dictionary for the whole video
+            team_ball_control: Team in possession per frame
+            fps: Output frames per second
+        """
+        with VideoChunkWriter(output_video_path, fps=fps) as writer:
+            
+            def annotate(item):
+                chunk_idx, chunk = item
+                annotated_frames = self.tracker.draw_annotations(
+                    chunk, tracks, team_ball_control, frame_offset=chunk_idx
+                )
+                return chunk_idx, annotated_frames
+            
+            def encode(item):
+                writer.write(item[1])
+            
+            pipeline = StagedPipeline(
+                source=iter_video_chunks(video_path, self.chunk_size),
+                stages=[
+                    PipelineStage('annotate', annotate),
+                    PipelineStage('encode', encode)
+                ],
+                source_name='decode',
+                queue_size=self.queue_size,
+                item_size=lambda item: len(item[1])
+            )
+            pipeline.run(threaded=self.use_pipeline)
+        
+        logger.info("⏱️  Rendering pass throughput:")
+        pipeline.log_stats(logger)
+    
+    def _convert_tracks_to_dataframe(self, track_table: TrackTable, fps: float) -> 'pd.DataFrame':
+        """
+        Convert player tracking data to pandas DataFrame for statistics
+        
+        Args:
+            track_table: TrackTable
             fps: Video frames per second
             
         Returns:
             DataFrame with tracking data
         """
-        import pandas as pd
-        
-        rows = []
-        
-        for frame_idx, frame_tracks in enumerate(tracks['players']):
-            for player_id, player_info in frame_tracks.items():
-                row = {
-                    'frame': frame_idx,
-                    'timestamp': frame_idx / fps,
-                    'player_id': player_id,
-                    'team': player_info.get('team', 1),
-                    'jersey_number': player_info.get('jersey_number', ''),
-                    'bbox_x1': player_info.get('bbox', [0, 0, 0, 0])[0],
-                    'bbox_y1': player_info.get('bbox', [0, 0, 0, 0])[1],
-                    'bbox_x2': player_info.get('bbox', [0, 0, 0, 0])[2],
-                    'bbox_y2': player_info.get('bbox', [0, 0, 0, 0])[3],
-                    'position_x': player_info.get('position', [0, 0])[0],
-                    'position_y': player_info.get('position', [0, 0])[1],
-                    'position_transformed_x': player_info.get('position_transformed', [0, 0])[0],
-                    'position_transformed_y': player_info.get('position_transformed', [0, 0])[1],
-                    'speed_mps': player_info.get('speed', 0),
-                    'distance_m': player_info.get('distance', 0),
-                    'has_ball': player_info.get('has_ball', False)
-                }
-                rows.append(row)
-        
-        return pd.DataFrame(rows)
+        df = track_table.to_dataframe('players')
+        
+        df.insert(1, 'timestamp', df['frame'] / fps)
+        df['team'] = df['team'].where(df['team'] > 0, 1)
+        df['jersey_number'] = df['jersey_number'].astype(object).where(df['jersey_number'] >= 0, '')
+        df['position_transformed_x'] = df['position_transformed_x'].fillna(0)
+        df['position_transformed_y'] = df['position_transformed_y'].fillna(0)
+        
+        df['player_id'] = df['track_id']
+        df['speed_kmh'] = df['speed'] * 3.6
+        df['distance_meters'] = df['distance']
+        
+        df = df.rename(columns={
+            'speed': 'speed_mps',
+            'distance': 'distance_m'
+        })
+        
+        # StatisticsCalculator reads track_id, speed_kmh and distance_meters
+        return df[[
+            'frame', 'timestamp', 'player_id', 'track_id', 'team', 'jersey_number',
+            'bbox_x1', 'bbox_y1', 'bbox_x2', 'bbox_y2',
+            'position_x', 'position_y', 'position_transformed_x', 'position_transformed_y',
+            'speed_mps', 'speed_kmh', 'distance_m', 'distance_meters', 'has_ball'
+        ]]
+
+
+def _batch_size_arg(value: str) -> Union[int, str]:
+    """Parse --batch-size: a positive integer or 'auto'"""
+    if value == 'auto':
+        return value
+    try:
+        size = int(value)
+    except ValueError:
+        size = 0
+    if size < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer or 'auto', got '{value}'")
+    return size
 
 
 def main():
@@ -496,6 +1214,15 @@ Examples:
   python analyze_match.py input_videos/match.mp4 --model models/yolo11x.pt
   python analyze_match.py input_videos/match.mp4 --output-dir results/match1/ --no-video
   python analyze_match.py input_videos/match.mp4 --sport football --confidence 0.6
+  python analyze_match.py input_videos/match.mp4 --pipeline --queue-size 3
+  python analyze_match.py input_videos/match.mp4 --parallel-camera
+  python analyze_match.py input_videos/match.mp4 --resume
+  python analyze_match.py input_videos/match.mp4 --detection-stride 1
+  python analyze_match.py input_videos/match.mp4 --roi-inference --parallel-camera
+  python analyze_match.py input_videos/match.mp4 --ball-redetection
+  python analyze_match.py input_videos/match.mp4 --backend openvino --int8
+  python analyze_match.py input_videos/match.mp4 --batch-size auto
+  python analyze_match.py input_videos/match.mp4 --inference-server 127.0.0.1:6010
         """
     )
     
@@ -548,6 +1275,86 @@ Examples:
         help=f"Frames per processing chunk (default: {Settings.CHUNK_SIZE})"
     )
     
+    parser.add_argument(
+        "--inference-server",
+        type=str,
+        default=None,
+        metavar="HOST:PORT",
+        help="Use a running scripts/inference_server.py instead of loading models in this process"
+    )
+    
+    parser.add_argument(
+        "--batch-size",
+        type=_batch_size_arg,
+        default=None,
+        help="Frames per YOLO call, or 'auto' to tune it on this host (default: settings)"
+    )
+    
+    parser.add_argument(
+        "--detection-stride",
+        type=int,
+        default=None,
+        help="Run YOLO every Nth frame and propagate boxes in between (default: per sport, 1 = every frame)"
+    )
+    
+    parser.add_argument(
+        "--roi-inference",
+        action="store_true",
+        help="Run YOLO on a crop of the calibrated field area only"
+    )
+    
+    parser.add_argument(
+        "--ball-redetection",
+        action="store_true",
+        help="Re-detect missed balls with high-resolution inference around their predicted position"
+    )
+    
+    parser.add_argument(
+        "--backend",
+        type=str,
+        default=None,
+        choices=["torch", "onnx", "openvino"],
+        help="Detector runtime; onnx/openvino export the model on first use (default: settings)"
+    )
+    
+    parser.add_argument(
+        "--int8",
+        action="store_true",
+        default=None,
+        help="Use an INT8 quantized onnx/openvino model calibrated on frames from input_videos/"
+    )
+    
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Run decode/inference/post-processing/encoding as concurrent stages"
+    )
+    
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=Settings.PIPELINE_QUEUE_SIZE,
+        help=f"Chunks buffered between pipeline stages (default: {Settings.PIPELINE_QUEUE_SIZE})"
+    )
+    
+    parser.add_argument(
+        "--parallel-camera",
+        action="store_true",
+        help="Estimate camera movement in parallel video segments (one process per core)"
+    )
+    
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Recompute every stage instead of reusing cached artifacts"
+    )
+    
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume an interrupted analysis from its last complete chunk"
+    )
+    
     parser.add_argument(
         "--no-ocr",
         action="store_true",
@@ -589,7 +1396,7 @@ Examples:
         logger.error(f"❌ Video file not found: {args.video}")
         sys.exit(1)
     
-    if not Path(args.model).exists():
+    if not (args.inference_server or Settings.INFERENCE_SERVER) and not Path(args.model).exists():
         logger.error(f"❌ Model file not found: {args.model}")
         logger.error(f"   Download YOLO11x: https://github.com/ultralytics/assets/releases")
         logger.error(f"   Place it in: models/yolo11x.pt")
@@ -602,7 +1409,19 @@ Examples:
         field_config_path=args.field_config,
         confidence_threshold=args.confidence,
         enable_ocr=not args.no_ocr,
-        chunk_size=args.chunk_size
+        chunk_size=args.chunk_size,
+        pipeline=args.pipeline,
+        queue_size=args.queue_size,
+        parallel_camera=args.parallel_camera,
+        use_cache=not args.no_cache,
+        resume=args.resume,
+        detection_stride=args.detection_stride,
+        roi_inference=args.roi_inference,
+        ball_redetection=args.ball_redetection,
+        backend=args.backend,
+        int8=args.int8,
+        batch_size=args.batch_size,
+        inference_server=args.inference_server
     )
     
     # Analyze video
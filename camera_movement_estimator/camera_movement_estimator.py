@@ -25,16 +25,21 @@ class CameraMovementEstimator:
     Uses modular optical flow tracker
     """
     
-    def __init__(self, frame, min_distance=5):
+    def __init__(self, frame, min_distance=5, estimate_homography=False, pyramid_level=0):
         """
         Initialize camera movement estimator
         
         Args:
             frame: Reference frame for feature detection
             min_distance: Minimum movement distance to consider
+            estimate_homography: Also estimate per-frame homographies (pan and zoom)
+            pyramid_level: Track features on a grey image downscaled 2^level times
         """
         # Initialize modular optical flow tracker
-        self.flow_tracker = OpticalFlowTracker(frame, min_distance=min_distance)
+        self.flow_tracker = OpticalFlowTracker(
+            frame, min_distance=min_distance, estimate_homography=estimate_homography,
+            pyramid_level=pyramid_level
+        )
     
     def get_camera_movement(self, frames, read_from_stub=False, stub_path=None):
         """
@@ -50,6 +55,63 @@ class CameraMovementEstimator:
         """
         return self.flow_tracker.calculate_movement(frames, read_from_stub, stub_path)
     
+    def update(self, frames):
+        """
+        Calculate camera movement for the next window of a streamed video
+        
+        Args:
+            frames: List of consecutive video frames
+            
+        Returns:
+            List of camera movement vectors [(dx, dy), ...] for these frames
+        """
+        return self.flow_tracker.update(frames)
+    
+    def get_frame_homographies(self, start=0):
+        """
+        Get the homographies estimated so far
+        
+        Args:
+            start: Index of the first frame to return
+        
+        Returns:
+            Array of shape (N, 3, 3) mapping each frame's pixels to the
+            first (reference) frame's pixels
+        """
+        return np.asarray(self.flow_tracker.frame_homographies[start:], dtype=np.float32).reshape(-1, 3, 3)
+    
+    def get_step_homographies(self, start=0):
+        """
+        Get the frame-step homographies estimated so far
+        
+        Args:
+            start: Index of the first frame to return
+        
+        Returns:
+            Array of shape (N, 3, 3) mapping each frame's previous frame to it
+        """
+        return np.asarray(self.flow_tracker.step_homographies[start:], dtype=np.float32).reshape(-1, 3, 3)
+    
+    def get_state(self):
+        """
+        Carry-over state for resuming a streamed video
+        
+        Returns:
+            Dictionary for load_state (without per-frame history)
+        """
+        return self.flow_tracker.get_state()
+    
+    def load_state(self, state, step_homographies=None, frame_homographies=None):
+        """
+        Restore carry-over state saved by get_state
+        
+        Args:
+            state: Dictionary from get_state
+            step_homographies: Optional (N, 3, 3) step history to restore
+            frame_homographies: Optional (N, 3, 3) frame -> reference history
+        """
+        self.flow_tracker.load_state(state, step_homographies, frame_homographies)
+    
     def adjust_positions_to_tracks(self, tracks, camera_movement_per_frame):
         """
         Adjust object positions based on camera movement
@@ -76,6 +138,25 @@ class CameraMovementEstimator:
                     
                     tracks[object_type][frame_num][track_id]['position_adjusted'] = adjusted_position
     
+    @staticmethod
+    def adjust_positions_to_table(table, camera_movement_per_frame):
+        """
+        Adjust object positions of a TrackTable based on camera movement
+        
+        Args:
+            table: TrackTable (position_adjusted is written in place)
+            camera_movement_per_frame: List of camera movement vectors
+        """
+        movement = np.asarray(camera_movement_per_frame, dtype=np.float32).reshape(-1, 2)
+        frames = table['frame']
+        
+        # Frames without a movement estimate keep their position
+        frame_movement = np.zeros((len(frames), 2), dtype=np.float32)
+        has_movement = frames < len(movement)
+        frame_movement[has_movement] = movement[frames[has_movement]]
+        
+        table['position_adjusted'][:] = table['position'] - frame_movement
+    
     def draw_camera_movement(self, frames, camera_movement):
         """
         Draw camera movement visualization on frames
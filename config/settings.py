@@ -24,29 +24,68 @@ class Settings:
     OUTPUT_VIDEOS_DIR = PROJECT_ROOT / "output_videos"
     LOGS_DIR = PROJECT_ROOT / "logs"
     DATA_DIR = PROJECT_ROOT / "data"
+    CACHE_DIR = DATA_DIR / "cache"  # content-addressed stage artifacts
+    CHECKPOINT_DIR = DATA_DIR / "checkpoints"  # per-chunk resume state
     
     # Model settings - YOLO11x for Football/Soccer (Recommended over YOLOv8)
     # YOLO11x: 54.7 mAP, 22% fewer parameters, optimized for edge devices
     DEFAULT_MODEL_PATH = MODELS_DIR / "yolo11x.pt"
     LEGACY_MODEL_PATH = MODELS_DIR / "best.pt"  # Fallback if yolo11x.pt not found
     CONFIDENCE_THRESHOLD = 0.5  # Detection confidence (0.0-1.0, higher = fewer false positives)
+    DETECTOR_BACKEND = "torch"  # Options: torch, onnx (ONNX Runtime), openvino (exported on first use)
+    DETECTOR_INT8 = False  # INT8 quantized onnx/openvino export
+    INT8_CALIBRATION_FRAMES = 64  # frames sampled from input_videos/ to calibrate INT8
+    
+    # Shared inference server (scripts/inference_server.py)
+    INFERENCE_SERVER = None  # "host:port" of a running server (None = load models in-process)
+    INFERENCE_SERVER_PORT = 6010
+    INFERENCE_SERVER_KEY_FILE = Path.home() / ".sports_analytics" / "inference_server.key"  # per-run key (0600)
+    INFERENCE_MAX_BATCH = 32  # frames / OCR crops of concurrent jobs merged into one batch
+    INFERENCE_MAX_WAIT_MS = 10  # time a request waits for requests of other jobs
     
     # Tracking settings
     TRACKER_TYPE = "ByteTrack"
     MIN_TRACK_LENGTH = 5
+    KEYFRAME_MOTION_THRESHOLD = 25.0  # accumulated frame difference forcing an early YOLO keyframe
     
     # Jersey detection settings
     ENABLE_OCR = True
     OCR_CONFIDENCE_THRESHOLD = 0.5
     OCR_LANGUAGES = ['en']
     OCR_USE_GPU = True
+    OCR_BATCH_SIZE = 64  # jersey ROIs per batched OCR call
+    OCR_SCHEDULING = True  # skip OCR for tracks whose number is locked
+    OCR_RECHECK_INTERVAL = 30  # frames before first re-check of a locked track
+    OCR_MAX_RECHECK_INTERVAL = 900  # frames (re-check interval cap)
+    OCR_RECHECK_GROWTH = 2.0  # interval multiplier after an agreeing re-check
+    OCR_CHUNK_BUDGET = 400  # max OCR calls per chunk
+    OCR_MIN_ROI_AREA = 300  # pixels, smaller jersey ROIs are not OCR'd
     
     # Team assignment settings
     USE_LAB_COLOR_SPACE = True
     TEAM_CLUSTERING_RANDOM_STATE = 42
     
+    # Ball re-detection settings (tiled high-res search around the predicted ball)
+    BALL_REDETECT_WINDOW = 384  # pixels, search window side
+    BALL_REDETECT_TILE = 384  # pixels, tile side (inferred at BALL_REDETECT_IMGSZ)
+    BALL_REDETECT_TILE_OVERLAP = 32  # pixels shared by neighbouring tiles
+    BALL_REDETECT_IMGSZ = 640
+    BALL_REDETECT_MIN_CONFIDENCE = 0.3  # ball detections below this are re-checked
+    BALL_REDETECT_CONFIDENCE = 0.15  # detection threshold inside the window
+    BALL_REDETECT_MAX_GAP = 15  # frames from the nearest confident ball
+    
+    # Ball tracking settings (Kalman filter instead of interpolating every gap)
+    BALL_KALMAN = True
+    BALL_KALMAN_MAX_GAP = 15  # frames, longer gaps are left empty
+    BALL_KALMAN_GATE = 13.8  # squared Mahalanobis distance (chi-square, 2 dof, 99.9%)
+    BALL_KALMAN_PROCESS_NOISE = 1.0  # jerk std, pixels / frame^3
+    BALL_KALMAN_MEASUREMENT_NOISE = 3.0  # pixels
+    BALL_KALMAN_SMOOTH = True  # RTS smoothing of the emitted positions
+    
     # Ball assignment settings
     MAX_BALL_PLAYER_DISTANCE = 70  # pixels
+    POSSESSION_MIN_HOLD_FRAMES = 3  # frames closest to the ball before possession changes
+    POSSESSION_CONTEST_MARGIN = 5  # pixels, opponent this close too = contested (None = off)
     
     # Pass detection settings
     MIN_POSSESSION_FRAMES = 5
@@ -55,6 +94,8 @@ class Settings:
     # Speed and distance settings
     DEFAULT_FPS = 30
     SPEED_WINDOW_SIZE = 5
+    SPEED_SMOOTHING = "savgol"  # "moving_average" or "savgol"
+    SPEED_MAX_GAP_FRAMES = 30  # missing longer than this = no distance across the gap
     FRAME_WINDOW = 5
     
     # Event detection settings
@@ -72,12 +113,29 @@ class Settings:
     
     # Camera movement settings
     CAMERA_MIN_DISTANCE = 5
+    CAMERA_HOMOGRAPHY_MODE = False  # per-frame homography (pan & zoom) instead of translation only
+    CAMERA_WORKERS = None  # processes for parallel camera estimation (None = one per core)
+    CAMERA_SEGMENT_OVERLAP = 5  # warm-up frames read before each parallel segment
+    CAMERA_PYRAMID_LEVEL = 0  # track features on a grey image downscaled 2^level times
     OPTICAL_FLOW_WIN_SIZE = (15, 15)
     OPTICAL_FLOW_MAX_LEVEL = 2
     
     # Processing settings
     CHUNK_SIZE = 300  # frames
-    BATCH_SIZE = 20  # frames for YOLO
+    BATCH_SIZE = 20  # frames for YOLO, or "auto" (probe throughput on this host)
+    BATCH_SIZE_CANDIDATES = (1, 2, 4, 8, 16, 32)  # sizes probed by "auto"
+    BATCH_MEMORY_LIMIT_MB = None  # process RSS ceiling for "auto" (None = from available memory)
+    BATCH_MEMORY_FRACTION = 0.8  # share of available memory the default ceiling allows
+    BATCH_THROUGHPUT_DROP = 0.2  # relative fps drop that re-probes the batch size
+    ROI_MARGIN = 80  # pixels around the field bounds (players on the far line)
+    ROI_FOLLOW_CAMERA = True  # move the crop with the estimated camera movement
+    FIELD_FILTER_FOLLOW_CAMERA = True  # move the off-field player filter with the camera movement
+    PIPELINE_QUEUE_SIZE = 2  # chunks buffered between pipeline stages
+    
+    # Batch processing settings (scripts/batch_process.py)
+    BATCH_WORKERS = None  # concurrent analyses (None = from cores and free memory)
+    BATCH_THREADS_PER_WORKER = None  # torch/OpenCV/BLAS threads per analysis (None = cores / workers)
+    BATCH_JOB_MEMORY_GB = 4.0  # expected peak memory of one analysis
     
     # Heatmap settings
     HEATMAP_RESOLUTION = (1050, 680)
@@ -49,6 +49,9 @@ class SportConfig:
     
     # Metrics
     key_metrics: List[str]           # Primary statistics to track
+    
+    # Processing
+    detection_stride: int = 1        # Run YOLO every Nth frame (boxes propagated in between)
 
 
 # ============================================================================
@@ -125,7 +128,10 @@ FOOTBALL_CONFIG = SportConfig(
         "touches",
         "duels_won",
         "aerial_duels_won"
-    ]
+    ],
+    
+    # Processing (broadcast camera, players move a few pixels per frame)
+    detection_stride=4
 )
 
 
@@ -216,7 +222,8 @@ BASKETBALL_CONFIG = SportConfig(
     score_types=["basket", "free_throw", "three_pointer"],
     yolo_classes={0: "player", 1: "ball", 2: "referee"},
     event_types=["basket", "rebound", "assist", "block", "steal", "foul", "turnover"],
-    key_metrics=["points", "rebounds", "assists", "steals", "blocks", "turnovers", "fg_pct"]
+    key_metrics=["points", "rebounds", "assists", "steals", "blocks", "turnovers", "fg_pct"],
+    detection_stride=2      # Close camera, fast cuts and direction changes
 )
 
 
@@ -236,7 +243,8 @@ RUGBY_CONFIG = SportConfig(
     score_types=["try", "conversion", "penalty", "drop_goal"],
     yolo_classes={0: "player", 1: "ball", 2: "referee"},
     event_types=["try", "tackle", "ruck", "maul", "scrum", "lineout", "conversion"],
-    key_metrics=["tries", "tackles", "meters_gained", "carries", "turnovers"]
+    key_metrics=["tries", "tackles", "meters_gained", "carries", "turnovers"],
+    detection_stride=3
 )
 
 
@@ -494,6 +502,7 @@ def validate_config(config: SportConfig) -> bool:
     assert config.players_per_team > 0, "Players per team must be positive"
     assert config.periods > 0, "Periods must be positive"
     assert config.period_duration_minutes > 0, "Period duration must be positive"
+    assert config.detection_stride >= 1, "Detection stride must be at least 1"
     
     return True
 
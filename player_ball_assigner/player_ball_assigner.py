@@ -2,6 +2,11 @@
 Player Ball Assigner Module
 Determines which player has possession of the ball
 Uses modular distance calculation utilities
+
+assign_possession works on the columns of a whole match at once: one
+distance computation over every player row, a sort to find the nearest
+player (and nearest opponent) per frame, and run-length encoding of the
+per-frame candidates for hysteresis.
 """
 
 import numpy as np
@@ -24,14 +29,22 @@ class PlayerBallAssigner:
     Uses modular position utilities
     """
     
-    def __init__(self, max_distance=70):
+    def __init__(self, max_distance=70, min_hold_frames=1, contest_margin=None):
         """
         Initialize player ball assigner
         
         Args:
             max_distance: Maximum distance (pixels) to assign ball to player
+            min_hold_frames: Frames in a row a player must be closest to
+                             the ball (frames without a candidate not
+                             counted) before possession passes to that player
+            contest_margin: Frames where an opponent is within this many
+                            pixels of the closest player's distance are
+                            contested and assign nobody (None = off)
         """
         self.max_distance = max_distance
+        self.min_hold_frames = max(1, int(min_hold_frames))
+        self.contest_margin = contest_margin
         self.position_calculator = PositionCalculator()
     
     def assign_ball_to_player(self, players, ball_bbox):
@@ -51,26 +64,126 @@ class PlayerBallAssigner:
         # Get ball position (center of bbox)
         ball_position = self.position_calculator.get_bbox_center(ball_bbox)
         
-        min_distance = float('inf')
-        assigned_player = -1
+        player_ids = [
+            player_id for player_id, player_info in players.items()
+            if len(player_info.get('bbox') or []) >= 4
+        ]
+        if not player_ids:
+            return -1
+        
+        # Distance from every player's foot position to the ball
+        bboxes = np.array([players[player_id]['bbox'][:4] for player_id in player_ids], dtype=np.float64)
+        feet = np.column_stack([(bboxes[:, 0] + bboxes[:, 2]) / 2, bboxes[:, 3]])
+        distances = np.hypot(*(feet - ball_position).T)
+        
+        # Only assign if within max_distance threshold
+        closest = int(np.argmin(distances))
+        if distances[closest] <= self.max_distance:
+            return player_ids[closest]
+        
+        return -1
+    
+    def assign_possession(self, player_frames, player_bboxes, player_teams,
+                          player_ids, ball_frames, ball_bboxes, num_frames):
+        """
+        Assign ball possession for every frame of a match at once
         
-        for player_id, player_info in players.items():
-            player_bbox = player_info.get('bbox', [])
+        The closest player within max_distance is the candidate of a frame
+        (none if the frame is contested). A candidate takes possession only
+        after min_hold_frames in a row, so possession does not flicker to
+        players brushing past the ball; the team in possession carries over
+        frames without a holder.
+        
+        Args:
+            player_frames: Frame index of every player row (sorted)
+            player_bboxes: Array (N, 4) of player bboxes
+            player_teams: Team of every player row (0 = unknown)
+            player_ids: Track ID of every player row
+            ball_frames: Frame index of every ball row (sorted, first row
+                         of a frame is used)
+            ball_bboxes: Array (M, 4) of ball bboxes
+            num_frames: Number of frames of the match
             
-            if not player_bbox or len(player_bbox) < 4:
-                continue
+        Returns:
+            Tuple (has_ball mask over the player rows, team in possession
+            per frame, holder row per frame or -1)
+        """
+        player_frames = np.asarray(player_frames, dtype=np.int64)
+        player_bboxes = np.asarray(player_bboxes, dtype=np.float64).reshape(-1, 4)
+        player_teams = np.asarray(player_teams)
+        player_ids = np.asarray(player_ids)
+        ball_bboxes = np.asarray(ball_bboxes, dtype=np.float64).reshape(-1, 4)
+        
+        # Ball centre per frame (NaN without a ball)
+        ball_centers = np.full((num_frames, 2), np.nan)
+        frames, first = np.unique(np.asarray(ball_frames, dtype=np.int64), return_index=True)
+        ball_centers[frames] = np.column_stack([
+            (ball_bboxes[first, 0] + ball_bboxes[first, 2]) / 2,
+            (ball_bboxes[first, 1] + ball_bboxes[first, 3]) / 2
+        ])
+        
+        # Foot-to-ball distance of every player row in one go
+        feet = np.column_stack([(player_bboxes[:, 0] + player_bboxes[:, 2]) / 2, player_bboxes[:, 3]])
+        distances = np.hypot(*(feet - ball_centers[player_frames]).T)
+        distances[np.isnan(distances)] = np.inf
+        
+        if len(player_frames) == 0:
+            candidate_frames = candidate_rows = np.zeros(0, dtype=np.int64)
+        else:
+            # Rows are grouped by frame: per-frame minima are segment reductions
+            group_starts = np.flatnonzero(np.r_[True, player_frames[1:] != player_frames[:-1]])
+            groups = np.repeat(np.arange(len(group_starts)), np.diff(np.r_[group_starts, len(player_frames)]))
             
-            # Get distance from player's foot position to ball
-            player_foot = self.position_calculator.get_foot_position(player_bbox)
+            # Closest player per frame (the first one on ties)
+            in_range = np.where(distances <= self.max_distance, distances, np.inf)
+            nearest = np.minimum.reduceat(in_range, group_starts)
+            rows = np.flatnonzero(np.isfinite(in_range) & (in_range == nearest[groups]))
+            rows = rows[np.r_[True, groups[rows[1:]] != groups[rows[:-1]]]] if len(rows) else rows
+            candidate_groups, candidate_rows = groups[rows], rows
             
-            distance = self.position_calculator.calculate_distance(player_foot, ball_position)
+            if self.contest_margin is not None and len(candidate_rows):
+                # Closest opponent per frame among all players (not only those in range)
+                nearest_team = np.zeros(len(group_starts), dtype=player_teams.dtype)
+                nearest_team[candidate_groups] = player_teams[candidate_rows]
+                is_opponent = (player_teams != nearest_team[groups]) & (player_teams != 0)
+                opponent_distance = np.minimum.reduceat(np.where(is_opponent, distances, np.inf), group_starts)
+                
+                contested = opponent_distance[candidate_groups] - distances[candidate_rows] <= self.contest_margin
+                contested &= player_teams[candidate_rows] != 0
+                candidate_rows = candidate_rows[~contested]
             
-            if distance < min_distance:
-                min_distance = distance
-                assigned_player = player_id
+            candidate_frames = player_frames[candidate_rows]
         
-        # Only assign if within max_distance threshold
-        if min_distance <= self.max_distance:
-            return assigned_player
+        # Hysteresis: run-length encode the candidates (frames without one
+        # do not break a run). Runs of min_hold_frames or more hand the ball
+        # to their player; a shorter run only counts for the current holder.
+        candidate_ids = player_ids[candidate_rows]
+        run_starts = np.flatnonzero(np.r_[True, candidate_ids[1:] != candidate_ids[:-1]])
+        run_lengths = np.diff(np.r_[run_starts, len(candidate_ids)])
+        run_ids = candidate_ids[run_starts]
         
-        return -1
+        last_accepted = np.maximum.accumulate(
+            np.where(run_lengths >= self.min_hold_frames, np.arange(len(run_starts)), -1)
+        ) if len(run_starts) else run_starts
+        run_held = (last_accepted >= 0) & (run_ids == run_ids[last_accepted])
+        
+        held = np.repeat(run_held, run_lengths)
+        holder_frames, holder_rows = candidate_frames[held], candidate_rows[held]
+        
+        holder = np.full(num_frames, -1, dtype=np.int64)
+        holder[holder_frames] = holder_rows
+        
+        has_ball = np.zeros(len(player_frames), dtype=bool)
+        has_ball[holder_rows] = True
+        
+        # Team of the holder, carried forward over frames without one
+        # (team 1 before the first holder and for unknown teams)
+        holder_teams = np.where(player_teams[holder_rows] != 0, player_teams[holder_rows], 1)
+        team_ball_control = np.ones(num_frames, dtype=np.int8)
+        last_holder_frame = np.maximum.accumulate(np.where(holder >= 0, np.arange(num_frames), -1))
+        has_holder = last_holder_frame >= 0
+        team_at = np.zeros(num_frames, dtype=np.int8)
+        team_at[holder_frames] = holder_teams
+        team_ball_control[has_holder] = team_at[last_holder_frame[has_holder]]
+        
+        return has_ball, team_ball_control, holder
@@ -1,61 +1,286 @@
 """
 Batch Processing Script
 Process multiple videos in batch
+
+Videos are analysed concurrently in a process pool sized to the cores and
+free memory of the host. Every worker caps its torch, OpenCV and BLAS
+threads, so the jobs do not oversubscribe the CPU. A job ledger in the
+output directory records each video's status: an interrupted batch run
+again with the same arguments skips finished videos and resumes the
+interrupted ones from their chunk checkpoints.
 """
 
 import os
 import sys
+import csv
+import time
+import queue
+import logging
 import argparse
+import traceback
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing as mp
 from pathlib import Path
-from tqdm import tqdm
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from utils.logger import get_logger
+from utils.job_ledger import JobLedger, PENDING
 from config.settings import Settings
 
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
 logger = get_logger(__name__)
 
+# Environment variables capping native thread pools (read when the
+# libraries load, so they are set before the workers start)
+THREAD_ENV_VARS = (
+    'OMP_NUM_THREADS',
+    'MKL_NUM_THREADS',
+    'OPENBLAS_NUM_THREADS',
+    'NUMEXPR_NUM_THREADS',
+    'VECLIB_MAXIMUM_THREADS'
+)
+
+# Queue on which a worker reports the video it starts (set per worker)
+_started_queue = None
+
+
+def plan_workers(num_jobs, workers=None, threads_per_worker=None, job_memory_gb=4.0):
+    """
+    Choose the number of worker processes and threads per worker
+
+    Args:
+        num_jobs: Number of videos to process
+        workers: Fixed number of workers (default: from cores and memory)
+        threads_per_worker: Fixed threads per worker (default: cores / workers)
+        job_memory_gb: Expected peak memory of one analysis
+
+    Returns:
+        Tuple (workers, threads_per_worker)
+    """
+    cores = os.cpu_count() or 1
+
+    if workers is None:
+        by_cores = cores // (threads_per_worker or 2)
+        by_memory = by_cores
+        if PSUTIL_AVAILABLE:
+            by_memory = int(psutil.virtual_memory().available / (job_memory_gb * 1024 ** 3))
+        workers = min(by_cores, by_memory)
+
+    workers = max(1, min(workers, num_jobs))
+
+    if threads_per_worker is None:
+        threads_per_worker = max(1, cores // workers)
+
+    return workers, threads_per_worker
+
+
+def _init_worker(threads, log_level, started_queue=None):
+    """
+    Set up a worker process: thread caps and logging
+
+    Args:
+        threads: Threads per worker for torch and OpenCV
+        log_level: Logging level name of the worker
+        started_queue: Queue on which jobs report that they started
+    """
+    global _started_queue
+    _started_queue = started_queue
+
+    import cv2
+    cv2.setNumThreads(threads)
+
+    try:
+        import torch
+        torch.set_num_threads(threads)
+        torch.set_num_interop_threads(1)
+    except (ImportError, RuntimeError):
+        pass
+
+    from utils.logger import SportsAnalyticsLogger
+    SportsAnalyticsLogger.setup_logger(
+        log_dir=str(Settings.LOGS_DIR),
+        log_level=getattr(logging, log_level),
+        log_to_file=Settings.LOG_TO_FILE
+    )
+
+
+def _run_job(video_path, output_dir, analyzer_kwargs, export_video):
+    """
+    Analyse one video (runs in a worker process)
+
+    The analyzer resumes from the video's chunk checkpoint if an earlier
+    run was interrupted; models are loaded once per worker and reused.
+
+    Returns:
+        Dictionary with runtime and frames, or the error and traceback
+    """
+    start = time.time()
+    if _started_queue is not None:
+        _started_queue.put(video_path)
+
+    try:
+        from analyze_match import MatchAnalyzer
+
+        analyzer = MatchAnalyzer(resume=True, **analyzer_kwargs)
+        results = analyzer.analyze_video(
+            video_path=video_path,
+            output_dir=str(Path(output_dir) / Path(video_path).stem),
+            export_video=export_video
+        )
+        return {
+            'runtime': time.time() - start,
+            'frames': int(results['frames_processed'])
+        }
+    except Exception as e:
+        return {
+            'runtime': time.time() - start,
+            'error': f"{type(e).__name__}: {e}",
+            'traceback': traceback.format_exc()
+        }
+
+
+def _mark_started(ledger, started_queue):
+    """
+    Mark the jobs the workers reported as started as running
+
+    Reports arriving after the job already finished are ignored.
+
+    Args:
+        ledger: JobLedger of the batch
+        started_queue: Queue of started video paths
+    """
+    while True:
+        try:
+            video_path = started_queue.get_nowait()
+        except queue.Empty:
+            return
+        if ledger.jobs[video_path]['status'] == PENDING:
+            ledger.mark_running(video_path)
+
+
+def write_summary(ledger, summary_path):
+    """
+    Write and log the per-video summary table
+
+    Args:
+        ledger: JobLedger of the batch
+        summary_path: CSV file to write
+    """
+    rows = ledger.summary_rows()
+    columns = ['video', 'status', 'runtime_s', 'frames', 'fps', 'attempts', 'error']
+
+    with open(summary_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
 
-def batch_process_videos(input_dir, output_dir=None, pattern="*.mp4"):
+    logger.info(f"{'Video':<40}{'Status':<10}{'Runtime':>10}{'Frames':>9}{'FPS':>8}")
+    for row in rows:
+        runtime = f"{row['runtime_s']:.0f}s" if row['runtime_s'] is not None else '-'
+        frames = row['frames'] if row['frames'] is not None else '-'
+        fps = f"{row['fps']:.1f}" if row['fps'] is not None else '-'
+        logger.info(f"{row['video'][:39]:<40}{row['status']:<10}{runtime:>10}{frames:>9}{fps:>8}")
+        if row['status'] == 'failed':
+            logger.info(f"    {row['error']}")
+    logger.info(f"Summary written to {summary_path}")
+
+
+def batch_process_videos(input_dir, output_dir=None, pattern="*.mp4", workers=None,
+                         threads_per_worker=None, retry_failed=False, export_video=True,
+                         worker_log_level="WARNING", analyzer_kwargs=None):
     """
     Process multiple videos in batch
-    
+
     Args:
         input_dir: Directory containing input videos
         output_dir: Output directory (default: output_videos/)
         pattern: File pattern to match (default: *.mp4)
+        workers: Concurrent analyses (default: from cores and free memory)
+        threads_per_worker: Thread cap of each analysis (default: cores / workers)
+        retry_failed: Run videos that failed in an earlier batch again
+        export_video: Whether to export annotated videos
+        worker_log_level: Logging level inside the workers
+        analyzer_kwargs: Extra MatchAnalyzer arguments
     """
-    from glob import glob
-    
     if output_dir is None:
         output_dir = Settings.OUTPUT_VIDEOS_DIR
-    
+    output_dir = Path(output_dir)
+
     input_path = Path(input_dir)
-    video_files = list(input_path.glob(pattern))
-    
+    video_files = sorted(input_path.glob(pattern))
+
     if not video_files:
         logger.warning(f"No videos found matching pattern '{pattern}' in {input_dir}")
         return
-    
-    logger.info(f"Found {len(video_files)} videos to process")
-    
-    for video_file in tqdm(video_files, desc="Processing videos"):
-        logger.info(f"Processing: {video_file.name}")
-        
-        try:
-            # Import here to avoid circular imports
-            # This would call your main analysis function
-            # from analyze_match import analyze_video
-            
-            # analyze_video(str(video_file), output_dir)
-            logger.info(f"✓ Completed: {video_file.name}")
-        
-        except Exception as e:
-            logger.error(f"✗ Failed to process {video_file.name}: {e}")
-            continue
-    
+
+    ledger = JobLedger(output_dir / "batch_ledger.json")
+    to_run = ledger.schedule([str(path) for path in video_files], retry_failed=retry_failed)
+
+    logger.info(f"Found {len(video_files)} videos, {len(to_run)} to process "
+                f"({len(video_files) - len(to_run)} already done or failed)")
+
+    if to_run:
+        workers, threads = plan_workers(
+            len(to_run), workers, threads_per_worker, Settings.BATCH_JOB_MEMORY_GB
+        )
+        logger.info(f"Running {workers} workers with {threads} threads each")
+
+        # Spawned workers inherit the caps before importing numpy / torch
+        for name in THREAD_ENV_VARS:
+            os.environ[name] = str(threads)
+
+        # Jobs are marked running when a worker picks them up, so queued
+        # jobs stay pending (and keep their attempts) if the batch stops
+        context = mp.get_context('spawn')
+        started_queue = context.Queue()
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(threads, worker_log_level, started_queue)
+        ) as executor:
+            futures = {}
+            for video_path in to_run:
+                future = executor.submit(_run_job, video_path, str(output_dir),
+                                         dict(analyzer_kwargs or {}), export_video)
+                futures[future] = video_path
+
+            done = 0
+            pending = set(futures)
+            while pending:
+                finished, pending = wait(pending, timeout=1.0, return_when=FIRST_COMPLETED)
+                _mark_started(ledger, started_queue)
+
+                for future in finished:
+                    done += 1
+                    video_path = futures[future]
+                    name = Path(video_path).name
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool as e:
+                        ledger.mark_failed(video_path, f"worker process died: {e}")
+                        logger.error(f"✗ [{done}/{len(to_run)}] {name}: worker process died")
+                        continue
+
+                    if 'error' in result:
+                        ledger.mark_failed(video_path, result['error'], result['runtime'])
+                        logger.error(f"✗ [{done}/{len(to_run)}] {name}: {result['error']}")
+                        logger.debug(result['traceback'])
+                    else:
+                        ledger.mark_done(video_path, result['runtime'], result['frames'])
+                        logger.info(f"✓ [{done}/{len(to_run)}] {name}: {result['frames']} frames "
+                                    f"in {result['runtime']:.0f}s ({result['frames'] / result['runtime']:.1f} fps)")
+
+    write_summary(ledger, output_dir / "batch_summary.csv")
     logger.info("Batch processing complete")
 
 
@@ -80,9 +305,56 @@ def main():
         default="*.mp4",
         help="File pattern to match (default: *.mp4)"
     )
-    
+    parser.add_argument(
+        "--model",
+        type=str,
+        default=str(Settings.DEFAULT_MODEL_PATH),
+        help="Path to YOLO model (default: models/yolo11x.pt)"
+    )
+    parser.add_argument(
+        "--field-config",
+        type=str,
+        default=str(Settings.FIELD_CONFIG_PATH),
+        help=f"Field calibration config (default: {Settings.FIELD_CONFIG_PATH})"
+    )
+    parser.add_argument(
+        "--sport",
+        type=str,
+        default=Settings.DEFAULT_SPORT,
+        help="Sport type (default: football)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=Settings.BATCH_WORKERS,
+        help="Concurrent analyses (default: from cores and free memory)"
+    )
+    parser.add_argument(
+        "--threads-per-worker",
+        type=int,
+        default=Settings.BATCH_THREADS_PER_WORKER,
+        help="Thread cap per analysis (default: cores / workers)"
+    )
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="Run videos that failed in an earlier batch again"
+    )
+    parser.add_argument(
+        "--inference-server",
+        type=str,
+        default=None,
+        metavar="HOST:PORT",
+        help="Share a running scripts/inference_server.py between the workers"
+    )
+    parser.add_argument(
+        "--no-video",
+        action="store_true",
+        help="Skip annotated video export"
+    )
+
     args = parser.parse_args()
-    
+
     # Setup logger
     from utils.logger import SportsAnalyticsLogger
     SportsAnalyticsLogger.setup_logger(
@@ -90,10 +362,27 @@ def main():
         log_level=getattr(logging, Settings.LOG_LEVEL),
         log_to_file=Settings.LOG_TO_FILE
     )
+
+    if not (args.inference_server or Settings.INFERENCE_SERVER) and not Path(args.model).exists():
+        logger.error(f"❌ Model file not found: {args.model}")
+        sys.exit(1)
     
-    batch_process_videos(args.input_dir, args.output_dir, args.pattern)
+    batch_process_videos(
+        args.input_dir,
+        args.output_dir,
+        args.pattern,
+        workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+        retry_failed=args.retry_failed,
+        export_video=not args.no_video,
+        analyzer_kwargs={
+            'model_path': args.model,
+            'field_config_path': args.field_config,
+            'sport': args.sport,
+            'inference_server': args.inference_server
+        }
+    )
 
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Detector Backend Benchmark Script
+Location: /scripts/benchmark_backends.py
+Purpose: Compare detector backends against the PyTorch baseline on CPU
+
+Runs the detector through each backend on frames sampled from a video and
+reports frames/sec and detection agreement (precision/recall of same-class
+matches at IoU >= 0.5 against PyTorch FP32).
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import cv2
+import numpy as np
+import supervision as sv
+
+# Add parent directory to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from config.settings import Settings
+from utils.detector_backend import BACKENDS, backend_available, load_detector, detection_agreement
+
+
+def sample_frames(video_path, num_frames):
+    """
+    Read frames evenly spaced over a video
+
+    Args:
+        video_path: Path to the video
+        num_frames: Number of frames
+
+    Returns:
+        List of frames
+    """
+    cap = cv2.VideoCapture(str(video_path))
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    frames = []
+    for frame_idx in np.unique(np.linspace(0, max(total - 1, 0), num_frames).astype(int)):
+        cap.set(cv2.CAP_PROP_POS_FRAMES, int(frame_idx))
+        ret, frame = cap.read()
+        if ret:
+            frames.append(frame)
+    cap.release()
+    return frames
+
+
+def run_backend(model, frames, confidence, batch_size, warmup=2):
+    """
+    Detect on frames and time it
+
+    Args:
+        model: Loaded YOLO model
+        frames: List of frames
+        confidence: Detection confidence threshold
+        batch_size: Frames per predict call
+        warmup: Batches run before timing
+
+    Returns:
+        Tuple (list of sv.Detections, frames/sec)
+    """
+    for _ in range(warmup):
+        model.predict(frames[:batch_size], conf=confidence, verbose=False)
+
+    detections = []
+    start = time.perf_counter()
+    for i in range(0, len(frames), batch_size):
+        results = model.predict(frames[i:i + batch_size], conf=confidence, verbose=False)
+        detections.extend(sv.Detections.from_ultralytics(result) for result in results)
+    elapsed = time.perf_counter() - start
+
+    return detections, len(frames) / elapsed if elapsed > 0 else 0.0
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(
+        description="Compare detector backends (frames/sec and agreement with PyTorch)"
+    )
+    parser.add_argument("video", type=str, help="Video to sample frames from")
+    parser.add_argument("--model", type=str, default=str(Settings.DEFAULT_MODEL_PATH),
+                        help="PyTorch weights (default: %(default)s)")
+    parser.add_argument("--backends", nargs="+", default=["onnx", "openvino"],
+                        choices=[backend for backend in BACKENDS if backend != "torch"],
+                        help="Backends to compare with PyTorch")
+    parser.add_argument("--int8", action="store_true", help="Also benchmark the INT8 exports")
+    parser.add_argument("--frames", type=int, default=100, help="Frames to sample")
+    parser.add_argument("--batch-size", type=int, help="Frames per predict call",
+                        default=Settings.BATCH_SIZE if Settings.BATCH_SIZE != "auto" else 20)
+    parser.add_argument("--confidence", type=float, default=Settings.CONFIDENCE_THRESHOLD)
+    args = parser.parse_args()
+
+    frames = sample_frames(args.video, args.frames)
+    if not frames:
+        print(f"❌ Could not read frames from {args.video}")
+        sys.exit(1)
+    print(f"Sampled {len(frames)} frames from {args.video}\n")
+
+    runs = [("torch", False)]
+    for backend in args.backends:
+        if not backend_available(backend):
+            print(f"⚠️  Skipping {backend}: runtime not installed")
+            continue
+        runs.append((backend, False))
+        if args.int8:
+            runs.append((backend, True))
+
+    baseline = None
+    rows = []
+    for backend, int8 in runs:
+        model = load_detector(
+            args.model, backend=backend, int8=int8,
+            calibration_videos=Settings.INPUT_VIDEOS_DIR,
+            calibration_frames=Settings.INT8_CALIBRATION_FRAMES
+        )
+        detections, fps = run_backend(model, frames, args.confidence, args.batch_size)
+        if baseline is None:
+            baseline = detections
+        agreement = detection_agreement(baseline, detections)
+        rows.append((f"{backend}{' int8' if int8 else ''}", fps, agreement))
+
+    base_fps = rows[0][1]
+    print(f"{'Backend':<16}{'FPS':>8}{'Speed-up':>10}{'Precision':>11}{'Recall':>8}{'Mean IoU':>10}")
+    print("-" * 63)
+    for name, fps, agreement in rows:
+        speedup = fps / base_fps if base_fps else 0.0
+        print(f"{name:<16}{fps:>8.1f}{speedup:>9.2f}x{agreement['precision']:>11.3f}"
+              f"{agreement['recall']:>8.3f}{agreement['mean_iou']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Inference Server Script
+Location: /scripts/inference_server.py
+Purpose: Run one warm YOLO + EasyOCR instance shared by several analyses
+
+Start the server once, then point analyses at it:
+
+    python scripts/inference_server.py --backend openvino
+    python analyze_match.py input_videos/match1.mp4 --inference-server 127.0.0.1:6010
+    python analyze_match.py input_videos/match2.mp4 --inference-server 127.0.0.1:6010
+
+Frames and OCR crops of concurrent analyses are batched together.
+
+By default the server generates a key per run and writes it to
+Settings.INFERENCE_SERVER_KEY_FILE (readable by the owner only), where
+local analyses pick it up. Listening on a non-loopback address requires an
+explicit key, from --authkey-file or the SPORTS_ANALYTICS_INFERENCE_KEY
+environment variable, which the clients must then use as well.
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Add parent directory to path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from config.settings import Settings
+from utils.artifact_cache import ArtifactCache
+from utils.model_registry import ModelRegistry
+from utils.inference_server import InferenceServer, parse_address, server_authkey
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Shared YOLO / EasyOCR inference server")
+    parser.add_argument("--model", type=str, default=str(Settings.DEFAULT_MODEL_PATH),
+                        help="PyTorch weights (default: %(default)s)")
+    parser.add_argument("--backend", type=str, default=Settings.DETECTOR_BACKEND,
+                        choices=["torch", "onnx", "openvino"], help="Detector runtime")
+    parser.add_argument("--int8", action="store_true", default=Settings.DETECTOR_INT8,
+                        help="Use an INT8 quantized onnx/openvino model")
+    parser.add_argument("--address", type=str, default=f"127.0.0.1:{Settings.INFERENCE_SERVER_PORT}",
+                        help="host:port to listen on (default: %(default)s)")
+    parser.add_argument("--authkey-file", type=str, default=None,
+                        help="File with the key clients must present, mode 0600 "
+                             "(default: new key per run, local clients only)")
+    parser.add_argument("--max-batch", type=int, default=Settings.INFERENCE_MAX_BATCH,
+                        help="Frames / OCR crops merged into one batch at most")
+    parser.add_argument("--max-wait-ms", type=float, default=Settings.INFERENCE_MAX_WAIT_MS,
+                        help="Time a request waits for requests of other jobs")
+    parser.add_argument("--no-ocr", action="store_true", help="Do not serve EasyOCR")
+    args = parser.parse_args()
+
+    if not Path(args.model).exists():
+        print(f"❌ Model not found: {args.model}")
+        sys.exit(1)
+
+    host, port = parse_address(args.address, Settings.INFERENCE_SERVER_PORT)
+    try:
+        authkey = server_authkey(host, args.authkey_file, Settings.INFERENCE_SERVER_KEY_FILE)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    registry = ModelRegistry()
+    detector = registry.get_detector(
+        args.model, backend=args.backend, int8=args.int8,
+        calibration_videos=Settings.INPUT_VIDEOS_DIR,
+        calibration_frames=Settings.INT8_CALIBRATION_FRAMES
+    )
+    ocr_reader = None if args.no_ocr else registry.get_ocr_reader(['en'], gpu=True)
+
+    server = InferenceServer(
+        detector,
+        ocr_reader=ocr_reader,
+        host=host,
+        port=port,
+        authkey=authkey,
+        max_batch=args.max_batch,
+        max_wait_ms=args.max_wait_ms,
+        model_info={
+            'weights': ArtifactCache(Settings.CACHE_DIR).fingerprint_file(args.model, full=True),
+            'backend': args.backend,
+            'int8': args.int8 and args.backend != 'torch'
+        }
+    )
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+        print("\n✓ Inference server stopped")
+
+
+if __name__ == "__main__":
+    main()
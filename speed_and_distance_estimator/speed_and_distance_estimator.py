@@ -25,92 +25,104 @@ class SpeedAndDistanceEstimator:
     Uses modular speed calculator
     """
     
-    def __init__(self, fps=30, window_size=5):
+    def __init__(self, fps=30, window_size=5, smoothing='moving_average', max_gap=None):
         """
         Initialize speed and distance estimator
         
         Args:
             fps: Video frames per second
             window_size: Number of frames for speed smoothing
+            smoothing: 'moving_average' or 'savgol'
+            max_gap: Frames a track may be missing before distance stops
+                     accumulating across the gap (None = never)
         """
         self.fps = fps
         self.frame_window = window_size
+        self.smoothing = smoothing
+        self.max_gap = max_gap
         
         # Initialize modular speed calculator
-        self.speed_calculator = SpeedCalculator(fps=fps, window_size=window_size)
+        self.speed_calculator = SpeedCalculator(
+            fps=fps, window_size=window_size, smoothing=smoothing, max_gap=max_gap
+        )
     
-    def add_speed_and_distance_to_tracks(self, tracks):
+    def add_speed_and_distance_to_tracks(self, tracks, fps=None):
         """
         Calculate and add speed and distance to tracks
         
         Args:
             tracks: Tracking dictionary
+            fps: Video frames per second (default: estimator fps)
         """
-        total_distance = {}
+        object_tracks = tracks.get('players', [])
         
-        for object_type, object_tracks in tracks.items():
-            if object_type == "ball" or object_type == "referees":
-                continue
-            
-            if len(object_tracks) < 2:
-                continue
-            
-            # Calculate for each track ID
-            track_ids = set()
-            for frame_track in object_tracks:
-                track_ids.update(frame_track.keys())
-            
-            for track_id in track_ids:
-                total_distance[track_id] = 0.0
-                prev_position = None
-                speeds = []
-                frame_indices = []
+        # Flatten the detections with a position into columns
+        entries, track_ids, frames, positions = [], [], [], []
+        for frame_num, frame_tracks in enumerate(object_tracks):
+            for track_id, track_info in frame_tracks.items():
+                # Transformed position (in meters), pixel position as fallback
+                position = track_info.get('position_transformed')
+                if position is None:
+                    position = track_info.get('position')
                 
-                for frame_num, track in enumerate(object_tracks):
-                    if track_id not in track:
-                        continue
-                    
-                    track_info = track[track_id]
-                    
-                    # Get transformed position (in meters)
-                    position = track_info.get('position_transformed', None)
-                    
-                    if position is None:
-                        position = track_info.get('position', None)
-                    
-                    if position is None:
-                        track[track_id]['speed'] = 0.0
-                        track[track_id]['distance_covered'] = total_distance[track_id]
-                        continue
-                    
-                    if prev_position is not None:
-                        # Calculate distance moved
-                        distance = self.speed_calculator.calculate_distance(prev_position, position)
-                        total_distance[track_id] += distance
-                        
-                        # Calculate speed
-                        speed = self.speed_calculator.calculate_speed(prev_position, position)
-                        speeds.append(speed)
-                        frame_indices.append(frame_num)
-                    
-                    # Add to track info
-                    track[track_id]['speed'] = speeds[-1] if speeds else 0.0
-                    track[track_id]['distance_covered'] = total_distance[track_id]
-                    track[track_id]['speed_kmh'] = self.speed_calculator.mps_to_kmh(
-                        track[track_id]['speed']
-                    )
-                    track[track_id]['distance_meters'] = total_distance[track_id]
-                    
-                    prev_position = position
+                if position is None:
+                    track_info['speed'] = 0.0
+                    track_info['speed_kmh'] = 0.0
+                    track_info['acceleration'] = 0.0
+                    continue
                 
-                # Smooth speeds
-                if speeds:
-                    smoothed_speeds = self.speed_calculator.smooth_speeds(speeds)
-                    for i, frame_num in enumerate(frame_indices):
-                        if frame_num < len(object_tracks):
-                            object_tracks[frame_num][track_id]['speed'] = smoothed_speeds[i]
-                            object_tracks[frame_num][track_id]['speed_kmh'] = \
-                                self.speed_calculator.mps_to_kmh(smoothed_speeds[i])
+                entries.append(track_info)
+                track_ids.append(track_id)
+                frames.append(frame_num)
+                positions.append(position[:2])
+        
+        speed, distance, acceleration = self.speed_calculator.track_kinematics(
+            track_ids, frames, positions, fps=fps
+        )
+        
+        for track_info, row_speed, row_distance, row_acceleration in zip(
+            entries, speed.tolist(), distance.tolist(), acceleration.tolist()
+        ):
+            track_info['speed'] = row_speed
+            track_info['speed_kmh'] = self.speed_calculator.mps_to_kmh(row_speed)
+            track_info['acceleration'] = row_acceleration
+            track_info['distance_covered'] = row_distance
+            track_info['distance_meters'] = row_distance
+        
+        # Detections without a position keep the distance covered so far
+        covered = {}
+        for frame_tracks in object_tracks:
+            for track_id, track_info in frame_tracks.items():
+                if 'distance_covered' in track_info:
+                    covered[track_id] = track_info['distance_covered']
+                else:
+                    track_info['distance_covered'] = track_info['distance_meters'] = covered.get(track_id, 0.0)
+    
+    def add_speed_and_distance_to_table(self, table, fps=None):
+        """
+        Calculate speed, distance and acceleration for the players of a
+        TrackTable
+        
+        Uses the same rules as add_speed_and_distance_to_tracks: field
+        position with a pixel fallback, steps between consecutive
+        detections of a track, smoothed speeds and cumulative distance.
+        
+        Args:
+            table: TrackTable (columns are written in place)
+            fps: Video frames per second (default: estimator fps)
+        """
+        rows = np.flatnonzero(table.object_mask('players'))
+        
+        positions = table['position_transformed'][rows]
+        missing = np.isnan(positions[:, 0])
+        positions = np.where(missing[:, None], table['position'][rows], positions)
+        
+        speed, distance, acceleration = self.speed_calculator.track_kinematics(
+            table['track_id'][rows], table['frame'][rows], positions, fps=fps
+        )
+        table['speed'][rows] = speed
+        table['distance'][rows] = distance
+        table['acceleration'][rows] = acceleration
     
     def draw_speed_and_distance(self, frames, tracks):
         """
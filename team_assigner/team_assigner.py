@@ -25,16 +25,22 @@ class TeamAssigner:
     Uses modular components for maintainability
     """
     
-    def __init__(self, use_lab=True):
+    def __init__(self, use_lab=True, max_votes=25):
         """
         Initialize team assigner
         
         Args:
             use_lab: Use LAB color space instead of RGB for better clustering
+            max_votes: Colour votes after which a track's team is frozen and
+                       its jersey colour is no longer extracted
         """
         self.use_lab = use_lab
+        self.max_votes = max_votes
         self.player_team_dict = {}
         
+        # Running per-track votes: {track_id: array([unused, team1, team2])}
+        self.team_votes = {}
+        
         # Initialize modular components
         self.color_extractor = ColorExtractor(use_lab=use_lab)
         self.color_clusterer = TeamColorClusterer(use_lab=use_lab)
@@ -47,16 +53,25 @@ class TeamAssigner:
             frame: Video frame
             player_detections: Dictionary of player detections for first frame
         """
-        player_colors = []
+        bboxes = [player_info['bbox'] for player_info in player_detections.values()]
         
-        for track_id, player_info in player_detections.items():
-            bbox = player_info['bbox']
-            
-            # Extract player jersey color using modular extractor
-            player_color = self.color_extractor.extract_jersey_color(frame, bbox)
-            
-            if player_color is not None:
-                player_colors.append(player_color)
+        # Extract all jersey colors of the frame in one pass
+        self.fit_team_colors(self.color_extractor.extract_jersey_colors(frame, bboxes))
+    
+    @property
+    def is_fitted(self):
+        """Whether team colours have been fitted"""
+        return self.color_clusterer.kmeans is not None
+    
+    def fit_team_colors(self, player_colors):
+        """
+        Fit team colours from precomputed jersey colours
+        
+        Args:
+            player_colors: Array of shape (N, 3); NaN rows are ignored
+        """
+        player_colors = np.asarray(player_colors, dtype=np.float64).reshape(-1, 3)
+        player_colors = list(player_colors[~np.isnan(player_colors).any(axis=1)])
         
         # Fit teams using modular clusterer
         success = self.color_clusterer.fit_teams(player_colors)
@@ -100,6 +115,62 @@ class TeamAssigner:
         
         return team
     
+    def extract_player_colors(self, frame, bboxes, player_ids):
+        """
+        Extract jersey colours for the players of a frame that still vote
+        
+        Tracks that already have max_votes votes are frozen and skipped.
+        
+        Args:
+            frame: Video frame
+            bboxes: Sequence of player bounding boxes
+            player_ids: Player track IDs (same order as bboxes)
+            
+        Returns:
+            Array of shape (N, 3); rows are NaN for frozen tracks and
+            regions without a usable colour
+        """
+        colors = np.full((len(player_ids), 3), np.nan)
+        
+        pending = [
+            idx for idx, player_id in enumerate(player_ids)
+            if player_id not in self.team_votes or self.team_votes[player_id].sum() < self.max_votes
+        ]
+        
+        if pending:
+            colors[pending] = self.color_extractor.extract_jersey_colors(
+                frame, [bboxes[idx] for idx in pending]
+            )
+        
+        return colors
+    
+    def update_votes(self, player_ids, colors):
+        """
+        Classify jersey colours and add them to the per-track running votes
+        
+        All colours are classified with one distance computation; a track's
+        team is its vote winner, so a single bad frame cannot flip it.
+        
+        Args:
+            player_ids: Player track IDs
+            colors: Array of shape (N, 3) from extract_player_colors
+            
+        Returns:
+            List of team numbers (1 or 2), one per player
+        """
+        teams = self.color_clusterer.predict_teams(colors)
+        
+        for player_id, color, team in zip(player_ids, colors, teams):
+            if team == 0:
+                continue
+            
+            votes = self.team_votes.setdefault(player_id, np.zeros(3, dtype=np.int64))
+            votes[team] += 1
+            self.player_team_dict[player_id] = int(votes.argmax())
+        
+        # Default to team 1 until a track has a vote
+        return [self.player_team_dict.get(player_id, 1) for player_id in player_ids]
+    
     def get_team_colors(self):
         """Get assigned team colors"""
         return self.color_clusterer.team_colors.copy()
@@ -0,0 +1,45 @@
+"""
+Tests for the stage artifact cache
+"""
+
+import numpy as np
+from utils.artifact_cache import ArtifactCache
+
+
+class TestArtifactCache:
+    """Test artifact storage and keys"""
+    
+    def test_round_trip(self, tmp_path):
+        """Arrays and metadata come back unchanged"""
+        cache = ArtifactCache(tmp_path)
+        arrays = {'movement': np.arange(6, dtype=np.float32).reshape(3, 2)}
+        
+        cache.save('camera', 'abc', arrays, {'num_frames': 3})
+        loaded, meta = cache.load('camera', 'abc')
+        
+        assert np.array_equal(loaded['movement'], arrays['movement'])
+        assert meta == {'num_frames': 3}
+        assert cache.load('camera', 'other') is None
+    
+    def test_disabled_cache_misses(self, tmp_path):
+        """A disabled cache neither stores nor returns artifacts"""
+        ArtifactCache(tmp_path).save('camera', 'abc', {'x': np.zeros(1)})
+        
+        assert ArtifactCache(tmp_path, enabled=False).load('camera', 'abc') is None
+    
+    def test_keys_depend_on_params_and_upstream(self):
+        """Keys change with parameters and upstream keys only"""
+        key = ArtifactCache.make_key('motion', {'fps': 25, 'window': 5}, upstream=['a'])
+        
+        assert key == ArtifactCache.make_key('motion', {'window': 5, 'fps': 25}, upstream=['a'])
+        assert key != ArtifactCache.make_key('motion', {'fps': 30, 'window': 5}, upstream=['a'])
+        assert key != ArtifactCache.make_key('motion', {'fps': 25, 'window': 5}, upstream=['b'])
+    
+    def test_file_fingerprint_tracks_content(self, tmp_path):
+        """Fingerprints differ when file content changes"""
+        path = tmp_path / "video.bin"
+        path.write_bytes(b"a" * 1000)
+        first = ArtifactCache(tmp_path).fingerprint_file(path)
+        path.write_bytes(b"b" * 1000)
+        
+        assert ArtifactCache(tmp_path).fingerprint_file(path) != first
@@ -0,0 +1,87 @@
+"""
+Tests for ball re-detection around the predicted ball position
+"""
+
+import numpy as np
+import supervision as sv
+import torch
+from ultralytics.engine.results import Results
+from analytics.ball_redetector import BallRedetector
+
+NAMES = {0: 'player', 1: 'ball'}
+
+
+class _FakeModel:
+    """Finds the ball wherever the true ball lies inside a crop"""
+    
+    def __init__(self, ball_boxes):
+        self.ball_boxes = ball_boxes
+        self.crops = []
+    
+    def predict(self, crops, imgsz=640, conf=0.25, classes=None, verbose=False):
+        results = []
+        for crop in crops:
+            self.crops.append(crop.shape)
+            x0, y0 = crop[0, 0, :2]
+            x1, y1, x2, y2 = self.ball_boxes[int(crop[0, 0, 2])] - np.array([x0, y0, x0, y0])
+            inside = 0 <= x1 and 0 <= y1 and x2 <= crop.shape[1] and y2 <= crop.shape[0]
+            boxes = torch.tensor([[x1, y1, x2, y2, 0.6, 1.0]] if inside else np.zeros((0, 6)))
+            results.append(Results(crop, path='', names=NAMES, boxes=boxes))
+        return results
+
+
+def _frame(frame_idx):
+    """Frame whose pixels encode their own coordinates and frame index"""
+    ys, xs = np.mgrid[0:720, 0:1280]
+    return np.stack([xs, ys, np.full_like(xs, frame_idx)], axis=-1).astype(np.int32)
+
+
+def _ball_detections(box, confidence):
+    """Detections of a frame with one ball (or none)"""
+    if box is None:
+        return sv.Detections.empty()
+    return sv.Detections(
+        xyxy=np.array([box], dtype=np.float32),
+        confidence=np.array([confidence], dtype=np.float32),
+        class_id=np.array([1])
+    )
+
+
+class TestBallRedetector:
+    """Test ball position prediction and re-detection"""
+    
+    def test_predict_position(self):
+        """Gaps are interpolated, trailing frames extrapolated, far frames skipped"""
+        redetector = BallRedetector(None, [1], max_gap=5)
+        observations = [(0, 100.0, 50.0), (2, 120.0, 50.0), (6, 160.0, 90.0)]
+        
+        assert redetector.predict_position(observations, 4) == (140.0, 70.0)
+        assert redetector.predict_position(observations, 8) == (180.0, 110.0)
+        assert redetector.predict_position(observations, 20) is None
+    
+    def test_search_window_stays_inside_frame(self):
+        """Windows near the border are shifted inside the frame"""
+        redetector = BallRedetector(None, [1], window_size=200)
+        
+        assert redetector.search_window((50, 700), (720, 1280)) == (0, 520, 200, 720)
+        assert redetector.search_window((600, 300), (720, 1280)) == (500, 200, 700, 400)
+    
+    def test_refine_recovers_missing_and_weak_balls(self):
+        """Missing and low-confidence balls are replaced by re-detections"""
+        ball_boxes = np.array([[100 + 20 * i, 300, 110 + 20 * i, 310] for i in range(5)], dtype=np.float32)
+        model = _FakeModel(ball_boxes)
+        redetector = BallRedetector(model, [1], window_size=128, tile_size=64, min_confidence=0.3)
+        
+        detections = [
+            _ball_detections(ball_boxes[0], 0.9),
+            _ball_detections(None, 0),
+            _ball_detections(ball_boxes[2], 0.9),
+            _ball_detections(ball_boxes[3] + 40, 0.1),
+            _ball_detections(ball_boxes[4], 0.9)
+        ]
+        redetector.refine([_frame(i) for i in range(5)], detections)
+        
+        assert np.allclose(detections[1].xyxy, [ball_boxes[1]])
+        assert np.allclose(detections[3].xyxy, [ball_boxes[3]])
+        assert redetector.get_stats()['recovered'] == 2
+        assert set(model.crops) == {(64, 64, 3)}
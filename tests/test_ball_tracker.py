@@ -0,0 +1,73 @@
+"""
+Tests for Kalman ball tracking with bounded gap filling
+"""
+
+import numpy as np
+from analytics.ball_tracker import BallTracker
+
+
+def _ball_boxes(centers, size=10):
+    """Square ball bboxes around centres"""
+    centers = np.asarray(centers, dtype=np.float64)
+    return np.hstack([centers - size / 2, centers + size / 2])
+
+
+def _run(tracker, frames, bboxes, num_frames, chunk_size=50):
+    """Stream detections through the tracker chunk by chunk"""
+    frames = np.asarray(frames)
+    results = []
+    for start in range(0, num_frames, chunk_size):
+        selected = (frames >= start) & (frames < start + chunk_size)
+        results.append(tracker.update(frames[selected], bboxes[selected], min(start + chunk_size, num_frames)))
+    results.append(tracker.flush())
+    return tuple(np.concatenate([result[idx] for result in results]) for idx in range(3))
+
+
+class TestBallTracker:
+    """Test gating, gap filling and smoothing of the ball track"""
+    
+    def test_fills_short_gaps_only(self):
+        """Short gaps are predicted and flagged, long gaps stay empty"""
+        all_frames = np.arange(200)
+        detected = (all_frames < 60) | ((all_frames >= 68) & (all_frames < 100)) | (all_frames >= 150)
+        frames = all_frames[detected]
+        centers = np.column_stack([100 + 3.0 * frames, np.full(len(frames), 300.0)])
+        
+        out_frames, bboxes, observed = _run(BallTracker(max_gap=10), frames, _ball_boxes(centers), 200)
+        
+        assert np.all(np.diff(out_frames) > 0)
+        assert set(range(60, 68)) <= set(out_frames) and not set(range(100, 150)) & set(out_frames)
+        assert np.array_equal(out_frames[observed], frames)
+        
+        filled = np.isin(out_frames, np.arange(60, 68))
+        assert not observed[filled].any()
+        assert np.allclose((bboxes[filled, 0] + bboxes[filled, 2]) / 2, 100 + 3.0 * out_frames[filled], atol=1.0)
+    
+    def test_gates_out_false_detections(self):
+        """An isolated far-away detection does not pull the track"""
+        frames = np.arange(100)
+        centers = np.column_stack([200 + 2.0 * frames, 400 - 1.0 * frames])
+        centers[40] = [1100, 100]  # false ball, replaces the real one
+        
+        tracker = BallTracker()
+        out_frames, bboxes, observed = _run(tracker, frames, _ball_boxes(centers), 100)
+        
+        assert np.array_equal(out_frames, frames)
+        assert not observed[40]
+        assert np.allclose(bboxes[40, :2] + 5, [280, 360], atol=2.0)
+        assert tracker.get_stats()['rejected'] == 1 and tracker.get_stats()['tracks'] == 1
+    
+    def test_smoothing_reduces_noise(self):
+        """RTS smoothing beats the raw detections and the forward filter"""
+        rng = np.random.default_rng(0)
+        frames = np.arange(300)
+        truth = np.column_stack([640 + 200 * np.sin(frames / 50), 360 + 100 * np.cos(frames / 40)])
+        bboxes = _ball_boxes(truth + rng.normal(0, 3, truth.shape))
+        
+        errors = {}
+        for smooth in (False, True):
+            out_frames, out_bboxes, _ = _run(BallTracker(smooth=smooth), frames, bboxes, 300)
+            centers = (out_bboxes[:, :2] + out_bboxes[:, 2:]) / 2
+            errors[smooth] = np.linalg.norm(centers - truth[out_frames], axis=1).mean()
+        
+        assert errors[True] < errors[False] < 3.0 * np.sqrt(np.pi / 2)
@@ -0,0 +1,59 @@
+"""
+Tests for the YOLO batch size tuner
+"""
+
+from utils.batch_tuner import BatchSizeTuner
+
+
+def _run(tuner, seconds_per_frame, batches):
+    """Feed the tuner batches timed by a per-size seconds-per-frame table"""
+    for _ in range(batches):
+        size = tuner.batch_size
+        tuner.record(size, size, size * seconds_per_frame[size])
+
+
+class TestBatchSizeTuner:
+    """Test throughput probing, memory ceiling and run-time re-probing"""
+    
+    def test_probe_picks_fastest_size(self):
+        """Every candidate is measured once and the fastest kept"""
+        tuner = BatchSizeTuner(candidates=(1, 2, 4, 8), memory_limit_mb=1e9, warmup_batches=1)
+        _run(tuner, {1: 0.10, 2: 0.06, 4: 0.04, 8: 0.045}, batches=5)
+        
+        assert not tuner.probing
+        assert tuner.batch_size == 4
+        assert tuner.get_stats()['fps'] == 25.0
+        assert sorted(tuner.get_stats()['probed_fps']) == [1, 2, 4, 8]
+    
+    def test_memory_ceiling_steps_down(self):
+        """RSS above the ceiling reduces the batch size instead of probing upwards"""
+        tuner = BatchSizeTuner(candidates=(1, 2, 4, 8), memory_limit_mb=1, warmup_batches=0)
+        tuner.probe_queue = []
+        tuner.batch_size = 8
+        
+        tuner.record(8, 8, 0.1)
+        
+        assert tuner.batch_size == 4
+        assert tuner.max_size == 4
+        assert tuner.get_stats()['adjustments'][-1][:3] == ('memory', 8, 4)
+    
+    def test_throughput_drop_reprobes_neighbours(self):
+        """A sustained throughput drop re-measures the neighbouring sizes"""
+        tuner = BatchSizeTuner(candidates=(1, 2, 4, 8), memory_limit_mb=1e9, window=3, warmup_batches=0)
+        _run(tuner, {1: 0.10, 2: 0.06, 4: 0.04, 8: 0.045}, batches=4)
+        assert tuner.batch_size == 4
+        
+        _run(tuner, {1: 0.10, 2: 0.06, 4: 0.08, 8: 0.09}, batches=3)
+        assert tuner.probe_queue == [2, 4, 8]
+        
+        _run(tuner, {1: 0.10, 2: 0.06, 4: 0.08, 8: 0.09}, batches=3)
+        assert tuner.batch_size == 2
+        
+    def test_partial_batches_not_measured(self):
+        """The short last batch of a chunk does not count as a probe"""
+        tuner = BatchSizeTuner(candidates=(1, 2), memory_limit_mb=1e9, warmup_batches=0)
+        tuner.record(1, 1, 0.1)
+        tuner.record(2, 1, 0.1)
+        
+        assert tuner.probing
+        assert tuner.batch_size == 2
@@ -0,0 +1,48 @@
+"""
+Tests for optical-flow box propagation
+"""
+
+import numpy as np
+import cv2
+from utils.box_propagation import BoxPropagator, frame_difference
+
+
+def _textured_frame(offset, size=(240, 320)):
+    """Grey frame with a textured patch moved by offset (dx, dy)"""
+    rng = np.random.default_rng(0)
+    patch = cv2.GaussianBlur((rng.random((60, 30)) * 255).astype(np.uint8), (5, 5), 0)
+    frame = np.full(size, 90, dtype=np.uint8)
+    x, y = 100 + offset[0], 80 + offset[1]
+    frame[y:y + 60, x:x + 30] = patch
+    return frame
+
+
+class TestBoxPropagation:
+    """Test box propagation between frames"""
+    
+    def test_box_follows_moving_patch(self):
+        """Boxes are shifted by the motion of their content"""
+        propagator = BoxPropagator()
+        boxes = np.array([[100, 80, 130, 140]], dtype=np.float32)
+        
+        moved, keep = propagator.propagate(_textured_frame((0, 0)), _textured_frame((4, -2)), boxes)
+        
+        assert keep.tolist() == [True]
+        assert np.allclose(moved[0], [104, 78, 134, 138], atol=0.5)
+    
+    def test_box_on_flat_region_moves_with_frame(self):
+        """Boxes without trackable content follow the frame's motion"""
+        propagator = BoxPropagator()
+        boxes = np.array([[100, 80, 130, 140], [200, 150, 230, 200]], dtype=np.float32)
+        
+        moved, followed = propagator.propagate(_textured_frame((0, 0)), _textured_frame((4, 0)), boxes)
+        
+        assert followed.tolist() == [True, False]
+        assert np.allclose(moved[1], [204, 150, 234, 200], atol=0.5)
+    
+    def test_frame_difference_detects_scene_change(self):
+        """Small motion differs little, a different scene differs a lot"""
+        frame = _textured_frame((0, 0))
+        
+        assert frame_difference(frame, _textured_frame((1, 0))) < 5
+        assert frame_difference(frame, 255 - frame) > 50
@@ -0,0 +1,47 @@
+"""
+Tests for per-chunk checkpoints
+"""
+
+import numpy as np
+from utils.checkpoint import ChunkCheckpoint
+
+
+class TestChunkCheckpoint:
+    """Test checkpoint save, load and clear"""
+    
+    def test_round_trip(self, tmp_path):
+        """Completed chunks and the latest state are restored"""
+        checkpoint = ChunkCheckpoint(tmp_path / "run")
+        checkpoint.save(10, {'step': 1}, {'frame': np.arange(10)}, {'xyxy': np.zeros((2, 4))})
+        checkpoint.save(20, {'step': 2}, {'frame': np.arange(10, 20)}, camera={'movement': np.ones((10, 2))})
+        
+        next_frame, state, chunks, detections, camera = ChunkCheckpoint(tmp_path / "run").load()
+        
+        assert next_frame == 20
+        assert state == {'step': 2}
+        assert [list(chunk['frame'][:1]) for chunk in chunks] == [[0], [10]]
+        assert detections[0]['xyxy'].shape == (2, 4)
+        assert detections[1] == {}
+        assert camera[0] == {} and camera[1]['movement'].shape == (10, 2)
+        assert set(chunks[1]) == {'frame'}
+    
+    def test_resumed_checkpoint_keeps_earlier_chunks(self, tmp_path):
+        """Chunks saved after a resume are appended to the restored ones"""
+        ChunkCheckpoint(tmp_path).save(5, {}, {'frame': np.arange(5)})
+        
+        checkpoint = ChunkCheckpoint(tmp_path)
+        checkpoint.load()
+        checkpoint.save(10, {}, {'frame': np.arange(5, 10)})
+        
+        assert len(ChunkCheckpoint(tmp_path).load()[2]) == 2
+    
+    def test_missing_and_cleared(self, tmp_path):
+        """No checkpoint loads as None, also after clearing"""
+        checkpoint = ChunkCheckpoint(tmp_path / "run")
+        assert checkpoint.load() is None
+        
+        checkpoint.save(5, {}, {'frame': np.arange(5)})
+        checkpoint.clear()
+        
+        assert not checkpoint.exists()
+        assert checkpoint.load() is None
@@ -0,0 +1,69 @@
+"""
+Tests for jersey colour extraction
+"""
+
+import cv2
+import numpy as np
+from sklearn.cluster import KMeans
+from utils.color_clustering import ColorExtractor
+
+
+def _reference_jersey_color(frame, bbox, use_lab=True):
+    """Per-bbox jersey colour as computed before batching (single-cluster KMeans)"""
+    x1, y1, x2, y2 = [int(v) for v in bbox]
+    h, w = frame.shape[:2]
+    x1, y1 = max(0, x1), max(0, y1)
+    x2, y2 = min(w, x2), min(h, y2)
+    if x2 <= x1 or y2 <= y1:
+        return None
+    
+    jersey_img = frame[y1:y2, x1:x2][0:int((y2 - y1) * 0.5), :]
+    if jersey_img.size == 0:
+        return None
+    
+    if use_lab:
+        jersey_img = cv2.cvtColor(jersey_img, cv2.COLOR_BGR2LAB)
+    pixels = jersey_img.reshape(-1, 3)
+    if use_lab:
+        pixels = pixels[(pixels[:, 0] > 20) & (pixels[:, 0] < 235)]
+    else:
+        pixels = pixels[(pixels.sum(axis=1) > 30) & (pixels.sum(axis=1) < 700)]
+    if len(pixels) < 10:
+        return None
+    
+    return KMeans(n_clusters=1, init='k-means++', n_init=1, random_state=42).fit(pixels).cluster_centers_[0]
+
+
+class TestColorExtractor:
+    """Test batched jersey colours against the per-bbox computation"""
+    
+    def test_batched_colors_match_per_bbox(self):
+        """Every bbox gets the colour the per-bbox KMeans gave, in both colour spaces"""
+        rng = np.random.default_rng(0)
+        frame = rng.integers(0, 256, (360, 640, 3), dtype=np.uint8)
+        frame[50:150, 100:140] = (30, 40, 200)
+        bboxes = [
+            [100, 50, 140, 250],        # solid jersey
+            [-20.7, -10.2, 30.5, 60.9],  # clipped at the top-left corner
+            [600, 300, 700, 420],       # clipped at the bottom-right corner
+            [200.4, 100.6, 203.2, 104.8],  # too few pixels
+            [300, 200, 290, 260],       # empty
+        ] + [[x, y, x + 35, y + 90] for x, y in zip(rng.integers(0, 600, 10), rng.integers(0, 300, 10))]
+        
+        for use_lab in (True, False):
+            extractor = ColorExtractor(use_lab=use_lab)
+            colors = extractor.extract_jersey_colors(frame, bboxes)
+            
+            for bbox, color in zip(bboxes, colors):
+                reference = _reference_jersey_color(frame, bbox, use_lab)
+                if reference is None:
+                    assert np.isnan(color).all()
+                    assert extractor.extract_jersey_color(frame, bbox) is None
+                else:
+                    assert np.allclose(color, reference, atol=1e-3)
+                    assert np.allclose(extractor.extract_jersey_color(frame, bbox), reference, atol=1e-3)
+    
+    def test_no_bboxes(self):
+        """An empty bbox list gives an empty colour array"""
+        frame = np.zeros((10, 10, 3), dtype=np.uint8)
+        assert ColorExtractor().extract_jersey_colors(frame, []).shape == (0, 3)
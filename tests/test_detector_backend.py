@@ -0,0 +1,57 @@
+"""
+Tests for detector backends
+"""
+
+import pytest
+import numpy as np
+import supervision as sv
+from utils.detector_backend import exported_model_path, detection_agreement, sample_calibration_frames, load_detector
+from utils.video_utils import VideoChunkWriter
+
+
+def _detections(boxes, class_ids):
+    """Build detections from boxes and class IDs"""
+    return sv.Detections(
+        xyxy=np.array(boxes, dtype=np.float32).reshape(-1, 4),
+        class_id=np.array(class_ids, dtype=int)
+    )
+
+
+class TestDetectorBackend:
+    """Test export naming, calibration sampling and backend agreement"""
+    
+    def test_export_paths_follow_ultralytics_naming(self):
+        """Exports sit next to the weights, INT8 exports separately"""
+        assert str(exported_model_path("models/yolo11x.pt", "torch")) == "models/yolo11x.pt"
+        assert str(exported_model_path("models/yolo11x.pt", "onnx")) == "models/yolo11x.onnx"
+        assert str(exported_model_path("models/yolo11x.pt", "onnx", int8=True)) == "models/yolo11x_int8.onnx"
+        assert str(exported_model_path("models/yolo11x.pt", "openvino", int8=True)) == "models/yolo11x_int8_openvino_model"
+        
+        with pytest.raises(ValueError):
+            load_detector("models/yolo11x.pt", backend="tensorrt")
+    
+    def test_agreement_matches_same_class_only(self):
+        """Matches need the same class and enough overlap"""
+        reference = [_detections([[0, 0, 10, 10], [20, 20, 30, 30]], [1, 3])]
+        candidate = [_detections([[1, 0, 11, 10], [20, 20, 30, 30], [50, 50, 60, 60]], [1, 2, 1])]
+        
+        agreement = detection_agreement(reference, candidate)
+        
+        assert agreement['matched'] == 1
+        assert agreement['recall'] == pytest.approx(0.5)
+        assert agreement['precision'] == pytest.approx(1 / 3)
+        assert agreement['mean_iou'] == pytest.approx(90 / 110)
+    
+    def test_calibration_frames_sampled_across_videos(self, tmp_path):
+        """Calibration frames are spread over every video"""
+        video_paths = []
+        for i in range(2):
+            video_path = str(tmp_path / f"clip{i}.mp4")
+            with VideoChunkWriter(video_path, fps=10) as writer:
+                writer.write([np.full((48, 64, 3), 10 * j, dtype=np.uint8) for j in range(10)])
+            video_paths.append(video_path)
+        
+        images = sample_calibration_frames(video_paths, 6, str(tmp_path / "images"))
+        
+        assert len(images) == 6
+        assert sum("video000" in path for path in images) == 3
@@ -0,0 +1,87 @@
+"""
+Tests for bulk event detection
+"""
+
+import numpy as np
+import analytics.event_detector as event_detector
+from analytics.event_detector import EventDetector, neighbour_pairs
+
+
+def _players(frames_positions):
+    """Tracking dictionary with transformed player positions per frame"""
+    return {
+        'players': [
+            {player_id: {'position_transformed': list(pos)} for player_id, pos in enumerate(positions, 1)}
+            for positions in frames_positions
+        ],
+        'ball': [{} for _ in frames_positions],
+        'referees': [{} for _ in frames_positions]
+    }
+
+
+class TestEventDetector:
+    """Test cluster detection over the whole match"""
+    
+    def test_neighbour_pairs_stay_within_frames(self):
+        """KD-tree and dense pairs agree and never join two frames"""
+        rng = np.random.default_rng(0)
+        frames = np.repeat(np.arange(50), 12)
+        positions = rng.uniform(0, 20, (600, 2))
+        
+        pairs = neighbour_pairs(frames, positions, 4.0)
+        event_detector.SCIPY_AVAILABLE = False
+        try:
+            dense = neighbour_pairs(frames, positions, 4.0)
+        finally:
+            event_detector.SCIPY_AVAILABLE = True
+        
+        assert set(map(tuple, pairs.tolist())) == set(map(tuple, dense.tolist()))
+        assert np.all(frames[pairs[:, 0]] == frames[pairs[:, 1]])
+        assert np.all(np.linalg.norm(positions[pairs[:, 0]] - positions[pairs[:, 1]], axis=1) < 4.0)
+    
+    def test_cluster_events_with_cooldown(self):
+        """A set piece yields one event per cooldown with its members and centroid"""
+        spread = [(10.0 * i, 50.0) for i in range(8)]
+        corner = [(100, 0), (101, 1), (102, 0), (100, 2), (101, 3), (140, 60), (0, 60), (60, 30)]
+        match = _players([spread] * 10 + [corner] * 100)
+        
+        events = EventDetector(cluster_threshold=5.0, cluster_cooldown=60).detect_events(match)
+        clusters = [event for event in events if event['event_type'] == 'cluster']
+        
+        assert [event['frame'] for event in clusters] == [10, 70]
+        assert clusters[0]['player_ids'] == [1, 2, 3, 4, 5]
+        assert np.allclose(clusters[0]['centroid'], [100.8, 1.2])
+    
+    def test_trajectory_headings_wrap_around(self):
+        """Crossing the +-180° heading is no turn, a reversal is one"""
+        frames = np.arange(60)
+        wobble = np.where(frames % 2 == 0, 0.5, -0.5)
+        leftwards = np.column_stack([1000 - 10.0 * frames, 300 + wobble])
+        reversal = np.column_stack([np.where(frames < 30, 10.0 * frames, 600 - 10.0 * frames), np.full(60, 300.0)])
+        
+        assert EventDetector().detect_trajectory_changes(frames, leftwards) == []
+        
+        events = EventDetector().detect_trajectory_changes(frames, reversal)
+        assert [event['frame'] for event in events] == [33]
+        assert events[0]['trigger'] == 'direction' and events[0]['angle_change'] > 170
+    
+    def test_trajectory_speed_spike(self):
+        """A shot is reported with its speed and pitch location"""
+        frames = np.arange(100)
+        field_x = np.where(frames < 50, 0.1 * frames, 5.0 + 1.0 * (frames - 50))
+        field = np.column_stack([field_x, np.full(100, 34.0)])
+        
+        detector = EventDetector()
+        events = detector.detect_trajectory_changes(frames, field * 20, field, fps=25)
+        
+        assert [event['frame'] for event in events] == [53]
+        assert events[0]['trigger'] == 'speed'
+        assert np.isclose(events[0]['ball_speed'], (2 * 0.1 + 3 * 1.0) / 5 * 25)
+        assert np.allclose(events[0]['location'], [8.0, 34.0])
+        
+        # Streaming detection reports the same event
+        tracks = {'ball': [{1: {'position': list(field[f] * 20), 'position_transformed': list(field[f])}} for f in frames]}
+        streaming = EventDetector()
+        for frame_num in frames:
+            streaming._detect_trajectory_changes(frame_num, {'ball': [tracks['ball'][frame_num]]})
+        assert [event['frame'] for event in streaming.events] == [53]
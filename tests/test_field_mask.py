@@ -0,0 +1,77 @@
+"""
+Tests for the field mask
+"""
+
+import json
+import numpy as np
+from utils.field_mask import FieldMask
+
+
+def _field_mask(tmp_path, vertices):
+    """FieldMask loaded from a temporary default config"""
+    config_path = tmp_path / "field_config.json"
+    config_path.write_text(json.dumps({'default': {'pixel_vertices': vertices}}))
+    return FieldMask(str(config_path))
+
+
+class TestFieldMaskRoi:
+    """Test field bounds and inference crops"""
+    
+    def test_bounds_follow_transform(self, tmp_path):
+        """Bounds move with a camera transform"""
+        mask = _field_mask(tmp_path, [[100, 300], [900, 300], [1000, 900], [50, 900]])
+        shift = np.array([[1, 0, 40], [0, 1, -20], [0, 0, 1]], dtype=np.float64)
+        
+        assert mask.get_field_bounds() == (50, 300, 1000, 900)
+        assert mask.get_field_bounds(shift) == (90, 280, 1040, 880)
+    
+    def test_inference_roi_adds_margin_and_clips(self, tmp_path):
+        """Crops cover the field plus margin inside the frame"""
+        mask = _field_mask(tmp_path, [[100, 300], [900, 300], [1000, 900], [50, 900]])
+        
+        assert mask.get_inference_roi((1080, 1920, 3), margin=80) == (0, 220, 1080, 980)
+    
+    def test_inference_roi_covers_all_transforms(self, tmp_path):
+        """One crop covers the field in every frame of a chunk"""
+        mask = _field_mask(tmp_path, [[100, 300], [900, 300], [1000, 900], [50, 900]])
+        transforms = np.tile(np.eye(3), (2, 1, 1))
+        transforms[1, 0, 2] = 200
+        
+        assert mask.get_inference_roi((1080, 1920), margin=0, transforms=transforms) == (50, 300, 1200, 900)
+    
+    def test_no_crop_without_config_or_for_full_field(self, tmp_path):
+        """Missing config or a field filling the frame disables cropping"""
+        full = _field_mask(tmp_path, [[0, 0], [1920, 0], [1920, 1080], [0, 1080]])
+        
+        assert FieldMask().get_inference_roi((1080, 1920)) is None
+        assert full.get_inference_roi((1080, 1920)) is None
+
+
+class TestFieldMaskLookup:
+    """Test vectorized field membership"""
+    
+    def test_matches_polygon_test(self, tmp_path):
+        """Lookup agrees with cv2.pointPolygonTest, including vertices and edge points"""
+        import cv2
+        mask = _field_mask(tmp_path, [[110.5, 180.2], [1265, 275], [910, 780.7], [-20, 700]])
+        random = np.random.default_rng(0).uniform([-50, -50], [1350, 950], size=(2000, 2))
+        grid = np.stack(np.meshgrid(np.arange(-50, 1350, 5), np.arange(-50, 950, 5)), axis=-1).reshape(-1, 2)
+        points = np.vstack([random, grid, mask.polygon]).astype(np.float32)
+        
+        inside = mask.contains_points(points)
+        expected = np.array([cv2.pointPolygonTest(mask.polygon, (float(x), float(y)), False) >= 0 for x, y in points])
+        
+        assert np.array_equal(inside, expected)
+        assert mask.is_inside_field((600, 500)) and not mask.is_inside_field((1300, 100))
+    
+    def test_lookup_follows_per_frame_transforms(self, tmp_path):
+        """Points are mapped back through their own frame's camera transform"""
+        mask = _field_mask(tmp_path, [[100, 100], [500, 100], [500, 400], [100, 400]])
+        transforms = np.tile(np.eye(3), (2, 1, 1))
+        transforms[1, 0, 2] = 300  # field moved 300 px right in frame 1
+        points = np.array([[150, 200], [150, 200], [700, 200], [700, 200]])
+        
+        inside = mask.contains_points(points, transforms, frame_indices=[0, 1, 0, 1])
+        
+        assert inside.tolist() == [True, False, False, True]
+        assert FieldMask().contains_points(points).all()
@@ -0,0 +1,81 @@
+"""
+Tests for batched jersey number OCR
+"""
+
+import cv2
+import numpy as np
+from utils.jersey_detector import JerseyNumberDetector
+
+
+class FakeReader:
+    """OCR stand-in that reads the number registered for an enhanced ROI"""
+    
+    def __init__(self):
+        self.templates = []
+        self.batch_shapes = []
+    
+    def register(self, enhanced, number):
+        """Read number wherever enhanced is found at the top-left of an image"""
+        self.templates.append((enhanced, number))
+    
+    def readtext(self, image, **kwargs):
+        for template, number in self.templates:
+            h, w = template.shape
+            if image.shape[0] >= h and image.shape[1] >= w and np.array_equal(image[:h, :w], template):
+                return [([[0, 0]] * 4, str(number), 0.9)]
+        return []
+    
+    def readtext_batched(self, images, n_width=None, n_height=None, **kwargs):
+        assert all(image.shape == (n_height, n_width) for image in images)
+        self.batch_shapes.append((len(images), n_height, n_width))
+        return [self.readtext(image) for image in images]
+
+
+def _jersey_roi(width, height, number, seed):
+    """Noisy shirt crop with a number drawn on it"""
+    rng = np.random.default_rng(seed)
+    roi = np.clip(rng.normal(150, 20, (height, width, 3)), 0, 255).astype(np.uint8)
+    cv2.putText(roi, str(number), (1, height - 2), cv2.FONT_HERSHEY_SIMPLEX, height / 40, (20, 20, 20), 1)
+    return roi
+
+
+class TestJerseyNumberDetector:
+    """Test that batched OCR reads what single-ROI OCR reads"""
+    
+    def test_batched_reads_match_single_reads(self):
+        """Tiles keep the single-ROI enhancement exactly and read the same numbers"""
+        detector = JerseyNumberDetector(batch_size=3)
+        detector.enabled, detector.reader = True, FakeReader()
+        
+        sizes = [(12, 30), (40, 25), (20, 20), (33, 14), (16, 48)]
+        rois = [_jersey_roi(w, h, number, number) for number, (w, h) in enumerate(sizes, 7)]
+        rois.insert(2, None)
+        rois.insert(4, np.zeros((6, 30, 3), dtype=np.uint8))  # too small to read
+        
+        for idx, roi in enumerate(rois):
+            if roi is not None and min(roi.shape[:2]) >= 10:
+                detector.reader.register(detector.enhance_for_ocr(roi), idx + 1)
+        
+        single = [
+            detector._parse_ocr_results(detector.reader.readtext(detector.enhance_for_ocr(roi)))
+            if roi is not None and min(roi.shape[:2]) >= 10 else None
+            for roi in rois
+        ]
+        batched = detector.read_numbers_batch(rois)
+        
+        assert batched == single
+        assert sum(number is not None for number in batched) == len(sizes)
+        assert [count for count, _, _ in detector.reader.batch_shapes] == [3, 2]
+    
+    def test_tiles_keep_aspect_and_upscale(self):
+        """Each tile is the 4x single-ROI enhancement, padded only at bottom and right"""
+        detector = JerseyNumberDetector()
+        rois = [_jersey_roi(12, 30, 4, 0), _jersey_roi(40, 25, 9, 1)]
+        
+        tiles = detector.enhance_batch_for_ocr(rois)
+        
+        assert tiles.shape == (2, 120, 160)
+        for tile, roi in zip(tiles, rois):
+            single = detector.enhance_for_ocr(roi)
+            assert single.shape == (roi.shape[0] * 4, roi.shape[1] * 4)
+            assert np.array_equal(tile[:single.shape[0], :single.shape[1]], single)
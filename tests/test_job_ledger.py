@@ -0,0 +1,88 @@
+"""
+Tests for the batch job ledger
+"""
+
+import sys
+import queue
+from pathlib import Path
+from utils.job_ledger import JobLedger, DONE, FAILED, PENDING, RUNNING
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+from batch_process import _mark_started
+
+
+def _make_videos(tmp_path, count):
+    """Create placeholder video files"""
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"match{i}.mp4"
+        path.write_bytes(b"x" * (i + 1))
+        paths.append(str(path))
+    return paths
+
+
+class TestJobLedger:
+    """Test scheduling, persistence and resume of batch jobs"""
+    
+    def test_interrupted_batch_resumes(self, tmp_path):
+        """Finished jobs are skipped, interrupted ones run again"""
+        videos = _make_videos(tmp_path, 3)
+        ledger = JobLedger(tmp_path / "ledger.json")
+        assert ledger.schedule(videos) == videos
+        
+        for video in videos:
+            ledger.mark_running(video)
+        ledger.mark_done(videos[0], runtime=10.0, frames=250)
+        
+        # New process after a crash
+        resumed = JobLedger(tmp_path / "ledger.json")
+        assert resumed.schedule(videos) == videos[1:]
+        assert resumed.jobs[videos[0]]['status'] == DONE
+        assert resumed.jobs[videos[0]]['fps'] == 25.0
+    
+    def test_failed_jobs_only_rerun_on_request(self, tmp_path):
+        """Failures are kept unless retry_failed is set"""
+        videos = _make_videos(tmp_path, 2)
+        ledger = JobLedger(tmp_path / "ledger.json")
+        ledger.schedule(videos)
+        ledger.mark_running(videos[0])
+        ledger.mark_failed(videos[0], "RuntimeError: boom", runtime=3.0)
+        ledger.mark_running(videos[1])
+        ledger.mark_done(videos[1], runtime=5.0, frames=100)
+        
+        assert JobLedger(tmp_path / "ledger.json").schedule(videos) == []
+        assert JobLedger(tmp_path / "ledger.json").schedule(videos, retry_failed=True) == videos[:1]
+        
+        rows = {row['video']: row for row in ledger.summary_rows()}
+        assert rows['match0.mp4']['status'] == FAILED
+        assert rows['match0.mp4']['error'] == "RuntimeError: boom"
+        assert rows['match1.mp4']['fps'] == 20.0
+    
+    def test_changed_video_runs_again(self, tmp_path):
+        """A finished video whose file changed is scheduled again"""
+        videos = _make_videos(tmp_path, 1)
+        ledger = JobLedger(tmp_path / "ledger.json")
+        ledger.schedule(videos)
+        ledger.mark_running(videos[0])
+        ledger.mark_done(videos[0], runtime=1.0, frames=10)
+        
+        with open(videos[0], "ab") as f:
+            f.write(b"more")
+        
+        assert JobLedger(tmp_path / "ledger.json").schedule(videos) == videos
+    
+    def test_jobs_marked_running_when_started(self, tmp_path):
+        """Queued jobs stay pending; late start reports do not reopen finished jobs"""
+        videos = _make_videos(tmp_path, 3)
+        ledger = JobLedger(tmp_path / "ledger.json")
+        ledger.schedule(videos)
+        ledger.mark_done(videos[1], runtime=2.0, frames=50)
+        
+        started = queue.Queue()
+        started.put(videos[0])
+        started.put(videos[1])
+        _mark_started(ledger, started)
+        
+        assert ledger.jobs[videos[0]]['status'] == RUNNING and ledger.jobs[videos[0]]['attempts'] == 1
+        assert ledger.jobs[videos[1]]['status'] == DONE
+        assert ledger.jobs[videos[2]]['status'] == PENDING and ledger.jobs[videos[2]]['attempts'] == 0
@@ -0,0 +1,124 @@
+"""
+Tests for the model registry and the shared inference server
+"""
+
+import threading
+import numpy as np
+import torch
+import supervision as sv
+from ultralytics.engine.results import Results
+from utils.model_registry import ModelRegistry
+import os
+import pytest
+from multiprocessing import AuthenticationError
+from utils.inference_server import (
+    InferenceServer, RemoteDetector, parse_address, server_authkey, load_authkey, read_authkey, AUTHKEY_ENV
+)
+
+
+class FakeDetector:
+    """Detector returning one box per frame at the frame's brightness"""
+    
+    names = {0: 'player', 1: 'ball'}
+    overrides = {'imgsz': 640}
+    
+    def __init__(self):
+        self.batch_sizes = []
+    
+    def predict(self, frames, verbose=False, **kwargs):
+        self.batch_sizes.append(len(frames))
+        return [
+            Results(orig_img=frame, path='', names=self.names,
+                    boxes=torch.tensor([[float(frame[0, 0, 0]), 0, 10, 10, 0.9, 0]]))
+            for frame in frames
+        ]
+
+
+class TestModelRegistry:
+    """Test lazy loading, warm reuse and cross-job batching"""
+    
+    def test_models_loaded_once(self):
+        """Repeated requests reuse the loaded model"""
+        registry = ModelRegistry()
+        loads = []
+        
+        first = registry._get(('detector', 'a'), lambda: loads.append(1) or object())
+        second = registry._get(('detector', 'a'), lambda: loads.append(1) or object())
+        
+        assert first is second
+        assert len(loads) == 1
+        assert registry.stats == {'loads': 1, 'hits': 1}
+    
+    def test_parse_address(self):
+        """Addresses accept host:port, a bare port or a tuple"""
+        assert parse_address("10.0.0.2:7000") == ("10.0.0.2", 7000)
+        assert parse_address("7000") == ("127.0.0.1", 7000)
+        assert parse_address(("localhost", "7000")) == ("localhost", 7000)
+    
+    def test_server_batches_concurrent_jobs(self):
+        """Requests of concurrent clients are merged and split back per client"""
+        detector = FakeDetector()
+        server = InferenceServer(detector, port=0, max_batch=8, max_wait_ms=200,
+                                 model_info={'weights': 'w', 'backend': 'torch', 'int8': False})
+        address = server.start()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        
+        clients = [RemoteDetector(address, authkey=server.authkey) for _ in range(2)]
+        assert clients[0].names == FakeDetector.names
+        assert clients[0].server_info['weights'] == 'w'
+        
+        outputs = {}
+        def run(idx):
+            frames = [np.full((20, 20, 3), 10 * idx + i, dtype=np.uint8) for i in range(3)]
+            outputs[idx] = clients[idx].predict(frames, conf=0.5, verbose=False)
+        
+        threads = [threading.Thread(target=run, args=(idx,)) for idx in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        server.stop()
+        
+        assert detector.batch_sizes == [6]
+        for idx in range(2):
+            xs = [sv.Detections.from_ultralytics(result).xyxy[0, 0] for result in outputs[idx]]
+            assert xs == [10 * idx + i for i in range(3)]
+    
+    def test_generated_key_is_private_and_loopback_only(self, tmp_path, monkeypatch):
+        """A per-run key is written 0600; other interfaces need an explicit key"""
+        monkeypatch.delenv(AUTHKEY_ENV, raising=False)
+        key_file = tmp_path / "server.key"
+        
+        authkey = server_authkey("127.0.0.1", default_key_file=key_file)
+        assert os.stat(key_file).st_mode & 0o777 == 0o600
+        assert load_authkey(key_file) == authkey
+        assert server_authkey("localhost", default_key_file=key_file) != authkey
+        
+        with pytest.raises(ValueError):
+            server_authkey("0.0.0.0", default_key_file=key_file)
+        
+        monkeypatch.setenv(AUTHKEY_ENV, "explicit")
+        assert server_authkey("0.0.0.0") == b"explicit"
+        assert load_authkey(key_file) == b"explicit"
+    
+    def test_key_file_permissions_and_wrong_key(self, tmp_path):
+        """Shared key files are refused and clients with the wrong key rejected"""
+        key_file = tmp_path / "shared.key"
+        key_file.write_text("secret\n")
+        os.chmod(key_file, 0o644)
+        with pytest.raises(PermissionError):
+            read_authkey(key_file)
+        os.chmod(key_file, 0o600)
+        assert read_authkey(key_file) == b"secret"
+        
+        server = InferenceServer(FakeDetector(), port=0)
+        address = server.start()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            with pytest.raises(AuthenticationError):
+                RemoteDetector(address, authkey=b"guess")
+            with pytest.raises(ValueError):
+                RemoteDetector(address, authkey=None)
+            assert RemoteDetector(address, authkey=server.authkey).names == FakeDetector.names
+        finally:
+            server.stop()
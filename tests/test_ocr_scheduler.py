@@ -0,0 +1,62 @@
+"""
+Tests for the OCR scheduler
+"""
+
+import numpy as np
+from utils.ocr_scheduler import OCRScheduler
+
+
+def _roi(size=30, sharp=True):
+    """Create a jersey ROI, textured (sharp) or flat (blurry)"""
+    if sharp:
+        rng = np.random.default_rng(size)
+        return (rng.random((size, size, 3)) * 255).astype(np.uint8)
+    return np.full((size, size, 3), 128, dtype=np.uint8)
+
+
+class TestOCRScheduler:
+    """Test OCR scheduling policy"""
+    
+    def test_locked_track_rechecked_once_with_sharpest_roi(self):
+        """A due locked track gets a single OCR call on its best ROI"""
+        scheduler = OCRScheduler(recheck_interval=10)
+        candidates = [(0, 7, _roi(sharp=False)), (1, 7, _roi(sharp=True)), (2, 7, _roi(sharp=False))]
+        
+        selected = scheduler.select(candidates, locked_numbers={7: 10})
+        
+        assert selected == [1]
+        assert scheduler.get_stats()['skipped_locked'] == 2
+    
+    def test_recheck_interval_grows(self):
+        """Agreeing re-checks push the next check further out"""
+        scheduler = OCRScheduler(recheck_interval=10, interval_growth=2.0)
+        scheduler.record_result(7, 0, 10, locked_number=10)
+        assert scheduler.next_check_frame[7] == 10
+        scheduler.record_result(7, 10, 10, locked_number=10)
+        assert scheduler.next_check_frame[7] == 30
+        
+        # Not due yet
+        assert scheduler.select([(20, 7, _roi())], locked_numbers={7: 10}) == []
+        
+        # Disagreement resets the interval
+        scheduler.record_result(7, 30, 11, locked_number=10)
+        assert scheduler.next_check_frame[7] == 40
+    
+    def test_budget_prefers_unconfirmed_tracks(self):
+        """Budget is spent on unconfirmed tracks before locked ones"""
+        scheduler = OCRScheduler(chunk_budget=2)
+        candidates = [(0, 1, _roi()), (0, 2, _roi()), (0, 3, _roi()), (1, 2, _roi())]
+        
+        selected = scheduler.select(candidates, locked_numbers={1: 9})
+        
+        assert selected == [1, 2]
+        stats = scheduler.get_stats()
+        assert stats['ocr_calls'] == 2
+        assert stats['skipped_budget'] == 2
+    
+    def test_small_rois_skipped(self):
+        """Tiny ROIs are never OCR'd"""
+        scheduler = OCRScheduler(min_roi_area=300)
+        
+        assert scheduler.select([(0, 1, _roi(size=10)), (0, 2, None)], locked_numbers={}) == []
+        assert scheduler.get_stats()['skipped_small_roi'] == 2
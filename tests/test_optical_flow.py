@@ -0,0 +1,75 @@
+"""
+Tests for camera movement estimation
+"""
+
+import cv2
+import numpy as np
+from utils.optical_flow import OpticalFlowTracker, estimate_camera_movement_parallel
+from utils.video_utils import VideoChunkWriter, read_video
+
+
+def _panning_frames(count, dx=8, dy=2, steps=None):
+    """Crops of a textured image moving by (dx, dy) pixels per frame (or by the given per-frame steps)"""
+    rng = np.random.default_rng(0)
+    image = cv2.GaussianBlur((rng.random((480, 640, 3)) * 255).astype(np.uint8), (5, 5), 0)
+    for _ in range(300):
+        center = tuple(int(v) for v in rng.integers(0, 640, 2))
+        color = tuple(int(v) for v in rng.integers(0, 255, 3))
+        cv2.circle(image, center, int(rng.integers(3, 10)), color, -1)
+    
+    if steps is None:
+        steps = [(dx, dy)] * count
+    offsets = np.cumsum([(0, 0)] + list(steps[:count - 1]), axis=0)
+    return [
+        cv2.warpAffine(image, np.float32([[1, 0, -ox], [0, 1, -oy]]), (320, 240))
+        for ox, oy in offsets
+    ]
+
+
+class TestOpticalFlow:
+    """Test homography chaining and segmented estimation"""
+    
+    def test_chain_homographies(self):
+        """Chained steps map every frame back to the first frame"""
+        step = np.eye(3, dtype=np.float32)
+        step[:2, 2] = [-8, -2]  # content moves left/up by 8/2 pixels per frame
+        
+        frame_homographies = OpticalFlowTracker.chain_homographies(np.stack([np.eye(3), step, step]))
+        
+        assert np.allclose(frame_homographies[0], np.eye(3))
+        assert np.allclose(frame_homographies[2][:2, 2], [16, 4])
+    
+    def test_parallel_segments_cover_every_frame(self, tmp_path):
+        """Segmented estimation returns one movement per frame"""
+        video_path = str(tmp_path / "pan.mp4")
+        with VideoChunkWriter(video_path, fps=10) as writer:
+            writer.write(_panning_frames(24))
+        frames = read_video(video_path)
+        
+        movement, homographies = estimate_camera_movement_parallel(
+            video_path, len(frames), workers=2, min_segment_size=12, estimate_homography=True
+        )
+        
+        assert len(movement) == len(frames)
+        assert movement[0] == [0, 0]
+        # Segment boundary frame is warmed up, so it has a real estimate
+        assert np.allclose(movement[12], [-8, -2], atol=0.5)
+        assert homographies.shape == (len(frames), 3, 3)
+        assert np.allclose(homographies[-1][:2, 2], [8 * 23, 2 * 23], atol=3)
+    
+    def test_segments_match_sequential_estimate(self, tmp_path):
+        """Segments start on the right frame of an encoded video"""
+        steps = [(2 + 2 * (t % 4), t % 3) for t in range(40)]  # no two neighbours alike
+        video_path = str(tmp_path / "pan.mp4")
+        with VideoChunkWriter(video_path, fps=10) as writer:
+            writer.write(_panning_frames(40, steps=steps))
+        frames = read_video(video_path)
+        
+        sequential = OpticalFlowTracker(frames[0], min_distance=0).calculate_movement(frames)
+        segmented, _ = estimate_camera_movement_parallel(
+            video_path, len(frames), workers=3, min_segment_size=13, min_distance=0
+        )
+        
+        assert len(segmented) == len(sequential) == 40
+        assert np.allclose(segmented, sequential, atol=0.5)
+        assert np.allclose(segmented[13], np.negative(steps[12]), atol=0.5)
@@ -0,0 +1,51 @@
+"""
+Tests for the staged pipeline
+"""
+
+import pytest
+from utils.pipeline import StagedPipeline, PipelineStage
+
+
+def _build_pipeline(results, fail_at=None, queue_size=1):
+    """Pipeline doubling numbers and collecting them into results"""
+    def double(item):
+        if item == fail_at:
+            raise RuntimeError("stage failure")
+        return item * 2
+    
+    return StagedPipeline(
+        source=range(10),
+        stages=[PipelineStage('double', double), PipelineStage('collect', results.append)],
+        source_name='numbers',
+        queue_size=queue_size
+    )
+
+
+class TestStagedPipeline:
+    """Test threaded and inline pipeline execution"""
+    
+    @pytest.mark.parametrize("threaded", [True, False])
+    def test_items_processed_in_order(self, threaded):
+        """Every item passes every stage, in source order"""
+        results = []
+        pipeline = _build_pipeline(results)
+        pipeline.run(threaded=threaded)
+        
+        assert results == [i * 2 for i in range(10)]
+        assert [stats['frames'] for stats in pipeline.get_stats()] == [10, 10, 10]
+    
+    @pytest.mark.parametrize("threaded", [True, False])
+    def test_stage_error_is_raised(self, threaded):
+        """A failing stage stops the pipeline and re-raises"""
+        results = []
+        pipeline = _build_pipeline(results, fail_at=3)
+        
+        with pytest.raises(RuntimeError):
+            pipeline.run(threaded=threaded)
+        
+        assert len(results) <= 3
+    
+    def test_invalid_queue_size(self):
+        """Queues must hold at least one item"""
+        with pytest.raises(ValueError):
+            _build_pipeline([], queue_size=0)
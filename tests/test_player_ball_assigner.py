@@ -0,0 +1,67 @@
+"""
+Tests for whole-match ball possession assignment
+"""
+
+import numpy as np
+from player_ball_assigner import PlayerBallAssigner
+
+
+def _player_rows(feet_per_frame, teams):
+    """Columns of player rows from per-frame foot positions [(x, y) per player]"""
+    frames, bboxes, row_teams, ids = [], [], [], []
+    for frame, feet in enumerate(feet_per_frame):
+        for player_idx, (x, y) in enumerate(feet):
+            frames.append(frame)
+            bboxes.append([x - 10, y - 60, x + 10, y])
+            row_teams.append(teams[player_idx])
+            ids.append(player_idx + 1)
+    return np.array(frames), np.array(bboxes, dtype=float), np.array(row_teams), np.array(ids)
+
+
+def _ball_rows(centers):
+    """Columns of ball rows from per-frame centres (None = no ball)"""
+    frames = np.array([frame for frame, center in enumerate(centers) if center is not None])
+    bboxes = np.array([[x - 3, y - 3, x + 3, y + 3] for center in centers if center is not None for x, y in [center]])
+    return frames, bboxes.reshape(-1, 4)
+
+
+class TestPlayerBallAssigner:
+    """Test nearest-player possession with hysteresis"""
+    
+    def test_matches_per_frame_assignment(self):
+        """Without hysteresis the result equals assign_ball_to_player per frame"""
+        rng = np.random.default_rng(0)
+        feet = rng.uniform([0, 0], [400, 300], size=(50, 6, 2))
+        balls = [tuple(center) if frame % 7 else None for frame, center in enumerate(rng.uniform([0, 0], [400, 300], (50, 2)))]
+        teams = [1, 1, 1, 2, 2, 2]
+        assigner = PlayerBallAssigner(max_distance=70)
+        
+        has_ball, team_ball_control, holder = assigner.assign_possession(
+            *_player_rows(feet, teams), *_ball_rows(balls), 50
+        )
+        
+        team = 1
+        for frame, center in enumerate(balls):
+            expected = -1
+            if center is not None:
+                players = {idx + 1: {'bbox': [x - 10, y - 60, x + 10, y]} for idx, (x, y) in enumerate(feet[frame])}
+                expected = assigner.assign_ball_to_player(players, [center[0] - 3, center[1] - 3, center[0] + 3, center[1] + 3])
+            assert (holder[frame] % 6 + 1 if holder[frame] >= 0 else -1) == expected
+            if expected != -1:
+                team = teams[expected - 1]
+            assert team_ball_control[frame] == team
+        assert has_ball.sum() == np.count_nonzero(holder >= 0)
+    
+    def test_short_touches_and_contests_do_not_switch_possession(self):
+        """A one-frame brush by an opponent and contested frames keep the holder"""
+        feet = [[(100, 100), (300, 100)]] * 10
+        balls = [(100, 95)] * 4 + [(300, 95)] + [(100, 95)] + [(200, 95)] * 2 + [(300, 95)] * 2
+        assigner = PlayerBallAssigner(max_distance=150, min_hold_frames=2, contest_margin=5)
+        
+        has_ball, team_ball_control, holder = assigner.assign_possession(
+            *_player_rows(feet, [1, 2]), *_ball_rows(balls), 10
+        )
+        
+        assert holder.tolist() == [0, 2, 4, 6, -1, 10, -1, -1, 17, 19]
+        assert team_ball_control.tolist() == [1] * 8 + [2] * 2
+        assert has_ball.sum() == 7
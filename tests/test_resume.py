@@ -0,0 +1,187 @@
+"""
+End-to-end test of resuming an interrupted tracking pass
+"""
+
+import cv2
+import numpy as np
+import pytest
+import torch
+from ultralytics.engine.results import Results
+import analyze_match
+from analytics import JerseyTracker
+from utils.checkpoint import ChunkCheckpoint
+from utils.model_registry import get_registry
+from utils.video_utils import VideoChunkWriter
+from config.settings import Settings
+
+NAMES = {0: 'goalkeeper', 1: 'player', 2: 'referee', 3: 'ball'}
+NUM_FRAMES = 32
+
+
+class _FakeDetector:
+    """
+    Detector stand-in reading the frame index from the grey level: a
+    player every frame, a confident ball every 4th frame, and a ball in
+    the middle of every re-detection tile
+    """
+    
+    names = NAMES
+    overrides = {'imgsz': 320}
+    
+    def predict(self, images, conf=0.25, classes=None, verbose=False, imgsz=None):
+        results = []
+        for image in images:
+            frame_idx = int(round((image.mean() - 20) / 7))
+            height, width = image.shape[:2]
+            if classes is not None:
+                boxes = [[width / 2 - 3, height / 2 - 3, width / 2 + 3, height / 2 + 3, 0.6, 3.0]]
+            else:
+                boxes = [[40, 60, 70, 140, 0.9, 1.0]]
+                if frame_idx % 4 == 0:
+                    x, y = 100 + 12 * frame_idx, 150 + 4 * frame_idx
+                    boxes.append([x, y, x + 6, y + 6, 0.9, 3.0])
+            results.append(Results(image, path='', names=NAMES, boxes=torch.tensor(boxes)))
+        return results
+
+
+def _write_video(path):
+    """Flat grey frames whose level encodes the frame index"""
+    with VideoChunkWriter(str(path), fps=10) as writer:
+        writer.write([np.full((480, 640, 3), 20 + 7 * idx, dtype=np.uint8) for idx in range(NUM_FRAMES)])
+
+
+def _write_panning_video(path):
+    """Textured frames panning with a varying per-frame step"""
+    rng = np.random.default_rng(0)
+    image = (rng.random((400, 640, 3)) * 255).astype(np.uint8)
+    image = cv2.GaussianBlur(image, (7, 7), 0)
+    offsets = np.cumsum([(1 + idx % 3, idx % 2) for idx in range(NUM_FRAMES)], axis=0)
+    with VideoChunkWriter(str(path), fps=10) as writer:
+        writer.write([
+            cv2.warpAffine(image, np.float32([[1, 0, -ox], [0, 1, -oy]]), (320, 240))
+            for ox, oy in offsets
+        ])
+
+
+def _analyzer(resume):
+    """Analyzer with ball re-detection on the fake detector"""
+    return analyze_match.MatchAnalyzer(
+        model_path='fake.pt', enable_ocr=False, chunk_size=8, pipeline=True,
+        resume=resume, ball_redetection=True, batch_size=8
+    )
+
+
+class TestResume:
+    """Test that a resumed tracking pass matches an uninterrupted one"""
+    
+    def test_interrupted_run_resumes_identically(self, tmp_path, monkeypatch):
+        """Tracks, detections and ball re-detections survive a crash"""
+        monkeypatch.setattr(get_registry(), 'get_detector', lambda *args, **kwargs: _FakeDetector())
+        monkeypatch.setattr(Settings, 'BALL_REDETECT_WINDOW', 96)
+        monkeypatch.setattr(Settings, 'BALL_REDETECT_TILE', 96)
+        video = tmp_path / "match.mp4"
+        _write_video(video)
+        
+        uninterrupted = _analyzer(resume=False)
+        expected_table, expected_detections = uninterrupted._run_tracking_pass(str(video), [])
+        
+        # Crash the first run in the post-processing of the third chunk
+        interrupted = _analyzer(resume=True)
+        track_chunk = interrupted.tracker.track_chunk
+        def failing_track_chunk(frames, detections, chunk_idx=0, **kwargs):
+            if chunk_idx == 16:
+                raise RuntimeError("interrupted")
+            return track_chunk(frames, detections, chunk_idx=chunk_idx, **kwargs)
+        interrupted.tracker.track_chunk = failing_track_chunk
+        
+        with pytest.raises(RuntimeError):
+            interrupted._run_tracking_pass(str(video), [], checkpoint=ChunkCheckpoint(tmp_path / "ckpt"))
+        assert ChunkCheckpoint(tmp_path / "ckpt").load()[0] == 16
+        
+        resumed = _analyzer(resume=True)
+        table, detections = resumed._run_tracking_pass(str(video), [], checkpoint=ChunkCheckpoint(tmp_path / "ckpt"))
+        
+        assert resumed.tracker.ball_redetector.get_stats() == uninterrupted.tracker.ball_redetector.get_stats()
+        assert resumed.tracker.ball_redetector.get_stats()['recovered'] > 0
+        for name in expected_detections:
+            assert np.array_equal(detections[name], expected_detections[name])
+        for name in ('frame', 'track_id', 'object_type', 'bbox', 'team'):
+            assert np.array_equal(table[name], expected_table[name]), name
+    
+    def test_camera_history_restored_from_chunk_files(self, tmp_path, monkeypatch):
+        """Camera movement and homographies resume identically from the per-chunk files"""
+        monkeypatch.setattr(get_registry(), 'get_detector', lambda *args, **kwargs: _FakeDetector())
+        monkeypatch.setattr(Settings, 'CAMERA_HOMOGRAPHY_MODE', True)
+        monkeypatch.setattr(Settings, 'CAMERA_MIN_DISTANCE', 0)
+        video = tmp_path / "pan.mp4"
+        _write_panning_video(video)
+        no_detections = JerseyTracker.pack_detections([])
+        
+        uninterrupted = _analyzer(resume=False)
+        expected_movement = []
+        uninterrupted._run_tracking_pass(str(video), expected_movement, no_detections)
+        
+        interrupted = _analyzer(resume=True)
+        track_chunk = interrupted.tracker.track_chunk
+        def failing_track_chunk(frames, detections, chunk_idx=0, **kwargs):
+            if chunk_idx == 24:
+                raise RuntimeError("interrupted")
+            return track_chunk(frames, detections, chunk_idx=chunk_idx, **kwargs)
+        interrupted.tracker.track_chunk = failing_track_chunk
+        
+        with pytest.raises(RuntimeError):
+            interrupted._run_tracking_pass(
+                str(video), [], no_detections, checkpoint=ChunkCheckpoint(tmp_path / "ckpt")
+            )
+        next_frame, state, _, _, camera = ChunkCheckpoint(tmp_path / "ckpt").load()
+        assert next_frame == 24 and [len(chunk['movement']) for chunk in camera] == [8, 8, 8]
+        assert set(state) == {'tracker', 'camera_estimator'}  # no per-frame history
+        
+        resumed = _analyzer(resume=True)
+        movement = []
+        resumed._run_tracking_pass(str(video), movement, no_detections, checkpoint=ChunkCheckpoint(tmp_path / "ckpt"))
+        
+        assert len(movement) == NUM_FRAMES and np.abs(expected_movement).sum() > 0
+        assert np.array_equal(np.asarray(movement, dtype=np.float32), np.asarray(expected_movement, dtype=np.float32))
+        assert np.array_equal(
+            resumed.camera_estimator.get_frame_homographies(),
+            uninterrupted.camera_estimator.get_frame_homographies()
+        )
+    
+    @pytest.mark.parametrize('homography_mode', [False, True])
+    def test_chunk_field_transforms_match_whole_video(self, tmp_path, monkeypatch, homography_mode):
+        """Field-filter transforms built chunk by chunk, across a resume, match the whole-video ones"""
+        monkeypatch.setattr(get_registry(), 'get_detector', lambda *args, **kwargs: _FakeDetector())
+        monkeypatch.setattr(Settings, 'CAMERA_HOMOGRAPHY_MODE', homography_mode)
+        monkeypatch.setattr(Settings, 'CAMERA_MIN_DISTANCE', 0)
+        video = tmp_path / "pan.mp4"
+        _write_panning_video(video)
+        
+        transforms = {}
+        def run(analyzer, fail_at=None):
+            track_chunk = analyzer.tracker.track_chunk
+            def recording_track_chunk(frames, detections, chunk_idx=0, field_transforms=None, **kwargs):
+                if chunk_idx == fail_at:
+                    raise RuntimeError("interrupted")
+                transforms[chunk_idx] = field_transforms
+                return track_chunk(frames, detections, chunk_idx=chunk_idx, field_transforms=field_transforms, **kwargs)
+            analyzer.tracker.track_chunk = recording_track_chunk
+            analyzer.tracker.field_mask.enabled = True
+            
+            movement = []
+            analyzer._run_tracking_pass(
+                str(video), movement, JerseyTracker.pack_detections([]), checkpoint=ChunkCheckpoint(tmp_path / "ckpt")
+            )
+            return movement
+        
+        with pytest.raises(RuntimeError):
+            run(_analyzer(resume=True), fail_at=16)
+        resumed = _analyzer(resume=True)
+        movement = run(resumed)
+        
+        homographies = resumed.camera_estimator.get_frame_homographies() if homography_mode else None
+        expected = analyze_match.MatchAnalyzer._field_transforms(movement, homographies)
+        chunked = np.concatenate([transforms[chunk_idx] for chunk_idx in sorted(transforms)])
+        assert sorted(transforms) == [0, 8, 16, 24]
+        assert np.abs(expected[-1] - np.eye(3)).max() > 1
+        assert np.allclose(chunked, expected)
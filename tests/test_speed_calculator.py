@@ -0,0 +1,66 @@
+"""
+Tests for whole-match speed, distance and acceleration computation
+"""
+
+import numpy as np
+import pytest
+from utils.speed_calculator import SpeedCalculator
+from speed_and_distance_estimator import SpeedAndDistanceEstimator
+
+
+class TestTrackKinematics:
+    """Test vectorized kinematics over interleaved tracks"""
+    
+    def test_matches_per_track_computation(self):
+        """Interleaved rows give the per-track steps, cumulative distance and smoothing"""
+        rng = np.random.default_rng(0)
+        frames = np.repeat(np.arange(40), 3)
+        track_ids = np.tile([7, 3, 1002], 40)
+        positions = rng.normal(0, 1, (120, 2)).cumsum(axis=0)
+        calculator = SpeedCalculator(fps=10, window_size=5)
+        
+        speed, distance, acceleration = calculator.track_kinematics(track_ids, frames, positions)
+        
+        for track_id in (7, 3, 1002):
+            rows = np.flatnonzero(track_ids == track_id)
+            steps = np.linalg.norm(np.diff(positions[rows], axis=0), axis=1)
+            assert distance[rows[0]] == 0 and speed[rows[0]] == 0
+            assert np.allclose(distance[rows[1:]], np.cumsum(steps))
+            assert np.allclose(speed[rows[1:]], calculator.smooth_speed_array(steps * 10))
+            assert np.allclose(acceleration[rows[2:]], np.diff(speed[rows[1:]]) * 10)
+    
+    def test_frame_gaps(self):
+        """Short gaps divide by the elapsed time, long gaps add no distance"""
+        frames = np.array([0, 1, 4, 5, 50, 51])
+        positions = np.array([[0, 0], [1, 0], [4, 0], [5, 0], [100, 0], [101, 0]], dtype=float)
+        calculator = SpeedCalculator(fps=1, window_size=1, max_gap=10)
+        
+        speed, distance, _ = calculator.track_kinematics(np.ones(6), frames, positions)
+        
+        assert speed.tolist() == [0, 1, 1, 1, 0, 1]
+        assert distance.tolist() == [0, 1, 4, 5, 5, 6]
+    
+    def test_savgol_tracks_constant_acceleration(self):
+        """Savitzky-Golay smoothing keeps a linear speed ramp unbiased"""
+        frames = np.arange(30)
+        positions = np.column_stack([0.5 * 0.1 * frames ** 2, np.zeros(30)])
+        calculator = SpeedCalculator(fps=1, window_size=7, smoothing='savgol')
+        
+        speed, _, acceleration = calculator.track_kinematics(np.zeros(30), frames, positions)
+        
+        assert np.allclose(speed[4:-3], 0.1 * frames[4:-3] - 0.05)
+        assert np.allclose(acceleration[5:-3], 0.1)
+    
+    def test_legacy_tracks_accept_fps(self):
+        """The dictionary API takes the fps keyword used by the pipeline"""
+        tracks = {'players': [
+            {1: {'position_transformed': [0.0, 0.0]}},
+            {1: {'position_transformed': [1.0, 0.0]}},
+            {1: {'position': None}}
+        ]}
+        
+        SpeedAndDistanceEstimator(fps=30, window_size=1).add_speed_and_distance_to_tracks(tracks, fps=10)
+        
+        assert tracks['players'][1][1]['speed'] == pytest.approx(10.0)
+        assert tracks['players'][1][1]['speed_kmh'] == pytest.approx(36.0)
+        assert tracks['players'][2][1]['distance_covered'] == pytest.approx(1.0)
@@ -0,0 +1,73 @@
+"""
+Tests for team assignment by running colour votes
+"""
+
+import numpy as np
+from team_assigner.team_assigner import TeamAssigner
+
+
+RED = (40, 40, 200)
+BLUE = (200, 60, 30)
+
+
+def _frame(jerseys):
+    """Frame with a solid jersey colour per 40 px wide column"""
+    frame = np.full((200, 40 * len(jerseys), 3), 120, dtype=np.uint8)
+    for idx, color in enumerate(jerseys):
+        frame[:, 40 * idx:40 * (idx + 1)] = color
+    return frame
+
+
+def _bboxes(count):
+    """Player bboxes over the columns of _frame"""
+    return [[40 * idx + 5, 10, 40 * idx + 35, 190] for idx in range(count)]
+
+
+def _fitted_assigner(max_votes=25):
+    """Assigner fitted on two red and two blue players"""
+    assigner = TeamAssigner(max_votes=max_votes)
+    assigner.assign_team_color(_frame([RED, RED, BLUE, BLUE]), {i: {'bbox': b} for i, b in enumerate(_bboxes(4))})
+    return assigner
+
+
+class TestTeamAssigner:
+    """Test the per-track vote and freezing behaviour"""
+    
+    def test_majority_vote_resists_bad_frames(self):
+        """A track keeps its team through a few frames of the other colour"""
+        assigner = _fitted_assigner()
+        red_team = assigner.update_votes([7], assigner.extract_player_colors(_frame([RED]), _bboxes(1), [7]))[0]
+        
+        for color in [RED] * 4 + [BLUE] * 3:
+            colors = assigner.extract_player_colors(_frame([color]), _bboxes(1), [7])
+            teams = assigner.update_votes([7], colors)
+        
+        assert teams == [red_team]
+        assert assigner.team_votes[7][red_team] == 5 and assigner.team_votes[7].sum() == 8
+        
+        # Enough frames of the other colour do flip it
+        for _ in range(3):
+            teams = assigner.update_votes([7], assigner.extract_player_colors(_frame([BLUE]), _bboxes(1), [7]))
+        assert teams == [3 - red_team]
+    
+    def test_unusable_colours_do_not_vote(self):
+        """Tracks without a usable colour default to team 1 and get no votes"""
+        assigner = _fitted_assigner()
+        colors = np.array([[np.nan] * 3, assigner.extract_player_colors(_frame([BLUE]), _bboxes(1), [2])[0]])
+        
+        teams = assigner.update_votes([1, 2], colors)
+        
+        assert teams[0] == 1 and 1 not in assigner.team_votes
+        assert assigner.team_votes[2].sum() == 1
+    
+    def test_frozen_tracks_skip_extraction(self):
+        """After max_votes a track's colour is no longer extracted and its team is stable"""
+        assigner = _fitted_assigner(max_votes=3)
+        for _ in range(3):
+            team = assigner.update_votes([5], assigner.extract_player_colors(_frame([RED]), _bboxes(1), [5]))[0]
+        
+        colors = assigner.extract_player_colors(_frame([BLUE, BLUE]), _bboxes(2), [5, 6])
+        
+        assert np.isnan(colors[0]).all() and not np.isnan(colors[1]).any()
+        assert assigner.update_votes([5, 6], colors) == [team, 3 - team]
+        assert assigner.team_votes[5].sum() == 3
@@ -0,0 +1,83 @@
+"""
+Tests for the columnar track table
+"""
+
+import numpy as np
+import pytest
+from utils.track_table import TrackTable
+from speed_and_distance_estimator import SpeedAndDistanceEstimator
+
+
+def _tracks():
+    """Two frames of players, ball and referees in the legacy layout"""
+    return {
+        'players': [
+            {7: {'bbox': [10, 10, 30, 50], 'team': 1, 'jersey_number': 7, 'original_track_id': 3},
+             1004: {'bbox': [100, 20, 120, 60], 'team': 2, 'jersey_number': None, 'original_track_id': 4}},
+            {7: {'bbox': [14, 13, 34, 53], 'team': 1, 'jersey_number': 7, 'original_track_id': 3}}
+        ],
+        'ball': [{1: {'bbox': [50, 50, 54, 54]}}, {}],
+        'referees': [{}, {2: {'bbox': [200, 0, 220, 40]}}]
+    }
+
+
+class TestTrackTable:
+    """Test TrackTable construction and views"""
+
+    def test_from_tracks_round_trip(self):
+        """Converting to the table and back keeps every detection"""
+        table = TrackTable.from_tracks(_tracks())
+        tracks = table.to_tracks()
+
+        assert len(table) == 5
+        assert table.num_frames == 2
+        assert tracks['players'][0][7]['bbox'] == [10, 10, 30, 50]
+        assert tracks['players'][0][7]['position'] == [20, 50]
+        assert tracks['players'][0][1004]['jersey_number'] is None
+        assert tracks['players'][0][1004]['team'] == 2
+        assert tracks['ball'][0][1]['position'] == [52, 52]
+        assert tracks['ball'][1] == {}
+        assert list(tracks['referees'][1]) == [2]
+
+    def test_concat_uses_frame_offset(self):
+        """Chunk tables concatenate on global frame numbers"""
+        first = TrackTable.from_tracks(_tracks(), frame_offset=0)
+        second = TrackTable.from_tracks(_tracks(), frame_offset=2)
+        table = TrackTable.concat([second, first])
+
+        assert table.num_frames == 4
+        assert np.all(np.diff(table['frame']) >= 0)
+        assert list(table['track_id'][table.frame_rows(2, 'players')]) == [7, 1004]
+        assert len(table.frame_rows(3, 'ball')) == 0
+
+    def test_track_index(self):
+        """Per-track rows are returned in frame order"""
+        table = TrackTable.from_tracks(_tracks())
+        index = table.track_index('players')
+
+        assert set(index) == {7, 1004}
+        assert list(table['frame'][index[7]]) == [0, 1]
+
+    def test_legacy_view_matches_materialized_tracks(self):
+        """The lazy view returns the same dictionaries as to_tracks"""
+        table = TrackTable.from_tracks(_tracks())
+        view = table.legacy_view()
+        tracks = table.to_tracks()
+
+        assert len(view['players']) == 2
+        assert view['players'][-1] == tracks['players'][1]
+        assert view.get('ball')[0] == tracks['ball'][0]
+        with pytest.raises(IndexError):
+            view['players'][2]
+
+    def test_speed_and_distance(self):
+        """Speeds and cumulative distance are written per track"""
+        table = TrackTable.from_tracks(_tracks())
+        table['position_transformed'][:] = table['position']
+
+        SpeedAndDistanceEstimator(fps=10).add_speed_and_distance_to_table(table)
+
+        rows = table.track_index('players')[7]
+        assert table['distance'][rows[0]] == 0
+        assert table['distance'][rows[1]] == pytest.approx(5.0)
+        assert table['speed'][rows[1]] == pytest.approx(50.0)
@@ -0,0 +1,61 @@
+"""
+Tests for video utilities
+"""
+
+import pytest
+import numpy as np
+from utils.video_utils import iter_video_chunks, VideoChunkWriter, read_video
+
+
+def _make_frames(count, height=48, width=64):
+    """Create frames with distinct brightness so order can be checked"""
+    return [np.full((height, width, 3), i * 10, dtype=np.uint8) for i in range(count)]
+
+
+class TestVideoStreaming:
+    """Test streaming frame source and incremental writer"""
+    
+    def test_chunks_cover_video_in_order(self, tmp_path):
+        """Chunks are bounded by chunk_size and cover every frame once"""
+        video_path = str(tmp_path / "clip.mp4")
+        with VideoChunkWriter(video_path, fps=10) as writer:
+            writer.write(_make_frames(7))
+        
+        chunks = list(iter_video_chunks(video_path, chunk_size=3))
+        
+        assert [start for start, _ in chunks] == [0, 3, 6]
+        assert [len(frames) for _, frames in chunks] == [3, 3, 1]
+        assert sum(len(frames) for _, frames in chunks) == len(read_video(video_path))
+    
+    def test_chunks_resume_from_start_frame(self, tmp_path):
+        """Streaming can start part-way through the video"""
+        video_path = str(tmp_path / "clip.mp4")
+        with VideoChunkWriter(video_path, fps=10) as writer:
+            writer.write(_make_frames(7))
+        
+        chunks = list(iter_video_chunks(video_path, chunk_size=3, start_frame=3))
+        full = read_video(video_path)
+        
+        assert [start for start, _ in chunks] == [3, 6]
+        assert np.array_equal(chunks[0][1][0], full[3])
+    
+    def test_writer_counts_frames(self, tmp_path):
+        """Writer appends frames across multiple write calls"""
+        video_path = str(tmp_path / "clip.mp4")
+        writer = VideoChunkWriter(video_path, fps=10)
+        writer.write(_make_frames(2))
+        writer.write(_make_frames(3))
+        writer.release()
+        
+        assert writer.frames_written == 5
+        assert len(read_video(video_path)) == 5
+    
+    def test_invalid_chunk_size(self, tmp_path):
+        """Chunk size must be positive"""
+        with pytest.raises(ValueError):
+            list(iter_video_chunks(str(tmp_path / "missing.mp4"), chunk_size=0))
+    
+    def test_missing_video(self, tmp_path):
+        """Unreadable videos raise instead of yielding nothing"""
+        with pytest.raises(IOError):
+            list(iter_video_chunks(str(tmp_path / "missing.mp4"), chunk_size=5))
@@ -0,0 +1,52 @@
+"""
+Tests for the perspective view transformer
+"""
+
+import cv2
+import numpy as np
+from view_transformer import ViewTransformer
+from utils.field_mask import points_in_polygon
+
+
+VERTICES = [[100, 1000], [250, 280], [900, 275], [1600, 920]]
+
+
+class TestViewTransformer:
+    """Test bulk perspective transformation"""
+    
+    def test_points_in_polygon_matches_opencv(self):
+        """Vectorized polygon test agrees with cv2.pointPolygonTest"""
+        polygon = np.array(VERTICES, dtype=np.float32)
+        rng = np.random.default_rng(0)
+        points = np.concatenate([rng.integers(0, 1800, (2000, 2)), VERTICES])
+        
+        expected = [cv2.pointPolygonTest(polygon, (int(x), int(y)), False) >= 0 for x, y in points]
+        
+        assert np.array_equal(points_in_polygon(points, polygon), expected)
+    
+    def test_transform_points_matches_single_point(self):
+        """Bulk transform equals per-point transform, NaN outside the field"""
+        transformer = ViewTransformer(pixel_vertices=VERTICES)
+        points = np.array([[500, 600], [0, 0], [250, 280], [1200, 800]], dtype=np.float32)
+        
+        transformed = transformer.transform_points(points)
+        
+        for point, result in zip(points, transformed):
+            single = transformer.transform_point(point)
+            if single is None:
+                assert np.isnan(result).all()
+            else:
+                assert np.allclose(result, single)
+        assert np.allclose(transformer.transform_points([[100, 1000]]), [[0, 0]], atol=1e-3)
+    
+    def test_per_frame_homographies(self):
+        """Points are mapped to the reference frame before transforming"""
+        transformer = ViewTransformer(pixel_vertices=VERTICES)
+        shifted = np.eye(3, dtype=np.float32)
+        shifted[:2, 2] = [-50, 20]  # camera panned: frame pixel -> reference pixel
+        points = np.array([[500, 600], [550, 580]], dtype=np.float32)
+        
+        transformed = transformer.transform_points_per_frame(points, np.stack([np.eye(3), shifted]))
+        
+        assert np.allclose(transformed[0], transformer.transform_point([500, 600]))
+        assert np.allclose(transformed[1], transformer.transform_point([500, 600]))
@@ -14,9 +14,10 @@ from . import speed_calculator
 from . import frame_quality
 from . import color_utils
 from . import logger
+from . import track_table
 
 # Export commonly used functions
-from .video_utils import read_video, save_video, save_video_frames
+from .video_utils import read_video, save_video, save_video_frames, iter_video_chunks, VideoChunkWriter
 from .bbox_utils import (
     get_center_of_bbox,
     get_bbox_width,
@@ -25,6 +26,7 @@ from .bbox_utils import (
     measure_xy_distance
 )
 from .logger import get_logger, SportsAnalyticsLogger
+from .track_table import TrackTable
 
 __all__ = [
     'video_utils',
@@ -42,15 +44,19 @@ __all__ = [
     'frame_quality',
     'color_utils',
     'logger',
+    'track_table',
     # Direct function exports
     'read_video',
     'save_video',
     'save_video_frames',
+    'iter_video_chunks',
+    'VideoChunkWriter',
     'get_center_of_bbox',
     'get_bbox_width',
     'get_foot_position',
     'measure_distance',
     'measure_xy_distance',
     'get_logger',
-    'SportsAnalyticsLogger'
+    'SportsAnalyticsLogger',
+    'TrackTable'
 ]
@@ -148,7 +148,7 @@ class AnnotationDrawer:
             (0, 0, 0), 2
         )
     
-    def draw_annotations(self, video_frames, tracks, team_ball_control):
+    def draw_annotations(self, video_frames, tracks, team_ball_control, frame_offset=0):
         """
         Draw all annotations on video frames
         
@@ -156,13 +156,17 @@ class AnnotationDrawer:
             video_frames: List of video frames
             tracks: Dictionary of tracks
             team_ball_control: Array of team possession per frame
+            frame_offset: Index of the first frame in video_frames within tracks
+                          (for drawing a streamed window of the video)
             
         Returns:
             List of annotated frames
         """
         output_frames = []
+        team_ball_control = np.asarray(team_ball_control)
         
-        for frame_num, frame in enumerate(video_frames):
+        for window_idx, frame in enumerate(video_frames):
+            frame_num = frame_offset + window_idx
             frame = frame.copy()
             
             # Draw players
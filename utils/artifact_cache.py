@@ -0,0 +1,158 @@
+"""
+Artifact Cache Module
+Content-addressed cache for intermediate pipeline results
+
+Each artifact is stored under a key hashed from everything it depends on:
+a fingerprint of the input video, the model weights, the stage parameters
+and the keys of the upstream artifacts it was computed from. Changing any
+of them changes the key, so stale results are never returned, and changing
+a downstream-only parameter keeps every upstream artifact valid.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+
+# Bytes hashed from each sampled block of a large file
+_SAMPLE_BLOCK_SIZE = 1 << 20
+_SAMPLE_BLOCKS = 16
+
+# Entry of the .npz file holding JSON metadata
+_META_KEY = '__meta__'
+
+
+class ArtifactCache:
+    """
+    Stores stage artifacts as compressed .npz files under cache_dir/stage/key.npz
+
+    Artifacts are dictionaries of NumPy arrays plus optional JSON-serializable
+    metadata. Writes are atomic, so an interrupted run never leaves a
+    truncated artifact behind.
+    """
+
+    def __init__(self, cache_dir, enabled=True):
+        """
+        Initialize artifact cache
+
+        Args:
+            cache_dir: Root directory of the cache
+            enabled: When False, load() always misses and save() is a no-op
+        """
+        self.cache_dir = str(cache_dir)
+        self.enabled = enabled
+        self._fingerprints = {}
+
+    def fingerprint_file(self, path, full=False):
+        """
+        Content fingerprint of a file
+
+        Large videos are fingerprinted from their size and evenly spaced
+        sampled blocks; model weights are hashed in full.
+
+        Args:
+            path: File path
+            full: Hash the whole file instead of sampled blocks
+
+        Returns:
+            Hex digest
+        """
+        path = os.path.abspath(str(path))
+        stat = os.stat(path)
+        memo_key = (path, stat.st_size, stat.st_mtime_ns, full)
+        if memo_key in self._fingerprints:
+            return self._fingerprints[memo_key]
+
+        digest = hashlib.sha256(str(stat.st_size).encode())
+
+        with open(path, 'rb') as f:
+            if full or stat.st_size <= _SAMPLE_BLOCK_SIZE * _SAMPLE_BLOCKS:
+                for block in iter(lambda: f.read(_SAMPLE_BLOCK_SIZE), b''):
+                    digest.update(block)
+            else:
+                step = (stat.st_size - _SAMPLE_BLOCK_SIZE) // (_SAMPLE_BLOCKS - 1)
+                for idx in range(_SAMPLE_BLOCKS):
+                    f.seek(idx * step)
+                    digest.update(f.read(_SAMPLE_BLOCK_SIZE))
+
+        fingerprint = digest.hexdigest()
+        self._fingerprints[memo_key] = fingerprint
+        return fingerprint
+
+    @staticmethod
+    def make_key(stage, params, upstream=()):
+        """
+        Build the key of an artifact
+
+        Args:
+            stage: Stage name
+            params: JSON-serializable dictionary of everything the stage
+                    depends on directly (fingerprints, settings)
+            upstream: Keys of the artifacts the stage consumes
+
+        Returns:
+            Hex digest
+        """
+        payload = json.dumps(
+            {'stage': stage, 'params': params, 'upstream': list(upstream)},
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, stage, key):
+        """Path of an artifact file"""
+        return os.path.join(self.cache_dir, stage, f"{key}.npz")
+
+    def load(self, stage, key):
+        """
+        Load an artifact
+
+        Args:
+            stage: Stage name
+            key: Artifact key
+
+        Returns:
+            Tuple (arrays dict, metadata dict) or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        path = self._path(stage, key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files if name != _META_KEY}
+                meta = json.loads(str(data[_META_KEY])) if _META_KEY in data.files else {}
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Ignoring unreadable cache artifact {path}: {e}")
+            return None
+
+        return arrays, meta
+
+    def save(self, stage, key, arrays, meta=None):
+        """
+        Store an artifact (atomically replaces an existing one)
+
+        Args:
+            stage: Stage name
+            key: Artifact key
+            arrays: Dictionary {name: array}
+            meta: Optional JSON-serializable metadata
+        """
+        if not self.enabled:
+            return
+
+        path = self._path(stage, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        contents = {name: np.asarray(array) for name, array in arrays.items()}
+        contents[_META_KEY] = np.array(json.dumps(meta or {}, default=str))
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, **contents)
+        os.replace(tmp_path, path)
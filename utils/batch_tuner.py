@@ -0,0 +1,206 @@
+"""
+Batch Tuner Module
+Picks and adapts the YOLO inference batch size at run time
+
+The fastest batch size depends on resolution, model size, core count and
+free memory, so it is measured instead of configured: the first batches of
+the run are inferred at each candidate size in turn (real frames, no
+throw-away work) and the size with the highest frames/sec whose process
+RSS stayed under the memory ceiling is kept. Afterwards the tuner steps
+down when RSS approaches the ceiling and re-probes the neighbouring sizes
+when throughput drops.
+"""
+
+from collections import deque
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+    print("⚠️  psutil not installed. Batch tuning runs without a memory ceiling.")
+
+
+def _process_rss():
+    """Resident set size of this process in bytes (None without psutil)"""
+    if not PSUTIL_AVAILABLE:
+        return None
+    return psutil.Process().memory_info().rss
+
+
+class BatchSizeTuner:
+    """
+    Throughput-probing batch size selection under a memory ceiling
+
+    Call batch_size for the size of the next batch and record() after
+    inferring it.
+    """
+
+    def __init__(self, candidates=(1, 2, 4, 8, 16, 32), memory_limit_mb=None,
+                 memory_fraction=0.8, memory_headroom=0.9, throughput_drop=0.2,
+                 window=10, warmup_batches=1):
+        """
+        Initialize batch tuner
+
+        Args:
+            candidates: Batch sizes to choose from
+            memory_limit_mb: Process RSS ceiling (default: current RSS plus
+                             memory_fraction of the available memory)
+            memory_fraction: Share of available memory the ceiling allows
+            memory_headroom: Fraction of the ceiling treated as reached
+            throughput_drop: Relative frames/sec drop (vs. the probed
+                             value) that triggers a re-probe
+            window: Batches averaged before comparing throughput
+            warmup_batches: First batches not measured (model warm-up)
+        """
+        self.candidates = sorted(set(int(size) for size in candidates))
+        self.memory_headroom = memory_headroom
+        self.throughput_drop = throughput_drop
+        self.window = window
+        self.warmup_batches = warmup_batches
+
+        if memory_limit_mb is not None:
+            self.memory_limit = memory_limit_mb * 1024 * 1024
+        elif PSUTIL_AVAILABLE:
+            self.memory_limit = _process_rss() + memory_fraction * psutil.virtual_memory().available
+        else:
+            self.memory_limit = None
+
+        # Largest size that stayed under the ceiling
+        self.max_size = self.candidates[-1]
+
+        # Probe state
+        self.probe_queue = list(self.candidates)
+        self.probe_fps = {}
+        self.batch_size = self.candidates[0]
+
+        # Run-time state
+        self.reference_fps = None
+        self.recent_fps = deque(maxlen=window)
+
+        self.adjustments = []
+
+    @property
+    def probing(self):
+        """Whether candidate sizes are still being measured"""
+        return bool(self.probe_queue)
+
+    def record(self, batch_size, num_frames, seconds):
+        """
+        Record an inferred batch and decide the next batch size
+
+        Args:
+            batch_size: Batch size that was requested
+            num_frames: Frames actually inferred (fewer for the last batch
+                        of a chunk, which is not measured)
+            seconds: Inference time
+        """
+        if self._memory_exceeded():
+            self._reduce(batch_size)
+            return
+
+        if self.warmup_batches > 0:
+            self.warmup_batches -= 1
+            return
+        if num_frames < batch_size or seconds <= 0:
+            return
+
+        fps = num_frames / seconds
+
+        if self.probing:
+            self._record_probe(batch_size, fps)
+            return
+
+        self.recent_fps.append(fps)
+        if len(self.recent_fps) == self.window and self.reference_fps:
+            mean_fps = sum(self.recent_fps) / len(self.recent_fps)
+            if mean_fps < (1 - self.throughput_drop) * self.reference_fps:
+                self._reprobe(f"throughput dropped to {mean_fps:.1f} fps "
+                              f"(probed {self.reference_fps:.1f} fps)")
+
+    def _memory_exceeded(self):
+        """Whether process RSS is close to the memory ceiling"""
+        if self.memory_limit is None:
+            return False
+        rss = _process_rss()
+        return rss is not None and rss >= self.memory_headroom * self.memory_limit
+
+    def _record_probe(self, batch_size, fps):
+        """Store a probe measurement and move to the next candidate"""
+        if self.probe_queue and self.probe_queue[0] == batch_size:
+            self.probe_queue.pop(0)
+        self.probe_fps[batch_size] = fps
+
+        # Larger batches rarely recover once throughput falls clearly
+        # below the best size measured so far
+        best_fps = max(self.probe_fps.values())
+        if fps < (1 - self.throughput_drop) * best_fps:
+            self.probe_queue = [size for size in self.probe_queue if size < batch_size]
+
+        if self.probe_queue:
+            self.batch_size = self.probe_queue[0]
+        else:
+            self._choose()
+
+    def _choose(self):
+        """Select the fastest probed size under the ceiling"""
+        allowed = {size: fps for size, fps in self.probe_fps.items() if size <= self.max_size}
+        if not allowed:
+            self.batch_size = self.candidates[0]
+            return
+
+        previous = self.batch_size
+        self.batch_size = max(allowed, key=allowed.get)
+        self.reference_fps = allowed[self.batch_size]
+        self.recent_fps.clear()
+
+        measured = ', '.join(f"{size}: {fps:.1f}" for size, fps in sorted(allowed.items()))
+        self.adjustments.append(('probe', previous, self.batch_size, self.reference_fps))
+        print(f"✓ YOLO batch size {self.batch_size} ({self.reference_fps:.1f} fps; probed fps {measured})")
+
+    def _reduce(self, batch_size):
+        """Step down below a batch size that brought RSS near the ceiling"""
+        smaller = [size for size in self.candidates if size < batch_size]
+        self.max_size = smaller[-1] if smaller else self.candidates[0]
+        self.probe_queue = [size for size in self.probe_queue if size <= self.max_size]
+        self.probe_fps = {size: fps for size, fps in self.probe_fps.items() if size <= self.max_size}
+
+        previous = self.batch_size
+        if self.probing:
+            self.batch_size = self.probe_queue[0]
+        elif self.reference_fps is None and self.probe_fps:
+            self._choose()
+        else:
+            self.batch_size = min(self.batch_size, self.max_size)
+            self.reference_fps = self.probe_fps.get(self.batch_size, self.reference_fps)
+            self.recent_fps.clear()
+
+        if self.batch_size != previous:
+            self.adjustments.append(('memory', previous, self.batch_size, self.reference_fps))
+            print(f"⚠️  Process memory near the ceiling, YOLO batch size {previous} -> {self.batch_size}")
+
+    def _reprobe(self, reason):
+        """Measure the current size and its neighbours again"""
+        idx = self.candidates.index(self.batch_size)
+        neighbours = self.candidates[max(0, idx - 1):idx + 2]
+        self.probe_queue = [size for size in neighbours if size <= self.max_size]
+        self.probe_fps = {}
+        self.recent_fps.clear()
+        self.batch_size = self.probe_queue[0]
+        print(f"⚠️  {reason}, re-probing YOLO batch sizes {self.probe_queue}")
+
+    def get_stats(self):
+        """
+        Get tuning results
+
+        Returns:
+            Dictionary with the current batch size, its probed frames/sec,
+            the last probe measurements and the adjustments made as
+            (reason, old size, new size, fps)
+        """
+        return {
+            'batch_size': self.batch_size,
+            'fps': self.reference_fps,
+            'probed_fps': dict(self.probe_fps),
+            'adjustments': list(self.adjustments)
+        }
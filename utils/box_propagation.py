@@ -0,0 +1,127 @@
+"""
+Box Propagation Module
+Carries detection boxes between keyframes with sparse optical flow
+
+Used by keyframe-stride detection: the detector only runs on keyframes and
+every box of the previous frame is moved by the median Lucas-Kanade flow of
+a grid of points inside it, so the tracker still receives a box per object
+on every frame.
+"""
+
+import cv2
+import numpy as np
+
+
+def frame_difference(prev_gray, gray, scale=0.25):
+    """
+    Mean absolute grey-level difference of two frames (0-255)
+
+    Computed on downscaled frames; large values indicate fast motion or a
+    scene change.
+
+    Args:
+        prev_gray: Previous grey frame
+        gray: Current grey frame
+        scale: Downscale factor applied before differencing
+
+    Returns:
+        Mean absolute difference
+    """
+    size = (max(1, int(gray.shape[1] * scale)), max(1, int(gray.shape[0] * scale)))
+    prev_small = cv2.resize(prev_gray, size, interpolation=cv2.INTER_AREA)
+    small = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+    return float(cv2.absdiff(prev_small, small).mean())
+
+
+class BoxPropagator:
+    """
+    Moves bounding boxes from one frame to the next with sparse optical flow
+
+    Each box is tracked through a grid of points with forward-backward
+    checked Lucas-Kanade flow and shifted by the median displacement of the
+    reliable points. Boxes with too few reliable points (flat, occluded)
+    are shifted by the median displacement of all reliable points of the
+    frame instead and reported as unreliable.
+    """
+
+    def __init__(self, grid_size=3, min_points=3, max_fb_error=1.0):
+        """
+        Initialize box propagator
+
+        Args:
+            grid_size: Points per box side (grid_size x grid_size per box)
+            min_points: Reliable points needed to follow a box by its own flow
+            max_fb_error: Maximum forward-backward flow error (pixels) of a
+                          reliable point
+        """
+        self.grid_size = grid_size
+        self.min_points = min_points
+        self.max_fb_error = max_fb_error
+
+        self.lk_params = {
+            'winSize': (15, 15),
+            'maxLevel': 3,
+            'criteria': (cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03)
+        }
+
+    def _grid_points(self, xyxy):
+        """
+        Grid of points inside every box (inner part, away from the border)
+
+        Args:
+            xyxy: Array of shape (N, 4)
+
+        Returns:
+            Array of shape (N * grid_size^2, 1, 2) float32
+        """
+        steps = (np.arange(self.grid_size) + 1) / (self.grid_size + 1)
+        fx, fy = np.meshgrid(steps, steps)
+        fx, fy = fx.ravel(), fy.ravel()
+
+        x = xyxy[:, [0]] + (xyxy[:, [2]] - xyxy[:, [0]]) * fx
+        y = xyxy[:, [1]] + (xyxy[:, [3]] - xyxy[:, [1]]) * fy
+
+        return np.stack([x, y], axis=-1).reshape(-1, 1, 2).astype(np.float32)
+
+    def propagate(self, prev_gray, gray, xyxy):
+        """
+        Move boxes from prev_gray to gray
+
+        Args:
+            prev_gray: Grey frame the boxes belong to
+            gray: Next grey frame
+            xyxy: Array of shape (N, 4)
+
+        Returns:
+            Tuple (moved boxes (N, 4), boolean array (N,) of boxes followed
+            by their own flow)
+        """
+        xyxy = np.asarray(xyxy, dtype=np.float32).reshape(-1, 4)
+        if len(xyxy) == 0:
+            return xyxy, np.zeros(0, dtype=bool)
+
+        points = self._grid_points(xyxy)
+
+        forward, status, _ = cv2.calcOpticalFlowPyrLK(prev_gray, gray, points, None, **self.lk_params)
+        backward, back_status, _ = cv2.calcOpticalFlowPyrLK(gray, prev_gray, forward, None, **self.lk_params)
+
+        fb_error = np.linalg.norm((backward - points).reshape(-1, 2), axis=1)
+        reliable = (status.ravel() == 1) & (back_status.ravel() == 1) & (fb_error <= self.max_fb_error)
+
+        points_per_box = self.grid_size ** 2
+        displacement = (forward - points).reshape(len(xyxy), points_per_box, 2)
+        reliable = reliable.reshape(len(xyxy), points_per_box)
+
+        # Median displacement of the reliable points of each box, falling
+        # back to the median of every reliable point of the frame
+        shift = np.zeros((len(xyxy), 2), dtype=np.float32)
+        if reliable.any():
+            shift[:] = np.median(displacement[reliable], axis=0)
+
+        followed = reliable.sum(axis=1) >= self.min_points
+        if followed.any():
+            masked = np.where(reliable[..., None], displacement, np.nan)
+            shift[followed] = np.nanmedian(masked[followed], axis=1)
+
+        moved = xyxy + np.tile(shift, 2)
+        return moved, followed
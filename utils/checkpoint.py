@@ -0,0 +1,146 @@
+"""
+Checkpoint Module
+Crash-safe per-chunk checkpoints of the streaming tracking pass
+
+After every completed chunk the chunk's results (tracks, packed detections
+and camera movement) are written to their own file, then a single state
+file recording the carry-over state of the stateful components (tracker,
+jersey history, camera estimator) and the list of completed chunks is
+atomically replaced. Per-frame results live only in the chunk files, so the
+state file does not grow with the video. A crash at any point leaves the
+last complete chunk recoverable.
+"""
+
+import os
+import pickle
+import shutil
+
+import numpy as np
+
+
+# Prefixes of packed detection and camera arrays inside chunk files
+_DETECTION_PREFIX = 'det_'
+_CAMERA_PREFIX = 'cam_'
+
+_STATE_FILE = 'state.pkl'
+
+
+def _atomic_write(path, write):
+    """Write a file through a temporary file and rename it into place"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class ChunkCheckpoint:
+    """
+    Stores the results of completed chunks and the pipeline state after them
+
+    Chunk results are dictionaries of arrays (TrackTable columns, packed
+    detections, camera movement); the state is any picklable dictionary.
+    """
+
+    def __init__(self, checkpoint_dir):
+        """
+        Initialize checkpoint
+
+        Args:
+            checkpoint_dir: Directory of this run's checkpoint
+        """
+        self.checkpoint_dir = str(checkpoint_dir)
+        self._chunk_files = []
+
+    @property
+    def state_path(self):
+        """Path of the state file"""
+        return os.path.join(self.checkpoint_dir, _STATE_FILE)
+
+    def exists(self):
+        """Whether a checkpoint with at least one complete chunk exists"""
+        return os.path.exists(self.state_path)
+
+    def save(self, next_frame, state, columns, detections=None, camera=None):
+        """
+        Record a completed chunk
+
+        Args:
+            next_frame: Global index of the first frame not yet processed
+            state: Picklable dictionary of pipeline state after the chunk
+            columns: Dictionary of arrays with the chunk's results
+            detections: Optional dictionary of the chunk's packed detections
+            camera: Optional dictionary of the chunk's camera arrays
+                    (movement, homographies)
+        """
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+
+        arrays = dict(columns)
+        for name, array in (detections or {}).items():
+            arrays[_DETECTION_PREFIX + name] = array
+        for name, array in (camera or {}).items():
+            arrays[_CAMERA_PREFIX + name] = array
+
+        chunk_file = f"chunk_{next_frame:09d}.npz"
+        _atomic_write(
+            os.path.join(self.checkpoint_dir, chunk_file),
+            lambda f: np.savez(f, **arrays)
+        )
+        self._chunk_files.append(chunk_file)
+
+        # The state file is replaced last, so it only ever lists chunk
+        # files that were completely written
+        payload = {
+            'next_frame': next_frame,
+            'chunk_files': list(self._chunk_files),
+            'state': state
+        }
+        _atomic_write(
+            self.state_path,
+            lambda f: pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        )
+
+    def load(self):
+        """
+        Load the last complete checkpoint
+
+        Returns:
+            Tuple (next_frame, state, list of chunk column dictionaries,
+            list of chunk detection dictionaries, list of chunk camera
+            dictionaries) or None if there is no readable checkpoint
+        """
+        if not self.exists():
+            return None
+
+        try:
+            with open(self.state_path, 'rb') as f:
+                payload = pickle.load(f)
+
+            chunks, detections, camera = [], [], []
+            for chunk_file in payload['chunk_files']:
+                with np.load(os.path.join(self.checkpoint_dir, chunk_file)) as data:
+                    chunks.append({
+                        name: data[name] for name in data.files
+                        if not name.startswith((_DETECTION_PREFIX, _CAMERA_PREFIX))
+                    })
+                    detections.append({
+                        name[len(_DETECTION_PREFIX):]: data[name] for name in data.files
+                        if name.startswith(_DETECTION_PREFIX)
+                    })
+                    camera.append({
+                        name[len(_CAMERA_PREFIX):]: data[name] for name in data.files
+                        if name.startswith(_CAMERA_PREFIX)
+                    })
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError) as e:
+            print(f"⚠️  Ignoring unreadable checkpoint {self.checkpoint_dir}: {e}")
+            return None
+
+        self._chunk_files = list(payload['chunk_files'])
+        return payload['next_frame'], payload['state'], chunks, detections, camera
+
+    def clear(self):
+        """Delete the checkpoint"""
+        self._chunk_files = []
+        if os.path.isdir(self.checkpoint_dir):
+            shutil.rmtree(self.checkpoint_dir)
@@ -53,21 +53,30 @@ class ColorExtractor:
         pixels = image.reshape(-1, 3)
         
         # Remove extreme values (likely background or noise)
-        if self.use_lab:
-            mask = (pixels[:, 0] > 20) & (pixels[:, 0] < 235)
-        else:
-            mask = (pixels.sum(axis=1) > 30) & (pixels.sum(axis=1) < 700)
-        
-        pixels = pixels[mask]
+        pixels = pixels[self._valid_pixel_mask(pixels)]
         
         if len(pixels) < 10:
             return None
         
-        # Get dominant color using k-means
-        kmeans = KMeans(n_clusters=1, init='k-means++', n_init=1, random_state=42)
-        kmeans.fit(pixels)
+        # Dominant color is the mean of the remaining pixels
+        # (what a single-cluster k-means converges to, without the fit overhead)
+        return pixels.mean(axis=0)
+    
+    def _valid_pixel_mask(self, pixels):
+        """
+        Mask out extreme pixel values (likely background or noise)
+        
+        Args:
+            pixels: Array of pixels with colour channels in the last axis
+            
+        Returns:
+            Boolean mask with the shape of pixels minus the channel axis
+        """
+        if self.use_lab:
+            return (pixels[..., 0] > 20) & (pixels[..., 0] < 235)
         
-        return kmeans.cluster_centers_[0]
+        channel_sum = pixels.sum(axis=-1, dtype=np.int32)
+        return (channel_sum > 30) & (channel_sum < 700)
     
     def extract_jersey_color(self, frame, bbox):
         """
@@ -81,29 +90,52 @@ class ColorExtractor:
             Dominant jersey color or None
         """
         try:
-            x1, y1, x2, y2 = [int(v) for v in bbox]
-            h, w = frame.shape[:2]
-            x1, y1 = max(0, x1), max(0, y1)
-            x2, y2 = min(w, x2), min(h, y2)
-            
-            if x2 <= x1 or y2 <= y1:
-                return None
-            
-            # Extract player region
-            player_img = frame[y1:y2, x1:x2]
-            
-            # Focus on upper body (jersey region)
-            jersey_height = int((y2 - y1) * 0.5)  # Top 50% of bbox
-            jersey_img = player_img[0:jersey_height, :]
+            color = self.extract_jersey_colors(frame, [bbox])[0]
+        except Exception:
+            return None
+        
+        return None if np.isnan(color[0]) else color
+    
+    def extract_jersey_colors(self, frame, bboxes):
+        """
+        Extract jersey colors for all player bounding boxes of a frame at once
+        
+        Each jersey region (top 50% of the bbox) is cropped, converted to
+        LAB and reduced to its masked mean with numpy, so only the pixels
+        of the jerseys are touched.
+        
+        Args:
+            frame: Video frame
+            bboxes: Sequence of player bounding boxes [x1, y1, x2, y2]
             
-            if jersey_img.size == 0:
-                return None
+        Returns:
+            Array of shape (N, 3) with one color per bbox; rows are NaN where
+            the region is empty or has fewer than 10 valid pixels
+        """
+        colors = np.full((len(bboxes), 3), np.nan)
+        if len(bboxes) == 0:
+            return colors
+        
+        h, w = frame.shape[:2]
+        boxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4).astype(np.int64)
+        
+        # Clamp to frame and keep the top half of each bbox (jersey region)
+        x1 = np.clip(boxes[:, 0], 0, w)
+        y1 = np.clip(boxes[:, 1], 0, h)
+        x2 = np.clip(boxes[:, 2], 0, w)
+        y2 = np.clip(boxes[:, 3], 0, h)
+        y2 = y1 + ((y2 - y1) * 0.5).astype(np.int64)
+        
+        for idx in np.flatnonzero((x2 > x1) & (y2 > y1)):
+            region = frame[y1[idx]:y2[idx], x1[idx]:x2[idx]]
+            if self.use_lab:
+                region = cv2.cvtColor(region, cv2.COLOR_BGR2LAB)
             
-            # Extract dominant color
-            return self.extract_dominant_color(jersey_img)
+            mask = self._valid_pixel_mask(region)
+            if np.count_nonzero(mask) >= 10:
+                colors[idx] = region[mask].mean(axis=0)
         
-        except Exception:
-            return None
+        return colors
 
 
 class TeamColorClusterer:
@@ -170,6 +202,31 @@ class TeamColorClusterer:
         if self.kmeans is None:
             return None
         
-        team_id = self.kmeans.predict(player_color.reshape(1, -1))[0]
-        return team_id + 1  # Convert 0/1 to 1/2
+        return int(self.predict_teams(np.asarray(player_color).reshape(1, -1))[0])
+    
+    def predict_teams(self, player_colors):
+        """
+        Predict teams for many player colors with one distance computation
+        
+        Args:
+            player_colors: Array of shape (N, 3); NaN rows are left unassigned
+            
+        Returns:
+            Integer array with team number (1 or 2) per color, 0 where the
+            color is NaN or the model is not fitted
+        """
+        player_colors = np.asarray(player_colors, dtype=np.float64).reshape(-1, 3)
+        teams = np.zeros(len(player_colors), dtype=np.int64)
+        
+        if self.kmeans is None or len(player_colors) == 0:
+            return teams
+        
+        valid = ~np.isnan(player_colors).any(axis=1)
+        centers = self.kmeans.cluster_centers_
+        
+        # Squared distance of every color to both team centroids
+        distances = ((player_colors[valid, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        teams[valid] = distances.argmin(axis=1) + 1  # Convert 0/1 to 1/2
+        
+        return teams
 
@@ -0,0 +1,273 @@
+"""
+Detector Backend Module
+Loads the YOLO detector through PyTorch, ONNX Runtime or OpenVINO
+
+CPU-only nodes run the exported model much faster than PyTorch eager mode.
+The first load of a backend exports the weights next to the .pt file (with
+a dynamic input size, so ROI inference can change it per chunk) and later
+loads reuse the export. INT8 post-training quantization is calibrated on
+frames sampled evenly from the input videos.
+
+Every backend is returned as an ultralytics YOLO object, so callers keep
+using predict() and sv.Detections.from_ultralytics unchanged.
+"""
+
+import os
+from pathlib import Path
+
+import cv2
+import numpy as np
+import supervision as sv
+import yaml
+from ultralytics import YOLO
+
+try:
+    import onnxruntime
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+try:
+    import openvino
+    OPENVINO_AVAILABLE = True
+except ImportError:
+    OPENVINO_AVAILABLE = False
+
+
+BACKENDS = ('torch', 'onnx', 'openvino')
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv')
+
+
+def backend_available(backend):
+    """
+    Whether the runtime of a backend is installed
+
+    Args:
+        backend: One of BACKENDS
+
+    Returns:
+        True if models can be loaded with the backend
+    """
+    if backend == 'onnx':
+        return ONNXRUNTIME_AVAILABLE
+    if backend == 'openvino':
+        return OPENVINO_AVAILABLE
+    return backend == 'torch'
+
+
+def exported_model_path(model_path, backend, int8=False):
+    """
+    Path of a backend's export of the PyTorch weights
+
+    Follows the ultralytics export naming, next to the weights.
+
+    Args:
+        model_path: Path to the .pt weights
+        backend: One of BACKENDS
+        int8: Whether the export is INT8 quantized
+
+    Returns:
+        Path of the exported model (the weights themselves for torch)
+    """
+    model_path = Path(model_path)
+    if backend == 'torch':
+        return model_path
+    if backend == 'onnx':
+        suffix = '_int8.onnx' if int8 else '.onnx'
+        return model_path.with_name(f"{model_path.stem}{suffix}")
+    if backend == 'openvino':
+        suffix = '_int8_openvino_model' if int8 else '_openvino_model'
+        return model_path.with_name(f"{model_path.stem}{suffix}")
+    raise ValueError(f"Unknown detector backend '{backend}', expected one of {BACKENDS}")
+
+
+def sample_calibration_frames(video_paths, num_frames, output_dir):
+    """
+    Write frames sampled evenly across videos as calibration images
+
+    Args:
+        video_paths: List of video paths
+        num_frames: Total number of frames to sample
+        output_dir: Directory the JPEG images are written to
+
+    Returns:
+        List of written image paths
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    video_paths = list(video_paths)
+    if not video_paths or num_frames <= 0:
+        return []
+
+    per_video = np.diff(np.linspace(0, num_frames, len(video_paths) + 1).round().astype(int))
+
+    image_paths = []
+    for video_idx, (video_path, count) in enumerate(zip(video_paths, per_video)):
+        cap = cv2.VideoCapture(str(video_path))
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        if not cap.isOpened() or total <= 0 or count <= 0:
+            cap.release()
+            continue
+
+        for frame_idx in np.unique(np.linspace(0, total - 1, count).astype(int)):
+            cap.set(cv2.CAP_PROP_POS_FRAMES, int(frame_idx))
+            ret, frame = cap.read()
+            if not ret:
+                continue
+            image_path = os.path.join(output_dir, f"video{video_idx:03d}_frame{frame_idx:07d}.jpg")
+            cv2.imwrite(image_path, frame)
+            image_paths.append(image_path)
+        cap.release()
+
+    return image_paths
+
+
+def build_calibration_dataset(calibration_dir, class_names, video_dir, num_frames=64):
+    """
+    Create an image-only dataset for INT8 calibration
+
+    Args:
+        calibration_dir: Directory of the dataset (images/ and data.yaml)
+        class_names: Dictionary {class_id: name} of the model
+        video_dir: Directory with the videos to sample frames from
+        num_frames: Number of calibration frames
+
+    Returns:
+        Path of the dataset YAML file
+    """
+    calibration_dir = Path(calibration_dir)
+    image_dir = calibration_dir / "images"
+
+    video_paths = sorted(
+        path for path in Path(video_dir).iterdir()
+        if path.suffix.lower() in VIDEO_EXTENSIONS
+    ) if Path(video_dir).is_dir() else []
+
+    images = sample_calibration_frames(video_paths, num_frames, image_dir)
+    if not images:
+        raise FileNotFoundError(f"No calibration frames could be read from videos in {video_dir}")
+
+    yaml_path = calibration_dir / "data.yaml"
+    dataset = {
+        'path': str(calibration_dir.resolve()),
+        'train': 'images',
+        'val': 'images',
+        'names': {int(class_id): name for class_id, name in class_names.items()}
+    }
+    with open(yaml_path, 'w') as f:
+        yaml.safe_dump(dataset, f, sort_keys=False)
+
+    return yaml_path
+
+
+def export_detector(model_path, backend, int8=False, imgsz=640, calibration_data=None):
+    """
+    Export PyTorch weights for a backend
+
+    Args:
+        model_path: Path to the .pt weights
+        backend: 'onnx' or 'openvino'
+        int8: Quantize to INT8 (requires calibration_data)
+        imgsz: Export input size
+        calibration_data: Dataset YAML of the calibration frames
+
+    Returns:
+        Path of the exported model
+    """
+    if int8 and calibration_data is None:
+        raise ValueError("INT8 export requires calibration_data")
+
+    export_args = {'format': backend, 'imgsz': imgsz, 'dynamic': True}
+    if int8:
+        export_args.update({'int8': True, 'data': str(calibration_data)})
+
+    exported = YOLO(str(model_path)).export(**export_args)
+    return Path(exported)
+
+
+def load_detector(model_path, backend='torch', int8=False, imgsz=640,
+                  calibration_videos=None, calibration_frames=64):
+    """
+    Load the detection model through a backend, exporting it on first use
+
+    Args:
+        model_path: Path to the .pt weights
+        backend: One of BACKENDS
+        int8: Use an INT8 quantized export (onnx/openvino only)
+        imgsz: Export input size
+        calibration_videos: Directory with videos for INT8 calibration frames
+        calibration_frames: Number of INT8 calibration frames
+
+    Returns:
+        ultralytics YOLO model
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown detector backend '{backend}', expected one of {BACKENDS}")
+    if backend == 'torch':
+        if int8:
+            print("⚠️  INT8 quantization needs the onnx or openvino backend, using FP32 PyTorch")
+        return YOLO(str(model_path))
+    if not backend_available(backend):
+        package = 'onnxruntime' if backend == 'onnx' else 'openvino'
+        raise ImportError(f"Detector backend '{backend}' needs {package} (pip install {package})")
+
+    exported = exported_model_path(model_path, backend, int8)
+    if not exported.exists():
+        calibration_data = None
+        if int8:
+            if calibration_videos is None:
+                raise ValueError("INT8 export requires calibration_videos")
+            class_names = YOLO(str(model_path)).names
+            calibration_data = build_calibration_dataset(
+                Path(model_path).parent / f"{Path(model_path).stem}_calibration",
+                class_names, calibration_videos, calibration_frames
+            )
+        print(f"Exporting {Path(model_path).name} for {backend}{' (INT8)' if int8 else ''}...")
+        exported = export_detector(model_path, backend, int8, imgsz, calibration_data)
+        print(f"✓ Exported detector to {exported}")
+
+    return YOLO(str(exported), task='detect')
+
+
+def detection_agreement(reference, candidate, iou_threshold=0.5):
+    """
+    Agreement of a candidate backend's detections with reference detections
+
+    Detections match when they have the same class and IoU above the
+    threshold (greedy, highest IoU first).
+
+    Args:
+        reference: List of sv.Detections (baseline), one per frame
+        candidate: List of sv.Detections, one per frame
+        iou_threshold: Minimum IoU of a match
+
+    Returns:
+        Dictionary with matched count, precision, recall and mean IoU of
+        the matches
+    """
+    matched, reference_total, candidate_total, ious = 0, 0, 0, []
+
+    for ref, cand in zip(reference, candidate):
+        reference_total += len(ref)
+        candidate_total += len(cand)
+        if len(ref) == 0 or len(cand) == 0:
+            continue
+
+        iou = sv.box_iou_batch(ref.xyxy, cand.xyxy)
+        iou[ref.class_id[:, None] != cand.class_id[None, :]] = 0.0
+
+        while True:
+            row, col = np.unravel_index(np.argmax(iou), iou.shape)
+            if iou[row, col] < iou_threshold:
+                break
+            matched += 1
+            ious.append(float(iou[row, col]))
+            iou[row, :] = 0.0
+            iou[:, col] = 0.0
+
+    return {
+        'matched': matched,
+        'precision': matched / candidate_total if candidate_total else 1.0,
+        'recall': matched / reference_total if reference_total else 1.0,
+        'mean_iou': float(np.mean(ious)) if ious else 0.0
+    }
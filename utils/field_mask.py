@@ -1,6 +1,10 @@
 """
 Field Mask Module
 Handles field boundary detection and filtering
+
+Membership tests run vectorized over any number of points with the same
+result as cv2.pointPolygonTest; camera movement is handled by mapping the
+points back into the calibrated frame instead of moving the polygon.
 """
 
 import cv2
@@ -9,6 +13,45 @@ import json
 import os
 
 
+def points_in_polygon(points, polygon):
+    """
+    Vectorized point-in-polygon test (points on the boundary count as inside)
+    
+    Even-odd ray casting over the polygon edges, evaluated for all points
+    at once; same result as cv2.pointPolygonTest(...) >= 0 per point.
+    
+    Args:
+        points: Array of shape (N, 2)
+        polygon: Array of shape (M, 2) with the polygon vertices
+        
+    Returns:
+        Boolean array of shape (N,)
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    polygon = np.asarray(polygon, dtype=np.float64).reshape(-1, 2)
+    x, y = points[:, 0], points[:, 1]
+    
+    inside = np.zeros(len(points), dtype=bool)
+    on_edge = np.zeros(len(points), dtype=bool)
+    
+    for (x1, y1), (x2, y2) in zip(polygon, np.roll(polygon, -1, axis=0)):
+        # Ray to the right of the point crosses this edge
+        straddles = (y1 > y) != (y2 > y)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_cross = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+        inside ^= straddles & (x < x_cross)
+        
+        # Point lies on this edge
+        cross = (x2 - x1) * (y - y1) - (y2 - y1) * (x - x1)
+        on_edge |= (
+            (np.abs(cross) <= 1e-9 * max(abs(x2 - x1) + abs(y2 - y1), 1.0))
+            & (x >= min(x1, x2)) & (x <= max(x1, x2))
+            & (y >= min(y1, y2)) & (y <= max(y1, y2))
+        )
+    
+    return inside | on_edge
+
+
 class FieldMask:
     """
     Manages field boundaries and filters detections within field area
@@ -24,6 +67,7 @@ class FieldMask:
         """
         self.polygon = None
         self.enabled = False
+        self.config = {}  # Selected field config (pixel_vertices, court size)
         
         if config_path and os.path.exists(config_path):
             self._load_config(config_path, video_name)
@@ -36,15 +80,17 @@ class FieldMask:
             
             # Try video-specific config first, then default
             if video_name and video_name in config:
-                vertices = config[video_name].get('pixel_vertices', [])
+                field_config = config[video_name]
             elif 'default' in config:
-                vertices = config['default'].get('pixel_vertices', [])
+                field_config = config['default']
             else:
-                vertices = []
+                field_config = {}
+            vertices = field_config.get('pixel_vertices', [])
             
             if len(vertices) >= 3:
                 self.polygon = np.array(vertices, dtype=np.float32)
                 self.enabled = True
+                self.config = field_config
         except (json.JSONDecodeError, KeyError, FileNotFoundError) as e:
             print(f"⚠️  Failed to load field config: {e}")
             self.enabled = False
@@ -62,21 +108,65 @@ class FieldMask:
         if not self.enabled or self.polygon is None:
             return True  # If no mask, allow all positions
         
-        point = (float(position[0]), float(position[1]))
-        return cv2.pointPolygonTest(self.polygon, point, False) >= 0
+        return bool(self.contains_points(np.array([position], dtype=np.float64))[0])
     
-    def get_field_bounds(self):
+    def contains_points(self, points, transforms=None, frame_indices=None):
+        """
+        Test many points against the field at once
+        
+        Args:
+            points: Array of shape (N, 2) with pixel positions
+            transforms: Optional homographies mapping the calibrated frame's
+                        pixels into the current frame (camera movement),
+                        one (3, 3) matrix or an array (F, 3, 3) per frame
+            frame_indices: For per-frame transforms, the frame (row of
+                           transforms) of every point
+        
+        Returns:
+            Boolean array of shape (N,), True inside the field
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if not self.enabled or self.polygon is None:
+            return np.ones(len(points), dtype=bool)
+        if len(points) == 0:
+            return np.zeros(0, dtype=bool)
+        
+        # Map points back into the calibrated frame
+        if transforms is not None:
+            inverse = np.linalg.inv(np.asarray(transforms, dtype=np.float64))
+            if inverse.ndim == 3:
+                inverse = inverse[np.asarray(frame_indices)]
+            homogeneous = np.column_stack([points, np.ones(len(points))])
+            if inverse.ndim == 2:
+                mapped = homogeneous @ inverse.T
+            else:
+                mapped = np.einsum('nij,nj->ni', inverse, homogeneous)
+            points = mapped[:, :2] / mapped[:, 2:3]
+        
+        return points_in_polygon(points, self.polygon)
+    
+    def get_field_bounds(self, transform=None):
         """
         Get bounding rectangle of field
         
+        Args:
+            transform: Optional 3x3 homography mapping the calibrated
+                       frame's pixels into the current frame (camera movement)
+        
         Returns:
             (x_min, y_min, x_max, y_max) or None if not enabled
         """
         if not self.enabled or self.polygon is None:
             return None
         
-        x_coords = self.polygon[:, 0]
-        y_coords = self.polygon[:, 1]
+        polygon = self.polygon
+        if transform is not None:
+            polygon = cv2.perspectiveTransform(
+                polygon.reshape(-1, 1, 2), np.asarray(transform, dtype=np.float32)
+            ).reshape(-1, 2)
+        
+        x_coords = polygon[:, 0]
+        y_coords = polygon[:, 1]
         
         return (
             float(np.min(x_coords)),
@@ -84,5 +174,42 @@ class FieldMask:
             float(np.max(x_coords)),
             float(np.max(y_coords))
         )
-
-
+    
+    def get_inference_roi(self, frame_shape, margin=80, transforms=None, max_coverage=0.9):
+        """
+        Crop rectangle covering the field for detector inference
+        
+        Args:
+            frame_shape: Shape of the video frames (height, width, ...)
+            margin: Pixels added on every side of the field bounds
+            transforms: Optional sequence of per-frame homographies (see
+                        get_field_bounds); the crop covers the field in all
+                        of them so a chunk shares one crop
+            max_coverage: Crops covering more than this fraction of the
+                          frame are not worth cropping
+        
+        Returns:
+            (x0, y0, x1, y1) integer crop or None (no field config, or the
+            field fills the frame)
+        """
+        if transforms is None:
+            bounds = [self.get_field_bounds()]
+        else:
+            bounds = [self.get_field_bounds(transform) for transform in transforms]
+        
+        if not bounds or bounds[0] is None:
+            return None
+        
+        bounds = np.array(bounds)
+        height, width = frame_shape[:2]
+        x0 = int(max(0, np.floor(bounds[:, 0].min() - margin)))
+        y0 = int(max(0, np.floor(bounds[:, 1].min() - margin)))
+        x1 = int(min(width, np.ceil(bounds[:, 2].max() + margin)))
+        y1 = int(min(height, np.ceil(bounds[:, 3].max() + margin)))
+        
+        if x1 <= x0 or y1 <= y0:
+            return None
+        if (x1 - x0) * (y1 - y0) > max_coverage * width * height:
+            return None
+        
+        return x0, y0, x1, y1
@@ -0,0 +1,457 @@
+"""
+Inference Server Module
+Long-lived local process serving YOLO and EasyOCR to several analyses
+
+Analyses connect over multiprocessing connections (TCP with an auth key)
+through RemoteDetector / RemoteOCRReader, which stand in for the
+ultralytics model and the easyocr.Reader. Requests of all connected jobs
+are queued per model and merged into one batch when they arrive within a
+short window and use the same inference arguments, so throughput grows
+with the number of concurrent matches instead of every job paying for its
+own model.
+
+Detection results are returned as ultralytics Results without the original
+image, so sv.Detections.from_ultralytics works unchanged on the client.
+
+Connections exchange pickled payloads, so the auth key is what keeps other
+users from running code in the server. There is no built-in key: the
+server generates one per run and writes it to a key file only its owner
+can read, or takes an explicit key from AUTHKEY_ENV or a key file, and it
+only listens on a non-loopback address with an explicit key.
+"""
+
+import ipaddress
+import os
+import queue
+import secrets
+import socket
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+
+# Environment variable holding an explicit server key
+AUTHKEY_ENV = 'SPORTS_ANALYTICS_INFERENCE_KEY'
+
+
+def parse_address(address, default_port=6010):
+    """
+    Parse "host:port" (or "port") into a connection address
+
+    Args:
+        address: Address string or (host, port) tuple
+        default_port: Port used when only a host is given
+
+    Returns:
+        (host, port) tuple
+    """
+    if isinstance(address, (tuple, list)):
+        return address[0], int(address[1])
+
+    host, _, port = str(address).rpartition(':')
+    if not host:
+        if port.isdigit():
+            return '127.0.0.1', int(port)
+        return port, default_port
+    return host, int(port)
+
+
+def is_loopback(host):
+    """
+    Check whether a host name resolves to a loopback address
+
+    Args:
+        host: Host name or IP address ('' means all interfaces)
+
+    Returns:
+        True for loopback addresses, False otherwise or if unresolvable
+    """
+    try:
+        return ipaddress.ip_address(socket.gethostbyname(host)).is_loopback
+    except (OSError, ValueError):
+        return False
+
+
+def read_authkey(key_file):
+    """
+    Read a server key from a file only its owner can access
+
+    Args:
+        key_file: Path of the key file
+
+    Returns:
+        Key as bytes
+
+    Raises:
+        PermissionError: If group or other users can access the file
+        ValueError: If the file is empty
+    """
+    if os.name == 'posix' and os.stat(key_file).st_mode & 0o077:
+        raise PermissionError(f"Inference server key file {key_file} is accessible by other users "
+                              f"(run: chmod 600 {key_file})")
+
+    with open(key_file) as f:
+        authkey = f.read().strip()
+    if not authkey:
+        raise ValueError(f"Inference server key file {key_file} is empty")
+    return authkey.encode()
+
+
+def write_authkey(key_file, authkey):
+    """
+    Atomically write a server key to a file with 0600 permissions
+
+    Args:
+        key_file: Path of the key file
+        authkey: Key as bytes
+    """
+    key_file = str(key_file)
+    directory = os.path.dirname(key_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_path = f"{key_file}.{os.getpid()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        f.write(authkey.decode())
+    os.replace(tmp_path, key_file)
+
+
+def load_authkey(key_file=None):
+    """
+    Client side key lookup: AUTHKEY_ENV, then the key file
+
+    Args:
+        key_file: Key file written by the server
+
+    Returns:
+        Key as bytes or None if no key is available
+    """
+    if os.environ.get(AUTHKEY_ENV):
+        return os.environ[AUTHKEY_ENV].encode()
+    if key_file is not None and os.path.exists(key_file):
+        return read_authkey(key_file)
+    return None
+
+
+def server_authkey(host, key_file=None, default_key_file=None):
+    """
+    Choose the key of a server that listens on host
+
+    An explicit key (key_file, else AUTHKEY_ENV) is used as given.
+    Without one a random key is generated for this run and written to
+    default_key_file for local clients; that is only allowed on loopback
+    addresses.
+
+    Args:
+        host: Interface the server listens on
+        key_file: Explicit key file
+        default_key_file: Where a generated key is written
+
+    Returns:
+        Key as bytes
+
+    Raises:
+        ValueError: If host is not a loopback address and no explicit key
+                    is given
+    """
+    if key_file is not None:
+        return read_authkey(key_file)
+    if os.environ.get(AUTHKEY_ENV):
+        return os.environ[AUTHKEY_ENV].encode()
+
+    if not is_loopback(host):
+        raise ValueError(f"Refusing to listen on non-loopback address '{host}' without an explicit key "
+                         f"(pass a key file or set {AUTHKEY_ENV})")
+
+    authkey = secrets.token_hex(32).encode()
+    if default_key_file is not None:
+        write_authkey(default_key_file, authkey)
+    return authkey
+
+
+class _Request:
+    """A queued inference request of one client"""
+
+    def __init__(self, key, items, kwargs):
+        self.key = key
+        self.items = items
+        self.kwargs = kwargs
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class InferenceServer:
+    """
+    Serves one detector and one OCR reader to many clients with
+    cross-job dynamic batching
+    """
+
+    def __init__(self, detector, ocr_reader=None, host='127.0.0.1', port=6010,
+                 authkey=None, max_batch=32, max_wait_ms=10, model_info=None):
+        """
+        Initialize inference server
+
+        Args:
+            detector: Loaded ultralytics model
+            ocr_reader: Optional easyocr.Reader
+            host: Interface to listen on
+            port: Port to listen on (0 = any free port)
+            authkey: Key clients must present (default: random per server)
+            max_batch: Frames (or OCR crops) merged into one batch at most
+            max_wait_ms: Time a request waits for others to batch with
+            model_info: Dictionary describing the detector (weights,
+                        backend), sent to clients for cache keys
+        """
+        self.detector = detector
+        self.ocr_reader = ocr_reader
+        self.address = (host, port)
+        self.authkey = authkey or secrets.token_hex(32).encode()
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.model_info = dict(model_info or {})
+
+        self.queues = {'detect': queue.Queue(), 'ocr': queue.Queue()}
+        self.runners = {'detect': self._run_detect, 'ocr': self._run_ocr}
+        self._stop = threading.Event()
+        self._listener = None
+
+        # Counters per model: requests, batches, items
+        self.stats = {kind: {'requests': 0, 'batches': 0, 'items': 0} for kind in self.queues}
+        self._stats_lock = threading.Lock()
+
+    def start(self):
+        """
+        Start listening and batching (clients are accepted by serve_forever)
+
+        Returns:
+            (host, port) the server listens on
+        """
+        for kind in self.queues:
+            threading.Thread(target=self._batch_loop, args=(kind,), daemon=True,
+                             name=f"inference-{kind}").start()
+
+        self._listener = Listener(self.address, authkey=self.authkey)
+        self.address = self._listener.address
+        print(f"✓ Inference server listening on {self.address[0]}:{self.address[1]}")
+        return self.address
+
+    def serve_forever(self):
+        """Accept clients until stop() is called"""
+        if self._listener is None:
+            self.start()
+
+        while not self._stop.is_set():
+            try:
+                conn = self._listener.accept()
+            except AuthenticationError:
+                continue  # client with a wrong key
+            except OSError:
+                break
+            threading.Thread(target=self._handle_client, args=(conn,), daemon=True).start()
+
+    def stop(self):
+        """Stop accepting clients"""
+        self._stop.set()
+        if self._listener is not None:
+            self._listener.close()
+
+    def info(self):
+        """Model description sent to clients on connect"""
+        return {
+            **self.model_info,
+            'names': dict(self.detector.names),
+            'overrides': dict(getattr(self.detector, 'overrides', {}) or {}),
+            'ocr': self.ocr_reader is not None
+        }
+
+    def _handle_client(self, conn):
+        """Serve the requests of one client connection"""
+        with conn:
+            while True:
+                try:
+                    op, payload = conn.recv()
+                except (EOFError, OSError):
+                    return
+
+                try:
+                    if op == 'info':
+                        result = self.info()
+                    elif op == 'stats':
+                        with self._stats_lock:
+                            result = {kind: dict(counts) for kind, counts in self.stats.items()}
+                    elif op in self.queues:
+                        result = self._submit(op, *payload)
+                    else:
+                        raise ValueError(f"Unknown request '{op}'")
+                    conn.send(('ok', result))
+                except Exception as e:
+                    conn.send(('error', f"{type(e).__name__}: {e}"))
+
+    def _submit(self, kind, method, items, kwargs):
+        """Queue a request for batching and wait for its result"""
+        if kind == 'ocr' and self.ocr_reader is None:
+            raise RuntimeError("OCR is not enabled on the inference server")
+
+        kwargs = {name: value for name, value in kwargs.items() if name not in ('verbose', 'batch_size')}
+        key = (method, repr(sorted(kwargs.items())))
+
+        request = _Request(key, list(items), kwargs)
+        self.queues[kind].put(request)
+        request.done.wait()
+
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _batch_loop(self, kind):
+        """Collect queued requests into batches and run them"""
+        requests = self.queues[kind]
+
+        while not self._stop.is_set():
+            try:
+                pending = [requests.get(timeout=0.5)]
+            except queue.Empty:
+                continue
+
+            total = len(pending[0].items)
+            deadline = time.monotonic() + self.max_wait
+            while total < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = requests.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                pending.append(request)
+                total += len(request.items)
+
+            # Only requests with the same arguments share a batch
+            groups = {}
+            for request in pending:
+                groups.setdefault(request.key, []).append(request)
+
+            for group in groups.values():
+                self._run_group(kind, group)
+
+    def _run_group(self, kind, group):
+        """Run one merged batch and hand every request its share"""
+        items = [item for request in group for item in request.items]
+        method = group[0].key[0]
+
+        try:
+            results = self.runners[kind](method, items, group[0].kwargs)
+            start = 0
+            for request in group:
+                request.result = results[start:start + len(request.items)]
+                start += len(request.items)
+        except Exception as e:
+            for request in group:
+                request.error = e
+
+        with self._stats_lock:
+            self.stats[kind]['requests'] += len(group)
+            self.stats[kind]['batches'] += 1
+            self.stats[kind]['items'] += len(items)
+
+        for request in group:
+            request.done.set()
+
+    def _run_detect(self, method, frames, kwargs):
+        """Detect on a merged batch of frames"""
+        results = []
+        for result in self.detector.predict(frames, verbose=False, **kwargs):
+            result = result.cpu()
+            result.orig_img = None  # the client has the frame
+            results.append(result)
+        return results
+
+    def _run_ocr(self, method, images, kwargs):
+        """OCR a merged batch of crops"""
+        if method == 'readtext_batched':
+            return self.ocr_reader.readtext_batched(images, batch_size=len(images), **kwargs)
+        return [self.ocr_reader.readtext(image, **kwargs) for image in images]
+
+
+class _ServerConnection:
+    """Request/response connection to the inference server"""
+
+    def __init__(self, address, authkey):
+        if not authkey:
+            raise ValueError("An inference server key is required to connect")
+        self.conn = Client(tuple(address), authkey=authkey)
+        self.lock = threading.Lock()
+
+    def call(self, op, payload=None):
+        with self.lock:
+            self.conn.send((op, payload))
+            status, result = self.conn.recv()
+        if status == 'error':
+            raise RuntimeError(f"Inference server error: {result}")
+        return result
+
+
+class RemoteDetector:
+    """
+    Stand-in for the ultralytics model that runs predict() on the
+    inference server
+    """
+
+    def __init__(self, address, authkey):
+        """
+        Connect to the inference server
+
+        Args:
+            address: (host, port) of the server
+            authkey: Key of the server
+        """
+        self._connection = _ServerConnection(address, authkey)
+        self.server_info = self._connection.call('info')
+        self.names = self.server_info['names']
+        self.overrides = self.server_info['overrides']
+
+    def predict(self, source, **kwargs):
+        """
+        Detect on a batch of frames
+
+        Args:
+            source: List of frames
+            **kwargs: ultralytics predict arguments
+
+        Returns:
+            List of ultralytics Results (without orig_img)
+        """
+        frames = source if isinstance(source, list) else [source]
+        return self._connection.call('detect', ('predict', frames, kwargs))
+
+    def get_server_stats(self):
+        """Batching counters of the server"""
+        return self._connection.call('stats')
+
+
+class RemoteOCRReader:
+    """
+    Stand-in for easyocr.Reader that reads text on the inference server
+    """
+
+    def __init__(self, address, authkey):
+        """
+        Connect to the inference server
+
+        Args:
+            address: (host, port) of the server
+            authkey: Key of the server
+        """
+        self._connection = _ServerConnection(address, authkey)
+        self.available = self._connection.call('info')['ocr']
+
+    def readtext_batched(self, images, **kwargs):
+        """Read text in a batch of equally sized images"""
+        return self._connection.call('ocr', ('readtext_batched', list(images), kwargs))
+
+    def readtext(self, image, **kwargs):
+        """Read text in one image"""
+        return self._connection.call('ocr', ('readtext', [image], kwargs))[0]
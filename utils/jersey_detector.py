@@ -15,6 +15,11 @@ except ImportError:
     EASYOCR_AVAILABLE = False
     print("⚠️  EasyOCR not installed. Jersey number detection disabled.")
 
+try:
+    from .model_registry import get_registry
+except ImportError:
+    from utils.model_registry import get_registry
+
 
 class JerseyNumberDetector:
     """
@@ -22,7 +27,7 @@ class JerseyNumberDetector:
     """
     
     def __init__(self, languages=['en'], gpu=True, confidence_threshold=0.5,
-                 model_storage_dir='models/easyocr'):
+                 model_storage_dir='models/easyocr', batch_size=64):
         """
         Initialize jersey number detector
         
@@ -31,9 +36,11 @@ class JerseyNumberDetector:
             gpu: Whether to use GPU acceleration
             confidence_threshold: Minimum confidence for number detection
             model_storage_dir: Directory for EasyOCR models
+            batch_size: Number of jersey ROIs per batched OCR call
         """
         self.enabled = EASYOCR_AVAILABLE
         self.confidence_threshold = confidence_threshold
+        self.batch_size = batch_size
         self.reader = None
         
         if self.enabled:
@@ -46,30 +53,10 @@ class JerseyNumberDetector:
         self.max_history = 50
     
     def _init_ocr_reader(self, languages, gpu, model_storage_dir):
-        """Initialize EasyOCR reader"""
-        try:
-            self.reader = easyocr.Reader(
-                languages,
-                gpu=gpu,
-                model_storage_directory=model_storage_dir,
-                verbose=False
-            )
-        except Exception as e:
-            print(f"⚠️  EasyOCR initialization failed: {e}")
-            if gpu:
-                # Fallback to CPU
-                try:
-                    self.reader = easyocr.Reader(
-                        languages,
-                        gpu=False,
-                        model_storage_directory=model_storage_dir,
-                        verbose=False
-                    )
-                except Exception:
-                    self.enabled = False
-                    print("❌ EasyOCR failed completely. Jersey detection disabled.")
-            else:
-                self.enabled = False
+        """Get the EasyOCR reader (built once per process by the model registry)"""
+        self.reader = get_registry().get_ocr_reader(languages, gpu, model_storage_dir)
+        if self.reader is None:
+            self.enabled = False
     
     def extract_jersey_region(self, frame, bbox):
         """
@@ -150,6 +137,130 @@ class JerseyNumberDetector:
         
         return sharpened
     
+    def enhance_batch_for_ocr(self, images):
+        """
+        Enhance a batch of jersey ROIs for one batched OCR call
+        
+        Every ROI gets the single-ROI enhancement of enhance_for_ocr (4x
+        upscale, CLAHE, bilateral filter, sharpening) on its own, so the
+        aspect ratio is kept and no filter crosses from one ROI into
+        another. Batched OCR needs equally sized images, so the enhanced
+        ROIs are then padded at the bottom and right to the largest one
+        with their median grey level.
+        
+        Args:
+            images: List of BGR jersey ROIs (at least 10x10 pixels)
+            
+        Returns:
+            uint8 array of shape (N, height, width) with enhanced ROIs
+        """
+        enhanced = [self.enhance_for_ocr(image) for image in images]
+        height = max(image.shape[0] for image in enhanced)
+        width = max(image.shape[1] for image in enhanced)
+        
+        return np.stack([
+            cv2.copyMakeBorder(
+                image, 0, height - image.shape[0], 0, width - image.shape[1],
+                cv2.BORDER_CONSTANT, value=int(np.median(image))
+            )
+            for image in enhanced
+        ])
+    
+    def read_numbers_batch(self, jersey_rois):
+        """
+        Run OCR on a batch of jersey ROIs
+        
+        ROIs are grouped by size before batching, so little padding is
+        needed. Readings are raw (not validated); feed them to
+        update_history in video order to update the per-track consensus.
+        
+        Args:
+            jersey_rois: List of jersey ROIs (entries may be None)
+            
+        Returns:
+            List with the detected number (or None) for each ROI
+        """
+        numbers = [None] * len(jersey_rois)
+        
+        if not self.enabled or self.reader is None:
+            return numbers
+        
+        valid = [idx for idx, roi in enumerate(jersey_rois)
+                 if roi is not None and roi.shape[0] >= 10 and roi.shape[1] >= 10]
+        valid.sort(key=lambda idx: jersey_rois[idx].shape[:2])
+        
+        for start in range(0, len(valid), self.batch_size):
+            batch_indices = valid[start:start + self.batch_size]
+            
+            try:
+                enhanced = self.enhance_batch_for_ocr([jersey_rois[idx] for idx in batch_indices])
+                batch_results = self.reader.readtext_batched(
+                    list(enhanced),
+                    n_width=enhanced.shape[2],
+                    n_height=enhanced.shape[1],
+                    batch_size=len(batch_indices),
+                    allowlist='0123456789',
+                    paragraph=False,
+                    min_size=15,
+                    text_threshold=0.6,
+                    low_text=0.3
+                )
+            except Exception:
+                # Silently fail - OCR can be noisy
+                continue
+            
+            for idx, results in zip(batch_indices, batch_results):
+                numbers[idx] = self._parse_ocr_results(results)
+        
+        return numbers
+    
+    def update_history(self, original_track_id, number):
+        """
+        Add an OCR reading to a track's history and re-validate
+        
+        Args:
+            original_track_id: Original tracking ID
+            number: Detected number or None if nothing was read
+            
+        Returns:
+            Validated jersey number or None
+        """
+        if number is None:
+            return self.original_to_jersey.get(original_track_id)
+        
+        # Add to history
+        self.jersey_history[original_track_id].append(number)
+        if len(self.jersey_history[original_track_id]) > self.max_history:
+            self.jersey_history[original_track_id].pop(0)
+        
+        # Validate and return
+        return self._validate_number(original_track_id)
+    
+    def _parse_ocr_results(self, results):
+        """
+        Pick the most confident valid jersey number from OCR results
+        
+        Args:
+            results: EasyOCR results [(bbox, text, confidence), ...]
+            
+        Returns:
+            Jersey number (1-99) or None
+        """
+        detected_numbers = []
+        for (_, text, confidence) in results:
+            cleaned = re.sub(r'\D', '', text)
+            if cleaned and confidence >= self.confidence_threshold:
+                number = int(cleaned)
+                if 1 <= number <= 99:  # Valid jersey number range
+                    detected_numbers.append((number, confidence))
+        
+        if not detected_numbers:
+            return None
+        
+        # Use highest confidence detection
+        detected_numbers.sort(key=lambda x: x[1], reverse=True)
+        return detected_numbers[0][0]
+    
     def detect_number(self, frame, bbox, original_track_id):
         """
         Detect jersey number from player bounding box
@@ -186,27 +297,7 @@ class JerseyNumberDetector:
                 low_text=0.3
             )
             
-            # Extract valid numbers
-            detected_numbers = []
-            for (_, text, confidence) in results:
-                cleaned = re.sub(r'\D', '', text)
-                if cleaned and confidence >= self.confidence_threshold:
-                    number = int(cleaned)
-                    if 1 <= number <= 99:  # Valid jersey number range
-                        detected_numbers.append((number, confidence))
-            
-            if detected_numbers:
-                # Use highest confidence detection
-                detected_numbers.sort(key=lambda x: x[1], reverse=True)
-                number, conf = detected_numbers[0]
-                
-                # Add to history
-                self.jersey_history[original_track_id].append(number)
-                if len(self.jersey_history[original_track_id]) > self.max_history:
-                    self.jersey_history[original_track_id].pop(0)
-                
-                # Validate and return
-                return self._validate_number(original_track_id)
+            return self.update_history(original_track_id, self._parse_ocr_results(results))
         
         except Exception as e:
             # Silently fail - OCR can be noisy
@@ -244,6 +335,32 @@ class JerseyNumberDetector:
         
         return self.original_to_jersey.get(original_track_id)
     
+    def get_state(self):
+        """
+        Get the number history state (JSON-serializable)
+        
+        Returns:
+            Dictionary with jersey mapping and per-track reading history
+        """
+        return {
+            'original_to_jersey': {str(k): v for k, v in self.original_to_jersey.items()},
+            'jersey_history': {str(k): list(v) for k, v in self.jersey_history.items()}
+        }
+    
+    def load_state(self, state):
+        """
+        Restore state saved with get_state
+        
+        Args:
+            state: Dictionary from get_state
+        """
+        self.original_to_jersey = {
+            int(k): v for k, v in state.get('original_to_jersey', {}).items()
+        }
+        self.jersey_history = defaultdict(list, {
+            int(k): list(v) for k, v in state.get('jersey_history', {}).items()
+        })
+    
     def get_jersey_mapping(self):
         """Get current jersey number to track ID mapping"""
         return self.original_to_jersey.copy()
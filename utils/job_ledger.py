@@ -0,0 +1,158 @@
+"""
+Job Ledger Module
+Persistent status of the videos of a batch run
+
+The ledger is a JSON file rewritten atomically after every status change,
+so an interrupted batch knows which videos finished, which failed and
+which must run again. A video whose file changed since it finished is
+scheduled again.
+"""
+
+import json
+import os
+import time
+
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class JobLedger:
+    """
+    Status, timing and errors of batch jobs keyed by video path
+    """
+
+    def __init__(self, ledger_path):
+        """
+        Initialize ledger, loading the previous run's state if present
+
+        Args:
+            ledger_path: Path of the JSON ledger file
+        """
+        self.ledger_path = str(ledger_path)
+        self.jobs = {}
+
+        if os.path.exists(self.ledger_path):
+            try:
+                with open(self.ledger_path) as f:
+                    self.jobs = json.load(f).get('jobs', {})
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Ignoring unreadable ledger {self.ledger_path}: {e}")
+
+    @staticmethod
+    def _file_signature(video_path):
+        """Size and modification time of a video"""
+        stat = os.stat(video_path)
+        return {'size': stat.st_size, 'mtime': stat.st_mtime}
+
+    def schedule(self, video_paths, retry_failed=False):
+        """
+        Register videos and select the ones that need to run
+
+        Jobs left running by an interrupted batch run again (picking up
+        their chunk checkpoints); finished jobs only run again when their
+        video changed.
+
+        Args:
+            video_paths: List of video paths
+            retry_failed: Also run jobs that failed before
+
+        Returns:
+            List of video paths to run, in the given order
+        """
+        to_run = []
+        for video_path in video_paths:
+            key = str(video_path)
+            signature = self._file_signature(key)
+            job = self.jobs.get(key)
+
+            if job is None or job.get('signature') != signature:
+                job = {'status': PENDING, 'attempts': 0, 'signature': signature}
+                self.jobs[key] = job
+            elif job['status'] == RUNNING:
+                job['status'] = PENDING
+            elif job['status'] == FAILED and retry_failed:
+                job['status'] = PENDING
+
+            if job['status'] == PENDING:
+                to_run.append(key)
+
+        self.save()
+        return to_run
+
+    def mark_running(self, video_path):
+        """Record that a job was started"""
+        job = self.jobs[str(video_path)]
+        job.update({
+            'status': RUNNING, 'started': time.time(),
+            'runtime': None, 'frames': None, 'fps': None, 'error': None
+        })
+        job['attempts'] = job.get('attempts', 0) + 1
+        self.save()
+
+    def mark_done(self, video_path, runtime, frames):
+        """
+        Record a finished job
+
+        Args:
+            video_path: Video of the job
+            runtime: Wall time of the analysis (seconds)
+            frames: Frames processed
+        """
+        self.jobs[str(video_path)].update({
+            'status': DONE,
+            'runtime': runtime,
+            'frames': frames,
+            'fps': frames / runtime if runtime else 0.0,
+            'error': None
+        })
+        self.save()
+
+    def mark_failed(self, video_path, error, runtime=None):
+        """
+        Record a failed job
+
+        Args:
+            video_path: Video of the job
+            error: Error message
+            runtime: Wall time until the failure (seconds), if known
+        """
+        self.jobs[str(video_path)].update({'status': FAILED, 'error': str(error), 'runtime': runtime})
+        self.save()
+
+    def save(self):
+        """Atomically rewrite the ledger file"""
+        directory = os.path.dirname(self.ledger_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.ledger_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'jobs': self.jobs}, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.ledger_path)
+
+    def summary_rows(self):
+        """
+        One row per job for the summary table
+
+        Returns:
+            List of dictionaries (video, status, runtime_s, frames, fps,
+            attempts, error)
+        """
+        rows = []
+        for video_path, job in self.jobs.items():
+            runtime = job.get('runtime')
+            rows.append({
+                'video': os.path.basename(video_path),
+                'status': job['status'],
+                'runtime_s': round(runtime, 1) if runtime is not None else None,
+                'frames': job.get('frames'),
+                'fps': round(job['fps'], 2) if job.get('fps') is not None else None,
+                'attempts': job.get('attempts', 0),
+                'error': job.get('error')
+            })
+        return rows
@@ -0,0 +1,195 @@
+"""
+Model Registry Module
+Process-wide cache of loaded detection and OCR models
+
+Loading YOLO and building an EasyOCR reader takes seconds and hundreds of
+MB, so every JerseyTracker / JerseyNumberDetector of a process asks the
+registry instead of loading its own copy. Models are loaded lazily on the
+first request and reused warm by every later analysis in the process.
+
+When an inference server address is set (see utils/inference_server.py),
+the registry hands out proxies to the server's models instead, so several
+analysis processes share one copy and their requests are batched together.
+
+A registry model is meant for one analysis at a time; analyses running
+concurrently should share models through the inference server, which
+serialises (and batches) their requests.
+"""
+
+import threading
+from pathlib import Path
+
+
+class ModelRegistry:
+    """
+    Lazily loads models once per process and hands out the warm instances
+    """
+
+    def __init__(self, server_address=None, authkey=None):
+        """
+        Initialize model registry
+
+        Args:
+            server_address: Optional (host, port) of an inference server to
+                            use instead of loading models in this process
+            authkey: Authentication key of the inference server
+        """
+        self.server_address = server_address
+        self.authkey = authkey
+
+        self._models = {}
+        self._lock = threading.Lock()
+
+        # Counters
+        self.stats = {'loads': 0, 'hits': 0}
+
+    def use_server(self, server_address, authkey=None):
+        """
+        Use an inference server for models requested from now on
+
+        Args:
+            server_address: (host, port) of the server, or None to load
+                            models locally again
+            authkey: Authentication key of the server
+        """
+        self.server_address = tuple(server_address) if server_address else None
+        self.authkey = authkey
+
+    def _get(self, key, load):
+        """Return the cached model for key, loading it on first use"""
+        with self._lock:
+            if key in self._models:
+                self.stats['hits'] += 1
+                return self._models[key]
+
+            model = load()
+            self._models[key] = model
+            self.stats['loads'] += 1
+            return model
+
+    def get_detector(self, model_path, backend='torch', int8=False,
+                     calibration_videos=None, calibration_frames=64):
+        """
+        Get the detection model
+
+        Args:
+            model_path: Path to the .pt weights
+            backend: Detector runtime ('torch', 'onnx' or 'openvino')
+            int8: Use an INT8 quantized export
+            calibration_videos: Directory with videos for INT8 calibration
+            calibration_frames: Number of INT8 calibration frames
+
+        Returns:
+            ultralytics YOLO model (or a RemoteDetector of the inference
+            server, which then decides the weights and backend)
+        """
+        if self.server_address is not None:
+            try:
+                from .inference_server import RemoteDetector
+            except ImportError:
+                from utils.inference_server import RemoteDetector
+            key = ('remote_detector', self.server_address)
+            return self._get(key, lambda: RemoteDetector(self.server_address, self.authkey))
+
+        try:
+            from .detector_backend import load_detector
+        except ImportError:
+            from utils.detector_backend import load_detector
+
+        key = ('detector', str(Path(model_path).resolve()), backend, bool(int8))
+        return self._get(key, lambda: load_detector(
+            model_path, backend=backend, int8=int8,
+            calibration_videos=calibration_videos, calibration_frames=calibration_frames
+        ))
+
+    def get_ocr_reader(self, languages=('en',), gpu=True, model_storage_dir='models/easyocr'):
+        """
+        Get the EasyOCR reader
+
+        A reader that fails on the GPU is built on the CPU once and the
+        result is cached under the requested settings, so later requests
+        do not retry the GPU.
+
+        Args:
+            languages: OCR languages
+            gpu: Whether to try GPU acceleration
+            model_storage_dir: Directory for EasyOCR models
+
+        Returns:
+            easyocr.Reader (or a RemoteOCRReader), None if it cannot be built
+        """
+        if self.server_address is not None:
+            try:
+                from .inference_server import RemoteOCRReader
+            except ImportError:
+                from utils.inference_server import RemoteOCRReader
+
+            def connect():
+                reader = RemoteOCRReader(self.server_address, self.authkey)
+                return reader if reader.available else None
+
+            key = ('remote_ocr', self.server_address)
+            return self._get(key, connect)
+
+        key = ('ocr', tuple(languages), bool(gpu), str(model_storage_dir))
+        return self._get(key, lambda: _build_ocr_reader(list(languages), gpu, model_storage_dir))
+
+    def loaded(self):
+        """Keys of the loaded models"""
+        with self._lock:
+            return list(self._models)
+
+    def clear(self):
+        """Drop every loaded model (they are reloaded on the next request)"""
+        with self._lock:
+            self._models.clear()
+
+
+def _build_ocr_reader(languages, gpu, model_storage_dir):
+    """
+    Build an EasyOCR reader, falling back to the CPU
+
+    Returns:
+        easyocr.Reader or None if EasyOCR is missing or fails
+    """
+    try:
+        import easyocr
+    except ImportError:
+        return None
+
+    try:
+        return easyocr.Reader(
+            languages,
+            gpu=gpu,
+            model_storage_directory=model_storage_dir,
+            verbose=False
+        )
+    except Exception as e:
+        print(f"⚠️  EasyOCR initialization failed: {e}")
+        if not gpu:
+            return None
+
+    # Fallback to CPU
+    try:
+        return easyocr.Reader(
+            languages,
+            gpu=False,
+            model_storage_directory=model_storage_dir,
+            verbose=False
+        )
+    except Exception:
+        print("❌ EasyOCR failed completely. Jersey detection disabled.")
+        return None
+
+
+_REGISTRY = ModelRegistry()
+
+
+def get_registry():
+    """
+    Get the process-wide model registry
+
+    Returns:
+        ModelRegistry shared by every component of the process
+    """
+    return _REGISTRY
@@ -0,0 +1,155 @@
+"""
+OCR Scheduler Module
+Decides which jersey ROIs are worth sending to OCR
+"""
+
+from collections import defaultdict
+
+try:
+    from .frame_quality import calculate_frame_quality
+except ImportError:
+    from utils.frame_quality import calculate_frame_quality
+
+
+class OCRScheduler:
+    """
+    Schedules jersey number OCR per chunk
+
+    New and unconfirmed tracks are read as often as the budget allows.
+    Tracks whose number is already locked are only re-checked at an
+    interval that grows after every agreeing re-check, using the largest
+    and sharpest ROI available when a re-check is due.
+    """
+
+    def __init__(self, recheck_interval=30, max_recheck_interval=900,
+                 interval_growth=2.0, chunk_budget=400, min_roi_area=300):
+        """
+        Initialize OCR scheduler
+
+        Args:
+            recheck_interval: Frames before the first re-check of a locked track
+            max_recheck_interval: Upper bound for the re-check interval (frames)
+            interval_growth: Interval multiplier after a re-check agrees
+            chunk_budget: Maximum OCR calls per chunk (None = unlimited)
+            min_roi_area: ROIs with fewer pixels are never sent to OCR
+        """
+        self.recheck_interval = recheck_interval
+        self.max_recheck_interval = max_recheck_interval
+        self.interval_growth = interval_growth
+        self.chunk_budget = chunk_budget
+        self.min_roi_area = min_roi_area
+
+        # Re-check state of locked tracks
+        self.next_check_frame = {}
+        self.interval = {}
+
+        # Counters
+        self.ocr_calls = 0
+        self.skipped = defaultdict(int)
+
+    def select(self, candidates, locked_numbers):
+        """
+        Select the candidates of a chunk that should be sent to OCR
+
+        Args:
+            candidates: List of (frame_idx, track_id, roi) with global frame indices
+            locked_numbers: Dictionary {track_id: jersey_number} of locked tracks
+
+        Returns:
+            Sorted list of selected candidate indices
+        """
+        unconfirmed = defaultdict(list)
+        locked_due = defaultdict(list)
+
+        for idx, (frame_idx, track_id, roi) in enumerate(candidates):
+            if roi is None or roi.shape[0] * roi.shape[1] < self.min_roi_area:
+                self.skipped['small_roi'] += 1
+                continue
+
+            if track_id in locked_numbers:
+                if frame_idx < self.next_check_frame.get(track_id, frame_idx):
+                    self.skipped['locked'] += 1
+                    continue
+                locked_due[track_id].append(idx)
+            else:
+                unconfirmed[track_id].append(idx)
+
+        # Rank (priority, rank within track, -quality): unconfirmed tracks
+        # first, interleaved so every track gets its best ROIs read before
+        # any track gets a second-best one
+        ranked = []
+        for track_indices in unconfirmed.values():
+            ordered = self._order_by_quality(candidates, track_indices)
+            ranked.extend((0, rank, -score, idx) for rank, (score, idx) in enumerate(ordered))
+
+        for track_indices in locked_due.values():
+            ordered = self._order_by_quality(candidates, track_indices)
+            score, idx = ordered[0]
+            ranked.append((1, 0, -score, idx))
+            self.skipped['locked'] += len(ordered) - 1
+
+        ranked.sort()
+
+        budget = len(ranked) if self.chunk_budget is None else self.chunk_budget
+        selected = [entry[-1] for entry in ranked[:budget]]
+        self.skipped['budget'] += len(ranked) - len(selected)
+        self.ocr_calls += len(selected)
+
+        return sorted(selected)
+
+    def record_result(self, track_id, frame_idx, number, locked_number):
+        """
+        Update re-check state after an OCR call
+
+        Args:
+            track_id: Tracking ID
+            frame_idx: Global frame index of the OCR'd ROI
+            number: OCR reading (or None)
+            locked_number: Number the track was locked to before this reading
+        """
+        if locked_number is None:
+            return
+
+        if number is not None and number != locked_number:
+            # Disagreement - verify again soon
+            interval = self.recheck_interval
+        elif track_id in self.interval:
+            interval = min(self.interval[track_id] * self.interval_growth,
+                           self.max_recheck_interval)
+        else:
+            interval = self.recheck_interval
+
+        self.interval[track_id] = interval
+        self.next_check_frame[track_id] = frame_idx + int(interval)
+
+    def _order_by_quality(self, candidates, indices):
+        """
+        Order candidate indices by ROI score (area x sharpness), best first
+
+        Returns:
+            List of (score, index) tuples
+        """
+        scored = []
+        for idx in indices:
+            roi = candidates[idx][2]
+            area = roi.shape[0] * roi.shape[1]
+            # calculate_frame_quality is 1 / (laplacian variance + 1)
+            scored.append((area / calculate_frame_quality(roi), idx))
+
+        scored.sort(key=lambda x: x[0], reverse=True)
+        return scored
+
+    def get_stats(self):
+        """
+        Get OCR call counters
+
+        Returns:
+            Dictionary with calls made and skipped (by reason)
+        """
+        return {
+            'ocr_calls': self.ocr_calls,
+            'ocr_skipped': sum(self.skipped.values()),
+            'skipped_locked': self.skipped['locked'],
+            'skipped_budget': self.skipped['budget'],
+            'skipped_small_roi': self.skipped['small_roi']
+        }
@@ -7,20 +7,27 @@ import cv2
 import numpy as np
 import pickle
 import os
+from concurrent.futures import ProcessPoolExecutor
 
 
 class OpticalFlowTracker:
     """Tracks features using optical flow for camera movement estimation"""
     
-    def __init__(self, frame, min_distance=5):
+    def __init__(self, frame, min_distance=5, estimate_homography=False, pyramid_level=0):
         """
         Initialize optical flow tracker
         
         Args:
             frame: Reference frame
             min_distance: Minimum movement distance to consider
+            estimate_homography: Also estimate a per-frame homography mapping
+                                 each frame to the first (reference) frame
+            pyramid_level: Track features on a grey image downscaled this many
+                           times by 2 (results stay in full-resolution pixels)
         """
         self.minimum_distance = min_distance
+        self.estimate_homography = estimate_homography
+        self.pyramid_level = pyramid_level
         
         # Optical flow parameters
         self.lk_params = {
@@ -37,8 +44,12 @@ class OpticalFlowTracker:
             'blockSize': 7
         }
         
-        # Create mask for feature detection
-        self.mask = self._create_feature_mask(frame)
+        # Create mask for feature detection (at the tracking pyramid level)
+        step = 2 ** pyramid_level
+        self.mask = self._create_feature_mask(frame)[::step, ::step]
+        
+        # Streaming state (previous grey frame and tracked features)
+        self.reset()
     
     def _create_feature_mask(self, frame):
         """
@@ -60,6 +71,212 @@ class OpticalFlowTracker:
         
         return mask
     
+    def reset(self):
+        """Reset streaming state so the next frame starts a new sequence"""
+        self._old_gray = None
+        self._old_features = None
+        
+        # Homography mode: frame step and frame -> reference frame mappings
+        self._to_reference = np.eye(3)
+        self.step_homographies = []
+        self.frame_homographies = []
+    
+    def get_state(self):
+        """
+        Carry-over state of a streamed video
+        
+        Only what the next frame needs (previous grey frame, tracked
+        features, latest frame -> reference mapping); the per-frame
+        homography history is not included.
+        
+        Returns:
+            Dictionary for load_state
+        """
+        return {
+            'old_gray': self._old_gray,
+            'old_features': self._old_features,
+            'to_reference': self._to_reference
+        }
+    
+    def load_state(self, state, step_homographies=None, frame_homographies=None):
+        """
+        Restore carry-over state saved by get_state
+        
+        Args:
+            state: Dictionary from get_state
+            step_homographies: Optional (N, 3, 3) step history to restore
+            frame_homographies: Optional (N, 3, 3) frame -> reference history
+        """
+        self._old_gray = state['old_gray']
+        self._old_features = state['old_features']
+        self._to_reference = state['to_reference']
+        
+        self.step_homographies = list(np.asarray(
+            step_homographies if step_homographies is not None else [], dtype=np.float32
+        ).reshape(-1, 3, 3))
+        self.frame_homographies = list(np.asarray(
+            frame_homographies if frame_homographies is not None else [], dtype=np.float32
+        ).reshape(-1, 3, 3))
+    
+    def update(self, frames):
+        """
+        Calculate camera movement for the next window of frames
+        
+        Feature state is carried across calls, so feeding a video window by
+        window gives the same result as calculate_movement on the whole video.
+        
+        Args:
+            frames: List of consecutive video frames
+            
+        Returns:
+            List of camera movement vectors [(dx, dy), ...] for these frames
+        """
+        return [self._step(frame) for frame in frames]
+    
+    def _step(self, frame):
+        """
+        Advance optical flow by one frame
+        
+        Args:
+            frame: Next video frame
+            
+        Returns:
+            Camera movement [dx, dy] relative to the previous frame
+        """
+        frame_gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        for _ in range(self.pyramid_level):
+            frame_gray = cv2.pyrDown(frame_gray)
+        
+        movement, matches = self._track_features(frame_gray)
+        
+        if self.estimate_homography:
+            self._record_homography(matches)
+        
+        return movement
+    
+    def _track_features(self, frame_gray):
+        """
+        Track features from the previous grey frame into this one
+        
+        Args:
+            frame_gray: Next grey video frame
+            
+        Returns:
+            Tuple of (movement [dx, dy], (good_old, good_new) or None)
+        """
+        if self._old_gray is None:
+            self._old_gray = frame_gray
+            self._old_features = cv2.goodFeaturesToTrack(frame_gray, mask=self.mask, **self.feature_params)
+            return [0, 0], None
+        
+        if self._old_features is None or len(self._old_features) == 0:
+            self._old_features = cv2.goodFeaturesToTrack(frame_gray, mask=self.mask, **self.feature_params)
+            self._old_gray = frame_gray
+            return [0, 0], None
+        
+        # Calculate optical flow
+        new_features, status, error = cv2.calcOpticalFlowPyrLK(
+            self._old_gray, frame_gray, self._old_features, None, **self.lk_params
+        )
+        
+        if new_features is None:
+            self._old_gray = frame_gray
+            return [0, 0], None
+        
+        # Filter good points
+        good_old = self._old_features[status == 1]
+        good_new = new_features[status == 1]
+        
+        if len(good_old) < 5:
+            self._old_features = cv2.goodFeaturesToTrack(frame_gray, mask=self.mask, **self.feature_params)
+            self._old_gray = frame_gray
+            return [0, 0], None
+        
+        # Back to full-resolution pixels
+        scale = 2 ** self.pyramid_level
+        matches = (good_old * scale, good_new * scale)
+        
+        # Calculate camera movement (median of all feature movements)
+        camera_movement_vectors = matches[1] - matches[0]
+        
+        # Use median to be robust to outliers
+        camera_movement_x = np.median(camera_movement_vectors[:, 0])
+        camera_movement_y = np.median(camera_movement_vectors[:, 1])
+        
+        movement = [0, 0]
+        if abs(camera_movement_x) > self.minimum_distance or abs(camera_movement_y) > self.minimum_distance:
+            movement = [camera_movement_x, camera_movement_y]
+        
+        # Update for next iteration
+        self._old_gray = frame_gray
+        self._old_features = good_new.reshape(-1, 1, 2)
+        
+        return movement, matches
+    
+    def _record_homography(self, matches):
+        """
+        Chain the homography of the latest frame step and record the
+        mapping from the latest frame to the reference frame
+        
+        Args:
+            matches: (good_old, good_new) feature positions, or None when
+                     the step could not be tracked (treated as no motion)
+        """
+        step = np.eye(3) if matches is None else self._step_homography(*matches)
+        self._to_reference = self._chain_step(self._to_reference, step)
+        
+        self.step_homographies.append(step.astype(np.float32))
+        self.frame_homographies.append(self._to_reference.astype(np.float32))
+    
+    @staticmethod
+    def _chain_step(to_reference, step):
+        """Extend a frame -> reference mapping by one frame step"""
+        to_reference = to_reference @ np.linalg.inv(step)
+        return to_reference / to_reference[2, 2]
+    
+    @staticmethod
+    def chain_homographies(step_homographies):
+        """
+        Chain frame-step homographies into frame -> reference homographies
+        
+        Args:
+            step_homographies: Array of shape (N, 3, 3), previous frame ->
+                               frame mapping of every frame
+            
+        Returns:
+            Array of shape (N, 3, 3) mapping each frame to the first frame
+        """
+        to_reference = np.eye(3)
+        frame_homographies = np.empty((len(step_homographies), 3, 3), dtype=np.float32)
+        
+        for idx, step in enumerate(step_homographies):
+            to_reference = OpticalFlowTracker._chain_step(to_reference, step.astype(np.float64))
+            frame_homographies[idx] = to_reference
+        
+        return frame_homographies
+    
+    def _step_homography(self, good_old, good_new):
+        """
+        Estimate the homography mapping previous-frame pixels to this frame
+        
+        Uses RANSAC so moving players are rejected as outliers; falls back
+        to the median translation when too few features are tracked.
+        
+        Returns:
+            3x3 homography
+        """
+        if len(good_old) >= 8:
+            homography, _ = cv2.findHomography(
+                good_old.reshape(-1, 1, 2), good_new.reshape(-1, 1, 2), cv2.RANSAC, 3.0
+            )
+            if homography is not None:
+                return homography
+        
+        step = np.eye(3)
+        step[:2, 2] = np.median(good_new - good_old, axis=0).reshape(2)
+        return step
+    
+    
     def calculate_movement(self, frames, read_from_stub=False, stub_path=None):
         """
         Calculate camera movement across frames
@@ -73,61 +290,184 @@ class OpticalFlowTracker:
             List of camera movement vectors [(dx, dy), ...]
         """
         # Check stub
-        if read_from_stub and stub_path and os.path.exists(stub_path):
-            with open(stub_path, 'rb') as f:
-                return pickle.load(f)
+        if read_from_stub:
+            camera_movement = self.load_stub(stub_path)
+            if camera_movement is not None:
+                return camera_movement
         
-        camera_movement = [[0, 0]] * len(frames)
+        self.reset()
+        camera_movement = self.update(frames)
         
-        old_gray = cv2.cvtColor(frames[0], cv2.COLOR_BGR2GRAY)
-        old_features = cv2.goodFeaturesToTrack(old_gray, mask=self.mask, **self.feature_params)
+        # Save to stub if requested
+        if stub_path:
+            self.save_stub(stub_path, camera_movement)
         
-        for frame_num in range(1, len(frames)):
-            frame_gray = cv2.cvtColor(frames[frame_num], cv2.COLOR_BGR2GRAY)
-            
-            if old_features is None or len(old_features) == 0:
-                old_features = cv2.goodFeaturesToTrack(frame_gray, mask=self.mask, **self.feature_params)
-                old_gray = frame_gray.copy()
-                continue
-            
-            # Calculate optical flow
-            new_features, status, error = cv2.calcOpticalFlowPyrLK(
-                old_gray, frame_gray, old_features, None, **self.lk_params
-            )
-            
-            if new_features is None:
-                old_gray = frame_gray.copy()
-                continue
-            
-            # Filter good points
-            good_old = old_features[status == 1]
-            good_new = new_features[status == 1]
-            
-            if len(good_old) < 5:
-                old_features = cv2.goodFeaturesToTrack(frame_gray, mask=self.mask, **self.feature_params)
-                old_gray = frame_gray.copy()
-                continue
-            
-            # Calculate camera movement (median of all feature movements)
-            camera_movement_vectors = good_new - good_old
-            
-            # Use median to be robust to outliers
-            camera_movement_x = np.median(camera_movement_vectors[:, 0])
-            camera_movement_y = np.median(camera_movement_vectors[:, 1])
+        return camera_movement
+    
+    @staticmethod
+    def load_stub(stub_path):
+        """
+        Load cached camera movement
+        
+        Args:
+            stub_path: Path to stub file
             
-            if abs(camera_movement_x) > self.minimum_distance or abs(camera_movement_y) > self.minimum_distance:
-                camera_movement[frame_num] = [camera_movement_x, camera_movement_y]
-                old_features = cv2.goodFeaturesToTrack(frame_gray, mask=self.mask, **self.feature_params)
+        Returns:
+            List of camera movement vectors or None if no stub exists
+        """
+        if not stub_path or not os.path.exists(stub_path):
+            return None
+        
+        with open(stub_path, 'rb') as f:
+            return pickle.load(f)
+    
+    @staticmethod
+    def save_stub(stub_path, camera_movement):
+        """
+        Cache camera movement to a stub file
+        
+        Args:
+            stub_path: Path to stub file
+            camera_movement: List of camera movement vectors
+        """
+        os.makedirs(os.path.dirname(stub_path), exist_ok=True)
+        with open(stub_path, 'wb') as f:
+            pickle.dump(camera_movement, f)
+    
+    @staticmethod
+    def load_homographies(path):
+        """
+        Load cached per-frame homographies
+        
+        Args:
+            path: Path to .npy file
             
-            # Update for next iteration
-            old_gray = frame_gray.copy()
-            old_features = good_new.reshape(-1, 1, 2)
+        Returns:
+            Array of shape (N, 3, 3) or None if no cache exists
+        """
+        if not path or not os.path.exists(path):
+            return None
         
-        # Save to stub if requested
-        if stub_path:
-            os.makedirs(os.path.dirname(stub_path), exist_ok=True)
-            with open(stub_path, 'wb') as f:
-                pickle.dump(camera_movement, f)
+        return np.load(path)
+    
+    @staticmethod
+    def save_homographies(path, homographies):
+        """
+        Cache per-frame homographies as a compact float32 array
         
-        return camera_movement
+        Args:
+            path: Path to .npy file
+            homographies: Array of shape (N, 3, 3)
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.save(path, np.asarray(homographies, dtype=np.float32).reshape(-1, 3, 3))
+
+
+def _estimate_segment(args):
+    """
+    Process-pool worker: camera movement for one video segment
+    
+    Opens the video, skips to `overlap` frames before the segment and uses
+    those frames to warm up the feature state, so the first frame of the
+    segment already has a real movement estimate. Frames are skipped with
+    grab() rather than a CAP_PROP_POS_FRAMES seek, which is not
+    frame-accurate for compressed or variable-frame-rate video.
+    
+    Args:
+        args: Tuple (video_path, start, end, overlap, min_distance,
+              estimate_homography, pyramid_level); end None = until EOF
+        
+    Returns:
+        Tuple (movements, step_homographies or None) for frames start..end-1
+    """
+    video_path, start, end, overlap, min_distance, estimate_homography, pyramid_level = args
+    warmup_start = max(0, start - overlap)
+    
+    cap = cv2.VideoCapture(video_path)
+    
+    tracker = None
+    movements = []
+    
+    frame_idx = 0
+    while frame_idx < warmup_start and cap.grab():
+        frame_idx += 1
+    
+    while end is None or frame_idx < end:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        
+        if tracker is None:
+            tracker = OpticalFlowTracker(
+                frame, min_distance=min_distance,
+                estimate_homography=estimate_homography, pyramid_level=pyramid_level
+            )
+        
+        movement = tracker._step(frame)
+        if frame_idx >= start:
+            movements.append(movement)
+        frame_idx += 1
+    
+    cap.release()
+    
+    if tracker is None:
+        return [], None
+    
+    steps = None
+    if estimate_homography:
+        steps = np.asarray(tracker.step_homographies[start - warmup_start:], dtype=np.float32)
+    
+    return movements, steps
+
 
+def estimate_camera_movement_parallel(video_path, total_frames, workers=None, overlap=5,
+                                      min_segment_size=300, min_distance=5,
+                                      estimate_homography=False, pyramid_level=0):
+    """
+    Estimate camera movement for a whole video in parallel segments
+    
+    The video is split into one contiguous segment per worker process; each
+    worker decodes and tracks its own segment (warmed up on the preceding
+    `overlap` frames). Per-frame movements are relative to the previous
+    frame, so segments are stitched by concatenation; homography steps are
+    chained into frame -> reference mappings after stitching.
+    
+    Args:
+        video_path: Path to video file
+        total_frames: Number of frames in the video (the last segment reads
+                      until the end of the file regardless)
+        workers: Worker processes (default: one per CPU core)
+        overlap: Warm-up frames read before each segment
+        min_segment_size: Minimum frames per segment
+        min_distance: Minimum movement distance to consider
+        estimate_homography: Also estimate per-frame homographies
+        pyramid_level: Pyramid level used for feature tracking
+        
+    Returns:
+        Tuple (camera movement list, (N, 3, 3) homographies or None)
+    """
+    workers = workers or os.cpu_count() or 1
+    segment_size = max(min_segment_size, -(-max(total_frames, 1) // workers))
+    
+    starts = list(range(0, max(total_frames, 1), segment_size))
+    segments = [
+        (video_path, start, starts[idx + 1] if idx + 1 < len(starts) else None,
+         overlap, min_distance, estimate_homography, pyramid_level)
+        for idx, start in enumerate(starts)
+    ]
+    
+    with ProcessPoolExecutor(max_workers=min(workers, len(segments))) as executor:
+        results = list(executor.map(_estimate_segment, segments))
+    
+    camera_movement = []
+    steps = []
+    for movements, segment_steps in results:
+        camera_movement.extend(movements)
+        if segment_steps is not None:
+            steps.append(segment_steps)
+    
+    frame_homographies = None
+    if estimate_homography and steps:
+        frame_homographies = OpticalFlowTracker.chain_homographies(np.concatenate(steps))
+    
+    return camera_movement, frame_homographies
@@ -0,0 +1,277 @@
+"""
+Pipeline Module
+Staged producer-consumer pipeline with bounded queues
+
+Each stage runs in its own thread and hands work to the next stage through
+a bounded queue, so a slow stage applies backpressure instead of letting
+decoded frames pile up in memory. Per-stage timings show which stage is
+the bottleneck.
+"""
+
+import queue
+import threading
+import time
+
+
+# Marks the end of the stream in stage queues
+_END_OF_STREAM = object()
+
+
+class StageStats:
+    """Timing statistics for one pipeline stage"""
+
+    def __init__(self, name):
+        """
+        Initialize stage statistics
+
+        Args:
+            name: Stage name
+        """
+        self.name = name
+        self.items = 0
+        self.frames = 0
+        self.busy_seconds = 0.0
+
+    def record(self, frames, seconds):
+        """
+        Record one processed item
+
+        Args:
+            frames: Number of frames in the item
+            seconds: Time spent processing the item
+        """
+        self.items += 1
+        self.frames += frames
+        self.busy_seconds += seconds
+
+    @property
+    def fps(self):
+        """Frames per second of busy time (stage throughput in isolation)"""
+        if self.busy_seconds <= 0:
+            return 0.0
+        return self.frames / self.busy_seconds
+
+    def to_dict(self):
+        """Get statistics as dictionary"""
+        return {
+            'stage': self.name,
+            'items': self.items,
+            'frames': self.frames,
+            'busy_seconds': self.busy_seconds,
+            'fps': self.fps
+        }
+
+
+class PipelineStage:
+    """A named processing step of a StagedPipeline"""
+
+    def __init__(self, name, func):
+        """
+        Initialize pipeline stage
+
+        Args:
+            name: Stage name (used in statistics)
+            func: Callable taking an item and returning the item for the
+                  next stage (the return value of the last stage is dropped)
+        """
+        self.name = name
+        self.func = func
+
+
+class StagedPipeline:
+    """
+    Runs a source iterator through a chain of stages
+
+    Threaded mode runs the source and every stage concurrently, joined by
+    bounded queues. Inline mode runs the same stages one after another in
+    the calling thread, which is easier to debug and profiles identically.
+    """
+
+    def __init__(self, source, stages, source_name='decode', queue_size=2,
+                 item_size=None):
+        """
+        Initialize staged pipeline
+
+        Args:
+            source: Iterable producing items
+            stages: List of PipelineStage
+            source_name: Name reported for the source stage
+            queue_size: Maximum items waiting between two stages
+            item_size: Optional callable returning the number of frames in
+                       an item (default: 1 per item)
+        """
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+
+        self.source = source
+        self.stages = stages
+        self.queue_size = queue_size
+        self.item_size = item_size or (lambda item: 1)
+
+        self.source_stats = StageStats(source_name)
+        self.stage_stats = [StageStats(stage.name) for stage in stages]
+        self.wall_seconds = 0.0
+
+        self._stop = threading.Event()
+        self._errors = []
+
+    def run(self, threaded=True):
+        """
+        Run the pipeline until the source is exhausted
+
+        Args:
+            threaded: Run stages concurrently (True) or inline (False)
+
+        Raises:
+            The first exception raised by the source or any stage
+        """
+        start_time = time.perf_counter()
+
+        if threaded:
+            self._run_threaded()
+        else:
+            self._run_inline()
+
+        self.wall_seconds = time.perf_counter() - start_time
+
+    def _run_inline(self):
+        """Run source and stages sequentially in the calling thread"""
+        for item in self._timed_source():
+            for stage, stats in zip(self.stages, self.stage_stats):
+                item = self._timed_call(stage, stats, item)
+
+    def _run_threaded(self):
+        """Run source and every stage in its own thread"""
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+
+        threads = [threading.Thread(
+            target=self._source_worker, args=(queues[0],),
+            name=f"pipeline-{self.source_stats.name}", daemon=True
+        )]
+
+        for idx, stage in enumerate(self.stages):
+            output_queue = queues[idx + 1] if idx + 1 < len(queues) else None
+            threads.append(threading.Thread(
+                target=self._stage_worker,
+                args=(stage, self.stage_stats[idx], queues[idx], output_queue),
+                name=f"pipeline-{stage.name}", daemon=True
+            ))
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if self._errors:
+            raise self._errors[0]
+
+    def _timed_source(self):
+        """Iterate the source, recording time spent producing each item"""
+        iterator = iter(self.source)
+
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.source_stats.record(self.item_size(item), time.perf_counter() - start)
+            yield item
+
+    def _timed_call(self, stage, stats, item):
+        """Run one stage on one item, recording its processing time"""
+        frames = self.item_size(item)
+        start = time.perf_counter()
+        result = stage.func(item)
+        stats.record(frames, time.perf_counter() - start)
+        return result
+
+    def _source_worker(self, output_queue):
+        """Thread body: feed source items into the first queue"""
+        try:
+            for item in self._timed_source():
+                if not self._put(output_queue, item):
+                    return
+        except Exception as e:
+            self._fail(e)
+        finally:
+            self._put(output_queue, _END_OF_STREAM)
+
+    def _stage_worker(self, stage, stats, input_queue, output_queue):
+        """Thread body: process items from input_queue into output_queue"""
+        try:
+            while True:
+                item = self._get(input_queue)
+                if item is _END_OF_STREAM:
+                    break
+
+                result = self._timed_call(stage, stats, item)
+
+                if output_queue is not None and not self._put(output_queue, result):
+                    return
+        except Exception as e:
+            self._fail(e)
+        finally:
+            if output_queue is not None:
+                self._put(output_queue, _END_OF_STREAM)
+
+    def _put(self, target_queue, item):
+        """Blocking put that gives up once the pipeline is stopping"""
+        while True:
+            try:
+                target_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                if self._stop.is_set():
+                    return False
+
+    def _get(self, source_queue):
+        """Blocking get that returns end-of-stream once the pipeline is stopping"""
+        while True:
+            try:
+                return source_queue.get(timeout=0.1)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return _END_OF_STREAM
+
+    def _fail(self, error):
+        """Record an error and stop all stages"""
+        self._errors.append(error)
+        self._stop.set()
+
+    def get_stats(self):
+        """
+        Get per-stage statistics
+
+        Returns:
+            List of statistic dictionaries, source stage first
+        """
+        return [stats.to_dict() for stats in [self.source_stats] + self.stage_stats]
+
+    def get_bottleneck(self):
+        """
+        Get the stage with the most busy time
+
+        Returns:
+            Stage name or None if nothing was processed
+        """
+        all_stats = [self.source_stats] + self.stage_stats
+        busiest = max(all_stats, key=lambda stats: stats.busy_seconds)
+        return busiest.name if busiest.busy_seconds > 0 else None
+
+    def log_stats(self, logger):
+        """
+        Log per-stage throughput
+
+        Args:
+            logger: Logger instance
+        """
+        for stats in [self.source_stats] + self.stage_stats:
+            logger.info(
+                f"   {stats.name:<16} {stats.frames:>7} frames  "
+                f"{stats.busy_seconds:>8.1f}s busy  {stats.fps:>7.1f} fps"
+            )
+
+        bottleneck = self.get_bottleneck()
+        if bottleneck:
+            logger.info(f"   Bottleneck: {bottleneck} (wall time {self.wall_seconds:.1f}s)")
@@ -79,6 +79,30 @@ class BallInterpolator:
         # Convert back to original format
         return [{1: {"bbox": x}} for x in df_ball.to_numpy().tolist()]
     
+    @staticmethod
+    def interpolate_bboxes(frames, bboxes, num_frames):
+        """
+        Interpolate ball bounding boxes over every frame
+        
+        Same result as interpolate_ball_positions: linear between
+        detections, held constant before the first and after the last.
+        
+        Args:
+            frames: Sorted frame indices with a detection
+            bboxes: Array of shape (N, 4) with the detected bboxes
+            num_frames: Total number of frames
+            
+        Returns:
+            Array of shape (num_frames, 4), or None without detections
+        """
+        if len(frames) == 0:
+            return None
+        
+        all_frames = np.arange(num_frames)
+        return np.stack([
+            np.interp(all_frames, frames, bboxes[:, idx]) for idx in range(4)
+        ], axis=1)
+    
     @staticmethod
     def interpolate_linear(positions, missing_indices):
         """
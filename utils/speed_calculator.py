@@ -1,25 +1,43 @@
 """
 Speed Calculator Module
 Calculates speeds and distances from position data
+
+track_kinematics computes speed, cumulative distance and acceleration of
+every track of a match in one pass over flat columns: rows are sorted by
+(track, frame) once and all per-track work is done with array operations
+over segment boundaries.
 """
 
 import numpy as np
 
+try:
+    from scipy.signal import savgol_coeffs
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
 
 class SpeedCalculator:
     """Calculates speeds and distances from tracking positions"""
     
-    def __init__(self, fps=30, window_size=5):
+    def __init__(self, fps=30, window_size=5, smoothing='moving_average', max_gap=None):
         """
         Initialize speed calculator
         
         Args:
             fps: Video frames per second
             window_size: Number of frames for speed smoothing
+            smoothing: 'moving_average' or 'savgol' (Savitzky-Golay,
+                       quadratic) for track_kinematics
+            max_gap: Frames a track may be missing before the next detection
+                     starts a new segment (no distance is counted across
+                     it); None = never
         """
         self.fps = fps
         self.frame_window = window_size
         self.frame_rate = 1 / fps  # seconds per frame
+        self.smoothing = smoothing
+        self.max_gap = max_gap
     
     def calculate_speed(self, position1, position2, time_elapsed=None):
         """
@@ -79,13 +97,134 @@ class SpeedCalculator:
         if len(speeds) < 2:
             return speeds
         
-        smoothed = []
-        for i in range(len(speeds)):
-            start_idx = max(0, i - window_size // 2)
-            end_idx = min(len(speeds), i + window_size // 2 + 1)
+        return self.smooth_speed_array(speeds, window_size).tolist()
+    
+    def smooth_speed_array(self, speeds, window_size=None):
+        """
+        Moving average of a speed array (same result as smooth_speeds)
+        
+        The window is centred and truncated at both ends.
+        
+        Args:
+            speeds: 1D array of speed values
+            window_size: Window size for smoothing (default: self.frame_window)
+            
+        Returns:
+            Array of smoothed speeds
+        """
+        if window_size is None:
+            window_size = self.frame_window
+        
+        speeds = np.asarray(speeds, dtype=np.float64)
+        if len(speeds) < 2:
+            return speeds
+        
+        half = window_size // 2
+        idx = np.arange(len(speeds))
+        start = np.maximum(idx - half, 0)
+        end = np.minimum(idx + half + 1, len(speeds))
+        
+        cumulative = np.concatenate(([0.0], np.cumsum(speeds)))
+        return (cumulative[end] - cumulative[start]) / (end - start)
+    
+    def track_kinematics(self, track_ids, frames, positions, fps=None):
+        """
+        Speed, cumulative distance and acceleration of every track at once
+        
+        Steps are taken between consecutive detections of a track and
+        divided by the time actually elapsed, so a frame gap does not
+        inflate the speed. A gap longer than max_gap starts a new segment:
+        its first detection gets zero speed and no distance is added.
+        Speeds are smoothed within segments (window truncated at segment
+        ends) and differentiated for the acceleration.
+        
+        Args:
+            track_ids: Track ID of every row
+            frames: Frame index of every row
+            positions: Array (N, 2) of positions (meters, or pixels)
+            fps: Video frames per second (default: self.fps)
             
-            window_speeds = speeds[start_idx:end_idx]
-            smoothed.append(np.mean(window_speeds))
+        Returns:
+            Tuple (speed, distance, acceleration) arrays in row order
+            (units per second, units, units per second^2)
+        """
+        fps = fps or self.fps
+        track_ids = np.asarray(track_ids)
+        frames = np.asarray(frames, dtype=np.int64)
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        
+        count = len(frames)
+        speed = np.zeros(count)
+        distance = np.zeros(count)
+        acceleration = np.zeros(count)
+        if count == 0:
+            return speed, distance, acceleration
+        
+        # Group rows per track once: sort by (track, frame)
+        order = np.lexsort((frames, track_ids))
+        track_ids, frames, positions = track_ids[order], frames[order], positions[order]
+        
+        track_start = np.r_[True, track_ids[1:] != track_ids[:-1]]
+        frame_gaps = np.r_[1, np.diff(frames)]
+        segment_start = track_start.copy()
+        if self.max_gap is not None:
+            segment_start |= frame_gaps > self.max_gap + 1
+        
+        # Steps between consecutive detections of a segment
+        steps = np.r_[0.0, np.hypot(*np.diff(positions, axis=0).T)]
+        steps[segment_start] = 0.0
+        elapsed = np.where(segment_start, 1, frame_gaps) / fps
+        
+        # Cumulative distance per track (segments continue the total)
+        cumulative = np.cumsum(steps)
+        track_first = np.maximum.accumulate(np.where(track_start, np.arange(count), 0))
+        distance_sorted = cumulative - cumulative[track_first]
+        
+        # Smoothed speed of every row after a segment's first one
+        segment_id = np.cumsum(segment_start) - 1
+        raw_speed = steps / elapsed
+        moving = ~segment_start
+        speed_sorted = np.zeros(count)
+        speed_sorted[moving] = self._smooth_segments(raw_speed[moving], segment_id[moving])
+        
+        # Acceleration from consecutive smoothed speeds of a segment
+        accel_sorted = np.zeros(count)
+        follows = np.flatnonzero(moving[1:] & moving[:-1]) + 1
+        accel_sorted[follows] = (speed_sorted[follows] - speed_sorted[follows - 1]) / elapsed[follows]
+        
+        speed[order] = speed_sorted
+        distance[order] = distance_sorted
+        acceleration[order] = accel_sorted
+        return speed, distance, acceleration
+    
+    def _smooth_segments(self, values, segment_id):
+        """
+        Smooth consecutive values of each segment independently
+        
+        The moving average is a centred window truncated at segment ends
+        (as smooth_speed_array); Savitzky-Golay is applied where the whole
+        window lies inside the segment and the moving average elsewhere.
+        """
+        half = self.frame_window // 2
+        if len(values) < 2 or half == 0:
+            return values
+        
+        idx = np.arange(len(values))
+        bounds = np.flatnonzero(np.r_[True, segment_id[1:] != segment_id[:-1], True])
+        lengths = np.diff(bounds)
+        first = np.repeat(bounds[:-1], lengths)
+        last = np.repeat(bounds[1:], lengths)
+        
+        start = np.maximum(idx - half, first)
+        end = np.minimum(idx + half + 1, last)
+        cumulative = np.concatenate(([0.0], np.cumsum(values)))
+        smoothed = (cumulative[end] - cumulative[start]) / (end - start)
+        
+        window = 2 * half + 1
+        if self.smoothing == 'savgol' and SCIPY_AVAILABLE and len(values) >= window:
+            inside = (idx - half >= first) & (idx + half < last)
+            filtered = np.convolve(values, savgol_coeffs(window, min(2, window - 1)), mode='same')
+            smoothed[inside] = np.maximum(filtered[inside], 0.0)
         
         return smoothed
     
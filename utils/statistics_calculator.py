@@ -52,6 +52,8 @@ class PlayerStatisticsCalculator:
             if 'has_ball' in player_data.columns:
                 time_with_ball_frames = player_data['has_ball'].sum()
             
+            # Plain int keys (NumPy integers are not JSON-serializable keys)
+            track_id = int(track_id)
             player_stats[track_id] = {
                 'track_id': track_id,
                 'team': team,
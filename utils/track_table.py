@@ -0,0 +1,425 @@
+"""
+Track Table Module
+Columnar storage for tracking data
+
+Every detection is one row of a set of NumPy columns instead of a small
+dictionary inside tracks[object_type][frame][track_id], so a full match
+costs a few dozen bytes per detection and stages can work on whole columns
+at once. LegacyTracksView presents the same data in the old dictionary
+layout for code that has not moved to the table yet.
+"""
+
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+
+# Object types in row order within a frame
+OBJECT_TYPES = ('players', 'ball', 'referees')
+
+# Column name -> (dtype, width or None for scalar columns, fill value)
+COLUMNS = {
+    'frame': (np.int32, None, 0),
+    'track_id': (np.int32, None, 0),
+    'object_type': (np.int8, None, 0),
+    'bbox': (np.float32, 4, 0),
+    'team': (np.int8, None, 0),
+    'jersey_number': (np.int16, None, -1),
+    'original_track_id': (np.int32, None, -1),
+    'position': (np.float32, 2, 0),
+    'position_adjusted': (np.float32, 2, np.nan),
+    'position_transformed': (np.float32, 2, np.nan),
+    'speed': (np.float32, None, 0),
+    'distance': (np.float32, None, 0),
+    'acceleration': (np.float32, None, 0),
+    'has_ball': (np.bool_, None, False),
+    'interpolated': (np.bool_, None, False),
+}
+
+
+def _empty_column(name, length):
+    """Create a column of the given length filled with its default value"""
+    dtype, width, fill = COLUMNS[name]
+    shape = (length,) if width is None else (length, width)
+    return np.full(shape, fill, dtype=dtype)
+
+
+def _bbox_positions(bboxes, object_types):
+    """
+    Reference positions of bounding boxes
+
+    Ball positions are bbox centres, players and referees use the foot
+    position (bottom centre), as in PositionCalculator.
+    """
+    positions = np.empty((len(bboxes), 2), dtype=np.float32)
+    positions[:, 0] = (bboxes[:, 0] + bboxes[:, 2]) / 2
+
+    is_ball = object_types == OBJECT_TYPES.index('ball')
+    positions[:, 1] = np.where(is_ball, (bboxes[:, 1] + bboxes[:, 3]) / 2, bboxes[:, 3])
+
+    return positions
+
+
+class TrackTable:
+    """
+    Columnar track store
+
+    Rows are kept sorted by (frame, object type, track ID), which makes
+    per-frame lookups a binary search. Columns are plain NumPy arrays and
+    can be read and written in place, e.g. table['speed'][rows] = values.
+    """
+
+    def __init__(self, columns=None, num_frames=0):
+        """
+        Initialize track table
+
+        Args:
+            columns: Dictionary {column name: array}; missing columns are
+                     filled with their defaults. 'position' defaults to the
+                     bbox reference position.
+            num_frames: Number of frames covered (frames may have no rows)
+        """
+        columns = dict(columns or {})
+        unknown = set(columns) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown track table columns: {sorted(unknown)}")
+
+        length = len(columns['frame']) if 'frame' in columns else 0
+
+        self.columns = {}
+        for name, (dtype, width, _) in COLUMNS.items():
+            if name in columns:
+                array = np.asarray(columns[name], dtype=dtype)
+                if width is not None:
+                    array = array.reshape(-1, width)
+                if len(array) != length:
+                    raise ValueError(f"Column '{name}' has {len(array)} rows, expected {length}")
+                self.columns[name] = array
+            else:
+                self.columns[name] = _empty_column(name, length)
+
+        if 'position' not in columns and length:
+            self.columns['position'] = _bbox_positions(self['bbox'], self['object_type'])
+
+        # Sort rows by (frame, object type, track ID)
+        order = np.lexsort((self['track_id'], self['object_type'], self['frame']))
+        if length and np.any(order != np.arange(length)):
+            for name in self.columns:
+                self.columns[name] = self.columns[name][order]
+
+        frame_end = int(self['frame'].max()) + 1 if length else 0
+        self.num_frames = max(int(num_frames), frame_end)
+
+    def __len__(self):
+        return len(self.columns['frame'])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    @property
+    def nbytes(self):
+        """Memory used by all columns in bytes"""
+        return sum(column.nbytes for column in self.columns.values())
+
+    @classmethod
+    def from_tracks(cls, tracks, frame_offset=0):
+        """
+        Build a table from the tracks[object_type][frame][track_id] layout
+
+        Args:
+            tracks: Tracking dictionary
+            frame_offset: Global index of the first frame in tracks
+
+        Returns:
+            TrackTable with global frame numbers
+        """
+        frames, track_ids, object_types, bboxes = [], [], [], []
+        teams, jerseys, original_ids = [], [], []
+        num_frames = 0
+
+        for type_code, object_type in enumerate(OBJECT_TYPES):
+            object_tracks = tracks.get(object_type, [])
+            num_frames = max(num_frames, len(object_tracks))
+
+            for frame_num, frame_tracks in enumerate(object_tracks):
+                for track_id, track_info in frame_tracks.items():
+                    bbox = track_info.get('bbox', [])
+                    if len(bbox) != 4:
+                        continue
+
+                    jersey_number = track_info.get('jersey_number')
+                    original_id = track_info.get('original_track_id')
+
+                    frames.append(frame_offset + frame_num)
+                    track_ids.append(track_id)
+                    object_types.append(type_code)
+                    bboxes.append(bbox)
+                    teams.append(track_info.get('team', 0))
+                    jerseys.append(-1 if jersey_number is None else jersey_number)
+                    original_ids.append(-1 if original_id is None else original_id)
+
+        return cls({
+            'frame': frames,
+            'track_id': track_ids,
+            'object_type': object_types,
+            'bbox': np.asarray(bboxes, dtype=np.float32).reshape(-1, 4),
+            'team': teams,
+            'jersey_number': jerseys,
+            'original_track_id': original_ids
+        }, num_frames=frame_offset + num_frames)
+
+    @classmethod
+    def concat(cls, tables):
+        """
+        Concatenate tables (e.g. the tables of consecutive chunks)
+
+        Args:
+            tables: List of TrackTable with global frame numbers
+
+        Returns:
+            Combined TrackTable
+        """
+        tables = list(tables)
+        if not tables:
+            return cls()
+
+        columns = {
+            name: np.concatenate([table[name] for table in tables])
+            for name in COLUMNS
+        }
+        return cls(columns, num_frames=max(table.num_frames for table in tables))
+
+    def select(self, rows):
+        """
+        Get a new table with a subset of rows
+
+        Args:
+            rows: Boolean mask or row indices
+
+        Returns:
+            TrackTable covering the same number of frames
+        """
+        columns = {name: column[rows] for name, column in self.columns.items()}
+        return TrackTable(columns, num_frames=self.num_frames)
+
+    def object_mask(self, object_type):
+        """
+        Get a boolean mask of the rows of one object type
+
+        Args:
+            object_type: 'players', 'ball' or 'referees'
+        """
+        return self['object_type'] == OBJECT_TYPES.index(object_type)
+
+    def frame_rows(self, frame, object_type=None):
+        """
+        Get the row indices of one frame
+
+        Args:
+            frame: Global frame index
+            object_type: Optional object type to restrict rows to
+
+        Returns:
+            Array of row indices (sorted by track ID within an object type)
+        """
+        frames = self['frame']
+        start = np.searchsorted(frames, frame, side='left')
+        end = np.searchsorted(frames, frame, side='right')
+
+        if object_type is not None:
+            type_code = OBJECT_TYPES.index(object_type)
+            frame_types = self['object_type'][start:end]
+            end = start + np.searchsorted(frame_types, type_code, side='right')
+            start = start + np.searchsorted(frame_types, type_code, side='left')
+
+        return np.arange(start, end)
+
+    def track_index(self, object_type='players'):
+        """
+        Get the row indices of every track of one object type
+
+        Args:
+            object_type: 'players', 'ball' or 'referees'
+
+        Returns:
+            Dictionary {track_id: row indices in frame order}
+        """
+        rows = np.flatnonzero(self.object_mask(object_type))
+        if len(rows) == 0:
+            return {}
+
+        # Rows are frame-sorted, so a stable sort by track keeps frame order
+        rows = rows[np.argsort(self['track_id'][rows], kind='stable')]
+        track_ids = self['track_id'][rows]
+        splits = np.flatnonzero(np.diff(track_ids)) + 1
+
+        return {
+            int(track_rows_ids[0]): track_rows
+            for track_rows, track_rows_ids in zip(np.split(rows, splits), np.split(track_ids, splits))
+        }
+
+    def row_to_dict(self, row):
+        """
+        Get one row in the legacy per-detection dictionary layout
+
+        Args:
+            row: Row index
+
+        Returns:
+            Track info dictionary
+        """
+        columns = self.columns
+        object_type = OBJECT_TYPES[columns['object_type'][row]]
+
+        info = {
+            'bbox': columns['bbox'][row].tolist(),
+            'position': columns['position'][row].tolist()
+        }
+
+        for name in ('position_adjusted', 'position_transformed'):
+            value = columns[name][row]
+            if not np.isnan(value[0]):
+                info[name] = value.tolist()
+
+        if object_type == 'players':
+            jersey_number = int(columns['jersey_number'][row])
+            original_id = int(columns['original_track_id'][row])
+            speed = float(columns['speed'][row])
+            distance = float(columns['distance'][row])
+
+            info['original_track_id'] = original_id if original_id >= 0 else None
+            info['jersey_number'] = jersey_number if jersey_number >= 0 else None
+            if columns['team'][row] > 0:
+                info['team'] = int(columns['team'][row])
+            info['speed'] = speed
+            info['speed_kmh'] = speed * 3.6
+            info['distance_covered'] = distance
+            info['distance_meters'] = distance
+            info['acceleration'] = float(columns['acceleration'][row])
+            if columns['has_ball'][row]:
+                info['has_ball'] = True
+        elif columns['interpolated'][row]:
+            info['interpolated'] = True
+
+        return info
+
+    def frame_dict(self, frame, object_type):
+        """
+        Get one frame of one object type as {track_id: track_info}
+
+        Args:
+            frame: Global frame index
+            object_type: 'players', 'ball' or 'referees'
+        """
+        track_ids = self['track_id']
+        return {
+            int(track_ids[row]): self.row_to_dict(row)
+            for row in self.frame_rows(frame, object_type)
+        }
+
+    def legacy_view(self):
+        """
+        Get a read-only view in the tracks[object_type][frame][track_id] layout
+
+        Frame dictionaries are built on access, so the view costs no memory
+        up front.
+        """
+        return LegacyTracksView(self)
+
+    def to_tracks(self):
+        """
+        Materialize the table in the tracks[object_type][frame][track_id] layout
+
+        Returns:
+            Tracking dictionary
+        """
+        return {
+            object_type: [self.frame_dict(frame, object_type) for frame in range(self.num_frames)]
+            for object_type in OBJECT_TYPES
+        }
+
+    def to_dataframe(self, object_type=None):
+        """
+        Convert the table to a DataFrame with one column per value
+
+        Args:
+            object_type: Optional object type to restrict rows to
+
+        Returns:
+            pandas DataFrame
+        """
+        import pandas as pd
+
+        rows = slice(None) if object_type is None else self.object_mask(object_type)
+        columns = self.columns
+
+        data = {
+            'frame': columns['frame'][rows],
+            'object_type': np.asarray(OBJECT_TYPES)[columns['object_type'][rows]],
+            'track_id': columns['track_id'][rows],
+            'team': columns['team'][rows],
+            'jersey_number': columns['jersey_number'][rows],
+            'original_track_id': columns['original_track_id'][rows]
+        }
+        for idx, name in enumerate(('x1', 'y1', 'x2', 'y2')):
+            data[f'bbox_{name}'] = columns['bbox'][rows, idx]
+        for prefix in ('position', 'position_adjusted', 'position_transformed'):
+            data[f'{prefix}_x'] = columns[prefix][rows, 0]
+            data[f'{prefix}_y'] = columns[prefix][rows, 1]
+        for name in ('speed', 'distance', 'acceleration', 'has_ball', 'interpolated'):
+            data[name] = columns[name][rows]
+
+        return pd.DataFrame(data)
+
+
+class _LegacyFrameList(Sequence):
+    """Read-only list of per-frame dictionaries for one object type"""
+
+    def __init__(self, table, object_type):
+        self._table = table
+        self._object_type = object_type
+
+    def __len__(self):
+        return self._table.num_frames
+
+    def __getitem__(self, frame):
+        if isinstance(frame, slice):
+            return [self[idx] for idx in range(*frame.indices(len(self)))]
+
+        if frame < 0:
+            frame += len(self)
+        if not 0 <= frame < len(self):
+            raise IndexError("frame index out of range")
+
+        return self._table.frame_dict(frame, self._object_type)
+
+
+class LegacyTracksView(Mapping):
+    """
+    Read-only adapter presenting a TrackTable as a tracking dictionary
+
+    view['players'][frame][track_id] returns the same dictionary the
+    tracker used to build; changes to returned dictionaries are not
+    written back to the table.
+    """
+
+    def __init__(self, table):
+        """
+        Initialize view
+
+        Args:
+            table: TrackTable to present
+        """
+        self.table = table
+        self._frame_lists = {
+            object_type: _LegacyFrameList(table, object_type) for object_type in OBJECT_TYPES
+        }
+
+    def __getitem__(self, object_type):
+        return self._frame_lists[object_type]
+
+    def __iter__(self):
+        return iter(OBJECT_TYPES)
+
+    def __len__(self):
+        return len(OBJECT_TYPES)
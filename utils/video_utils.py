@@ -30,6 +30,109 @@ def read_video(video_path):
     return frames
 
 
+def iter_video_chunks(video_path, chunk_size=300, start_frame=0):
+    """
+    Stream video as bounded windows of frames
+
+    Only one window is decoded and held in memory at a time, so peak memory
+    is bounded by chunk_size rather than by video length.
+
+    Args:
+        video_path: Path to video file
+        chunk_size: Maximum number of frames per window
+        start_frame: Index of the first frame to yield (earlier frames are
+                     skipped frame-accurately with grab())
+
+    Yields:
+        (chunk_start, frames) tuples where chunk_start is the index of the
+        first frame in the window
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"Cannot open video: {video_path}")
+
+    chunk_start = 0
+    chunk = []
+
+    try:
+        while chunk_start < start_frame and cap.grab():
+            chunk_start += 1
+
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            chunk.append(frame)
+
+            if len(chunk) == chunk_size:
+                yield chunk_start, chunk
+                chunk_start += len(chunk)
+                chunk = []
+
+        if chunk:
+            yield chunk_start, chunk
+    finally:
+        cap.release()
+
+
+class VideoChunkWriter:
+    """
+    Incrementally writes frames to a video file
+
+    Counterpart of iter_video_chunks: frames are encoded as each window is
+    written, so the full annotated video never has to be held in memory.
+    """
+
+    def __init__(self, output_path, fps=30):
+        """
+        Initialize chunk writer
+
+        Args:
+            output_path: Output video path
+            fps: Frames per second
+        """
+        self.output_path = output_path
+        self.fps = fps
+        self.frames_written = 0
+        self._writer = None
+
+    def write(self, frames):
+        """
+        Append frames to the output video
+
+        Args:
+            frames: List of frames
+        """
+        for frame in frames:
+            if self._writer is None:
+                fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+                height, width = frame.shape[:2]
+                self._writer = cv2.VideoWriter(self.output_path, fourcc, self.fps, (width, height))
+
+            self._writer.write(frame)
+            self.frames_written += 1
+
+    def release(self):
+        """Finalize the output video"""
+        if self._writer is None:
+            print("⚠️  No frames to save")
+            return
+
+        self._writer.release()
+        self._writer = None
+        print(f"✓ Video saved: {self.output_path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+        return False
+
+
 def save_video(output_path, frames, fps=30):
     """
     Save frames to video file
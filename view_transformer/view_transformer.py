@@ -6,6 +6,17 @@ Transforms pixel coordinates to real-world field coordinates
 import cv2
 import numpy as np
 
+# Handle imports
+try:
+    from ..utils.field_mask import points_in_polygon
+except ImportError:
+    import sys
+    import os
+    parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+    from utils.field_mask import points_in_polygon
+
 
 class ViewTransformer:
     """
@@ -72,21 +83,68 @@ class ViewTransformer:
         if self.transformation_matrix is None:
             return None
         
-        # Check if point is inside field polygon
-        p = (int(point[0]), int(point[1]))
-        is_inside = cv2.pointPolygonTest(self.pixel_vertices, p, False) >= 0
+        transformed_point = self.transform_points(np.asarray(point, dtype=np.float32).reshape(1, 2))[0]
         
-        if not is_inside:
+        if np.isnan(transformed_point[0]):
             return None
         
-        # Transform point
-        reshaped_point = np.array(point).reshape(-1, 1, 2).astype(np.float32)
-        transformed_point = cv2.perspectiveTransform(
-            reshaped_point,
-            self.transformation_matrix
-        )
+        return transformed_point.tolist()
+    
+    def transform_points(self, points):
+        """
+        Transform many points from pixel to field coordinates at once
+        
+        The inside-field test runs vectorized over all points and the
+        perspective transform is a single cv2.perspectiveTransform call.
         
-        return transformed_point.reshape(-1, 2).squeeze().tolist()
+        Args:
+            points: Array of shape (N, 2) in pixel coordinates
+            
+        Returns:
+            Array of shape (N, 2) in field coordinates (meters); rows are
+            NaN for points outside the field (or without a transformation)
+        """
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+        transformed = np.full(points.shape, np.nan, dtype=np.float32)
+        
+        if self.transformation_matrix is None or len(points) == 0:
+            return transformed
+        
+        # Points are tested at integer pixel positions, as in pointPolygonTest
+        inside = points_in_polygon(np.trunc(points), self.pixel_vertices)
+        
+        if np.any(inside):
+            transformed[inside] = cv2.perspectiveTransform(
+                points[inside].reshape(-1, 1, 2),
+                self.transformation_matrix
+            ).reshape(-1, 2)
+        
+        return transformed
+    
+    def transform_points_per_frame(self, points, frame_homographies):
+        """
+        Transform points seen under a moving camera to field coordinates
+        
+        Each point is first mapped into the reference frame the field
+        vertices were calibrated on (batched over all points), then
+        transformed with the base homography.
+        
+        Args:
+            points: Array of shape (N, 2) in pixel coordinates of their frame
+            frame_homographies: Array of shape (N, 3, 3), frame -> reference
+                                frame homography of each point's frame
+            
+        Returns:
+            Array of shape (N, 2) in field coordinates (NaN outside the field)
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        homogeneous = np.concatenate([points, np.ones((len(points), 1))], axis=1)
+        
+        reference = np.einsum('nij,nj->ni', np.asarray(frame_homographies, dtype=np.float64), homogeneous)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            reference = reference[:, :2] / reference[:, 2:]
+        
+        return self.transform_points(reference)
     
     def add_transformed_position_to_tracks(self, tracks):
         """
@@ -95,6 +153,9 @@ class ViewTransformer:
         Args:
             tracks: Tracking dictionary
         """
+        entries = []
+        positions = []
+        
         for object_type, object_tracks in tracks.items():
             for frame_num, track in enumerate(object_tracks):
                 for track_id, track_info in track.items():
@@ -104,11 +165,42 @@ class ViewTransformer:
                     if position is None:
                         continue
                     
-                    # Transform to field coordinates
-                    position_transformed = self.transform_point(position)
-                    
-                    if position_transformed is not None:
-                        tracks[object_type][frame_num][track_id]['position_transformed'] = position_transformed
+                    entries.append(track_info)
+                    positions.append(position)
+        
+        # Transform all positions in one call
+        transformed = self.transform_points(np.array(positions, dtype=np.float32))
+        
+        for track_info, position_transformed in zip(entries, transformed):
+            if not np.isnan(position_transformed[0]):
+                track_info['position_transformed'] = position_transformed.tolist()
+    
+    def add_transformed_position_to_table(self, table, frame_homographies=None):
+        """
+        Add transformed field positions to a TrackTable
+        
+        Uses the camera-adjusted position where available. Rows outside the
+        field keep a NaN transformed position.
+        
+        Args:
+            table: TrackTable (position_transformed is written in place)
+            frame_homographies: Optional (num_frames, 3, 3) frame -> reference
+                                homographies; when given, raw positions are
+                                mapped per frame instead of translation-adjusted
+        """
+        if frame_homographies is not None and len(frame_homographies) > 0:
+            # Frames past the estimate reuse the last homography
+            frames = np.minimum(table['frame'], len(frame_homographies) - 1)
+            table['position_transformed'][:] = self.transform_points_per_frame(
+                table['position'], frame_homographies[frames]
+            )
+            return
+        
+        positions = table['position_adjusted']
+        missing = np.isnan(positions[:, 0])
+        positions = np.where(missing[:, None], table['position'], positions)
+        
+        table['position_transformed'][:] = self.transform_points(positions)
     
     def draw_field_overlay(self, frame, alpha=0.3):
         """